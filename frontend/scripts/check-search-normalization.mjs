@@ -0,0 +1,61 @@
+import path from 'node:path'
+import { fileURLToPath } from 'node:url'
+import { readFile } from 'node:fs/promises'
+import { createServer } from 'vite'
+
+// Checks that the frontend folds search text into the same normalized strings and trigrams as the sync, using the
+// cases the sync's tests check too (scripts/tests/test_search_index.py)
+const __dirname = path.dirname(fileURLToPath(import.meta.url))
+const projectRoot = path.resolve(__dirname, '..')
+const fixturePath = path.resolve(
+  projectRoot,
+  '..',
+  'scripts',
+  'tests',
+  'fixtures',
+  'search_normalization.json',
+)
+
+const vite = await createServer({
+  root: projectRoot,
+  configFile: path.resolve(projectRoot, 'vite.config.ts'),
+  appType: 'custom',
+  logLevel: 'error',
+  server: {
+    middlewareMode: true,
+  },
+})
+
+try {
+  const { normalizeSearchText, searchTrigrams } = await vite.ssrLoadModule('/src/utils/searchIndex.ts')
+  const cases = JSON.parse(await readFile(fixturePath, 'utf-8'))
+
+  let failures = 0
+  for (const { name, text, normalized, trigrams } of cases) {
+    const actualNormalized = normalizeSearchText(text)
+    const actualTrigrams = [...searchTrigrams(actualNormalized)].sort()
+    if (
+      actualNormalized !== normalized ||
+      JSON.stringify(actualTrigrams) !== JSON.stringify([...trigrams].sort())
+    ) {
+      failures++
+      console.error(
+        `✗ ${name}: ${JSON.stringify(text)} -> ${JSON.stringify(actualNormalized)} ` +
+          `${JSON.stringify(actualTrigrams)}, the sync gives ${JSON.stringify(normalized)} ` +
+          `${JSON.stringify(trigrams)}`,
+      )
+    }
+  }
+
+  if (failures > 0) {
+    console.error(`✗ ${failures} of ${cases.length} search normalization cases differ from the sync`)
+    process.exitCode = 1
+  } else {
+    console.log(`✓ ${cases.length} search normalization cases match the sync`)
+  }
+} catch (err) {
+  console.error('✗ Search normalization check failed:', err)
+  process.exitCode = 1
+} finally {
+  await vite.close()
+}
@@ -14,7 +14,7 @@ export async function render(url: string, options: RenderOptions = {}) {
   )
 
   if (Array.isArray(options.songs) && options.songs.length > 0) {
-    songsStore.songs = options.songs
+    songsStore.setSongs(options.songs)
   } else {
     await songsStore.loadSongs()
   }
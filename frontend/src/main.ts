@@ -35,7 +35,7 @@ function buildSongTabTitle(song: any) {
 router.afterEach((to) => {
   // Update tab title based on song metadata
   if (to.name === 'sheetView' && typeof to.params.songSlug === 'string') {
-    const song = songsStore.getSongBySlug(to.params.songSlug as string)
+    const song = songsStore.getSongSummaryBySlug(to.params.songSlug as string)
 
     if (song) {
       document.title = buildSongTabTitle(song)
@@ -50,13 +50,16 @@ export function createAppRouter(
               }
 
               // Find the song by slug
-              const song = songsStore.getSongBySlug(songSlug)
+              const summary = songsStore.getSongSummaryBySlug(songSlug)
 
-              if (!song) {
+              if (!summary) {
                 next({ name: 'home' })
                 return
               }
 
+              // The list only holds summaries, so load the song's own file
+              const song = (await songsStore.loadSongBySlug(songSlug)) ?? summary
+
               // Check if song is under review and user didn't come from our app
               const isUnderReview = songsStore.isUnderReviewSong(song)
               const cameFromOurApp = from.name !== undefined // If from.name is undefined, they came directly via URL
@@ -1,4 +1,4 @@
-import { computed } from 'vue'
+import { computed, watch } from 'vue'
 import { useRoute } from 'vue-router'
 import type { Song, Instrument } from '@/types/types'
 import { useSongsStore } from '@/stores/songs'
@@ -7,11 +7,22 @@ export const useSongActions = () => {
   const route = useRoute()
   const songsStore = useSongsStore()
 
-  // Get current song based on route
+  const songSlug = computed(() => route.params.songSlug as string | undefined)
+
+  // The songs list only holds summaries; load the current song's file (once, however many
+  // components ask for it) so the song below has its PDFs whether or not the sheet view loaded it
+  watch(
+    [songSlug, () => songsStore.songs],
+    ([slug]) => {
+      if (slug) void songsStore.loadSongBySlug(slug)
+    },
+    { immediate: true },
+  )
+
+  // Get current song based on route, once its file is loaded
   const currentSong = computed<Song | null>(() => {
-    const songSlug = route.params.songSlug as string
-    if (!songSlug) return null
-    return songsStore.getSongBySlug(songSlug) || null
+    if (!songSlug.value) return null
+    return songsStore.getSongBySlug(songSlug.value) || null
   })
 
   const currentInstrument = computed(() => {
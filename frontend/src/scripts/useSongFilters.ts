@@ -2,7 +2,7 @@ import { computed, ref, watch } from 'vue'
 import { useRoute, useRouter } from 'vue-router'
 import type { LocationQueryRaw } from 'vue-router'
 
-import type { Song, Instrument } from '@/types/types'
+import type { SongSummary, Instrument } from '@/types/types'
 import { instruments } from '@/types/types'
 import { useSongsStore } from '@/stores/songs'
 import { generateSongSlug } from '@/utils/slugUtils'
@@ -13,6 +13,18 @@ import {
   buildCleanQuery,
   areQueriesEquivalent,
 } from '@/utils/queryNormalization'
+import { loadSearchIndex, searchCandidateTitles, songMatchesSearch } from '@/utils/searchIndex'
+import type { SearchIndex } from '@/utils/searchIndex'
+import {
+  allSongs,
+  andBitsets,
+  bitsetTitles,
+  decodeBitset,
+  facetBitset,
+  facetValuesIn,
+  loadFacetIndex,
+} from '@/utils/facetIndex'
+import type { FacetIndex } from '@/utils/facetIndex'
 
 // Ensure storage listener installed only once per page
 let _settingsStorageListenerInstalled = false
@@ -49,6 +61,12 @@ const dateRange = ref<{ start: string; end: string }>({ start: '', end: '' })
 const lengthRange = ref<{ min: number | null; max: number | null }>({ min: null, max: null })
 const lengthFilterSource = ref<LengthFilterSource>('full')
 const useTvSize = ref<boolean>(false)
+// Search index written by the sync, loaded once per page; until it's there, search falls back to scanning titles
+const searchIndex = ref<SearchIndex | null>(null)
+let _searchIndexRequested = false
+// Facet index written by the sync; until it's there, filters and their options are computed by walking every song
+const facetIndex = ref<FacetIndex | null>(null)
+let _facetIndexRequested = false
 
 // Initialize from storage if available
 const _initialSettings = readUserSettings()
@@ -75,9 +93,36 @@ export const useSongFilters = () => {
   const songsStore = useSongsStore()
   const isSheetViewRoute = computed(() => route.name === 'sheetView')
 
+  if (!_searchIndexRequested) {
+    _searchIndexRequested = true
+    loadSearchIndex().then((index) => {
+      searchIndex.value = index
+    })
+  }
+  if (!_facetIndexRequested) {
+    _facetIndexRequested = true
+    loadFacetIndex().then((index) => {
+      facetIndex.value = index
+    })
+  }
+
   // Use availableSongs from store instead of all songs
   const songs = computed(() => songsStore.availableSongs)
 
+  // Songs covered by the search index
+  const searchIndexTitles = computed(() =>
+    searchIndex.value ? new Set(searchIndex.value.titles) : null,
+  )
+  // Songs covered by the facet index
+  const facetIndexTitles = computed(() =>
+    facetIndex.value ? new Set(facetIndex.value.titles) : null,
+  )
+  // Songs the facet index doesn't know (all of them until it's loaded), which filters walk one by one
+  const songsOutsideFacetIndex = computed(() => {
+    const indexed = facetIndexTitles.value
+    return indexed ? songs.value.filter((song) => !indexed.has(song.title)) : songs.value
+  })
+
   const parseLengthToSeconds = (lengthValue?: string): number | null => {
     if (!lengthValue) return null
     const trimmed = lengthValue.trim()
@@ -109,16 +154,17 @@ export const useSongFilters = () => {
     return `${minutes}:${String(seconds).padStart(2, '0')}`
   }
 
-  const getEffectiveSongLengthSeconds = (song: Song): number | null => {
+  const getEffectiveSongLengthSeconds = (song: SongSummary): number | null => {
     const fullLength = parseLengthToSeconds(song.length)
     const tvLength = parseLengthToSeconds(song.tvSizeLength)
     if (useTvSize.value && tvLength !== null) return tvLength
     return fullLength
   }
 
-  const getFullSongLengthSeconds = (song: Song): number | null => parseLengthToSeconds(song.length)
+  const getFullSongLengthSeconds = (song: SongSummary): number | null =>
+    parseLengthToSeconds(song.length)
 
-  const getTvSongLengthSeconds = (song: Song): number | null =>
+  const getTvSongLengthSeconds = (song: SongSummary): number | null =>
     parseLengthToSeconds(song.tvSizeLength)
 
   const sortFields = new Set<SortField>(['title', 'bpm', 'date', 'length', 'tv-length'])
@@ -294,10 +340,25 @@ export const useSongFilters = () => {
 
   //TODO: Move fetched songs into shared context with sheet view
 
+  // Bitset of the songs shown (see availableSongs in the songs store), if the facet index is loaded
+  const availableSongBits = computed(() => {
+    const index = facetIndex.value
+    if (!index) return null
+    if (songsStore.underReviewViewEnabled) return allSongs(index)
+    const completed = Object.keys(index.facets.status).filter(
+      (status) => status.toLowerCase() === 'completed',
+    )
+    return facetBitset(index, 'status', completed)
+  })
+
   // Computed arrays for filter options
   const availableLabels = computed(() => {
-    const labelSet = new Set<string>()
-    songs.value.forEach((song) => {
+    const labelSet = new Set<string>(
+      facetIndex.value && availableSongBits.value
+        ? facetValuesIn(facetIndex.value, 'label', availableSongBits.value)
+        : [],
+    )
+    songsOutsideFacetIndex.value.forEach((song) => {
       if (song.labels) {
         song.labels.forEach((label) => labelSet.add(label))
       }
@@ -306,8 +367,12 @@ export const useSongFilters = () => {
   })
 
   const availableProducers = computed(() => {
-    const producerSet = new Set<string>()
-    songs.value.forEach((song) => {
+    const producerSet = new Set<string>(
+      facetIndex.value && availableSongBits.value
+        ? facetValuesIn(facetIndex.value, 'producer', availableSongBits.value)
+        : [],
+    )
+    songsOutsideFacetIndex.value.forEach((song) => {
       producerSet.add(song.producer)
       if (song.additionalProducers) {
         song.additionalProducers.forEach((producer) => producerSet.add(producer))
@@ -317,8 +382,12 @@ export const useSongFilters = () => {
   })
 
   const availableSingers = computed(() => {
-    const singerSet = new Set<string>()
-    songs.value.forEach((song) => {
+    const singerSet = new Set<string>(
+      facetIndex.value && availableSongBits.value
+        ? facetValuesIn(facetIndex.value, 'singer', availableSongBits.value)
+        : [],
+    )
+    songsOutsideFacetIndex.value.forEach((song) => {
       singerSet.add(song.singer)
       if (song.additionalVoices) {
         song.additionalVoices.forEach((singer) => singerSet.add(singer))
@@ -327,35 +396,75 @@ export const useSongFilters = () => {
     return Array.from(singerSet).sort()
   })
 
+  // Instrument, label, producer and singer filtering of one song, for when the facet index doesn't cover it
+  const matchesFacetsByScan = (song: SongSummary): boolean => {
+    // Check if song has PDF for selected instrument
+    const hasPdf = song.keys.includes(selectedInstrument.value)
+
+    // Label filtering
+    const matchesLabels =
+      selectedLabels.value.length === 0 ||
+      (song.labels?.some((label) => selectedLabels.value.includes(label)) ?? false)
+
+    // Producer filtering
+    const matchesProducers =
+      selectedProducers.value.length === 0 ||
+      selectedProducers.value.includes(song.producer) ||
+      (song.additionalProducers?.some((producer) => selectedProducers.value.includes(producer)) ??
+        false)
+
+    // Singer filtering
+    const matchesSingers =
+      selectedSingers.value.length === 0 ||
+      selectedSingers.value.includes(song.singer) ||
+      (song.additionalVoices?.some((singer) => selectedSingers.value.includes(singer)) ?? false)
+
+    return hasPdf && matchesLabels && matchesProducers && matchesSingers
+  }
+
   const filteredSongs = computed(() => {
     const query = searchQuery.value.toLowerCase()
     const currentSortField = parseSortBy(sortBy.value).field
+    // Songs the search index says may match, or null if every song has to be checked
+    const candidateTitles = searchIndex.value
+      ? searchCandidateTitles(searchIndex.value, searchQuery.value)
+      : null
+    const searchIndexedTitles = searchIndexTitles.value
+    const facetIndexedTitles = facetIndexTitles.value
+
+    // Songs passing the instrument, label, producer and singer filters, by intersecting facet bitsets
+    const index = facetIndex.value
+    let facetTitles: Set<string> | null = null
+    let tvSizePdfTitles: Set<string> | null = null
+    if (index) {
+      let bits = decodeBitset(index, index.keys[selectedInstrument.value])
+      if (selectedLabels.value.length > 0) {
+        bits = andBitsets(bits, facetBitset(index, 'label', selectedLabels.value))
+      }
+      if (selectedProducers.value.length > 0) {
+        bits = andBitsets(bits, facetBitset(index, 'producer', selectedProducers.value))
+      }
+      if (selectedSingers.value.length > 0) {
+        bits = andBitsets(bits, facetBitset(index, 'singer', selectedSingers.value))
+      }
+      facetTitles = bitsetTitles(index, bits)
+      tvSizePdfTitles = bitsetTitles(index, decodeBitset(index, index.tvSize))
+    }
 
     const result = songs.value.filter((song) => {
-      // Basic text search
-      const matchesQuery = song.title.toLowerCase().includes(query)
-
-      // Check if song has PDF for selected instrument
-      const hasPdf = song.pdfs[selectedInstrument.value]?.trim()
-
-      // Label filtering
-      const matchesLabels =
-        selectedLabels.value.length === 0 ||
-        (song.labels && selectedLabels.value.some((label) => song.labels!.includes(label)))
-
-      // Producer filtering
-      const matchesProducers =
-        selectedProducers.value.length === 0 ||
-        selectedProducers.value.includes(song.producer) ||
-        (song.additionalProducers &&
-          song.additionalProducers.some((producer) => selectedProducers.value.includes(producer)))
-
-      // Singer filtering
-      const matchesSingers =
-        selectedSingers.value.length === 0 ||
-        selectedSingers.value.includes(song.singer) ||
-        (song.additionalVoices &&
-          song.additionalVoices.some((singer) => selectedSingers.value.includes(singer)))
+      // Text search: probe the search index, then confirm the (few) candidates it returns. Songs the index doesn't
+      // know yet (written after it) and queries it can't narrow down are checked directly
+      const matchesQuery = searchIndexedTitles
+        ? (candidateTitles === null ||
+            candidateTitles.has(song.title) ||
+            !searchIndexedTitles.has(song.title)) &&
+          songMatchesSearch(song, searchQuery.value)
+        : song.title.toLowerCase().includes(query)
+
+      // Instrument, label, producer and singer filtering: a set lookup when the facet index covers the song
+      const inFacetIndex = facetIndexedTitles?.has(song.title) ?? false
+      const matchesFacets =
+        facetTitles && inFacetIndex ? facetTitles.has(song.title) : matchesFacetsByScan(song)
 
       // Date range filtering - convert dates to comparable format
       const songDate = song.releaseDate // "20250102"
@@ -381,9 +490,10 @@ export const useSongFilters = () => {
               (tvLength !== null && tvLength >= minLength && tvLength <= maxLength))
 
       const hasTvSizeLength = parseLengthToSeconds(song.tvSizeLength) !== null
-      const hasTvSizePdf = Object.values(song.pdfsTvSize ?? {}).some((pdfPath) =>
-        Boolean(pdfPath?.trim()),
-      )
+      const hasTvSizePdf =
+        tvSizePdfTitles && inFacetIndex
+          ? tvSizePdfTitles.has(song.title)
+          : song.tvSizeKeys.length > 0
       const matchesLengthSource =
         lengthFilterSource.value !== 'tv' || hasTvSizeLength || hasTvSizePdf
       const matchesTvSizeAvailability =
@@ -391,10 +501,7 @@ export const useSongFilters = () => {
 
       return (
         matchesQuery &&
-        hasPdf &&
-        matchesLabels &&
-        matchesProducers &&
-        matchesSingers &&
+        matchesFacets &&
         matchesDateRange &&
         matchesLengthSource &&
         matchesLengthRange &&
@@ -410,7 +517,7 @@ export const useSongFilters = () => {
     const { field, order } = parseSortBy(sortBy.value)
     const dir = order === 'asc' ? 1 : -1
 
-    const comparator = (a: Song, b: Song) => {
+    const comparator = (a: SongSummary, b: SongSummary) => {
       if (field === 'title') {
         return dir * a.title.toLowerCase().localeCompare(b.title.toLowerCase())
       }
@@ -443,7 +550,7 @@ export const useSongFilters = () => {
       return [{ groupName: 'All Songs', songs: sorted }]
     }
 
-    const groups: Record<string, Song[]> = {}
+    const groups: Record<string, SongSummary[]> = {}
 
     for (const song of filteredSongs.value) {
       const key = (song as any)[groupBy.value]
@@ -1,7 +1,7 @@
 import { ref, computed, watch } from 'vue'
 import { defineStore } from 'pinia'
-import type { Song } from '@/types/types'
-import { loadAllSongs } from '@/utils/jsonLoader'
+import type { Song, SongSummary } from '@/types/types'
+import { loadAllSongs, loadSong, loadSongSummaries, toSongSummary } from '@/utils/jsonLoader'
 import { generateSongSlug } from '@/utils/slugUtils'
 import { readUserSettings, writeUserSettings, SETTINGS_KEY } from '@/utils/userSettings'
 
@@ -10,7 +10,12 @@ let _songsStorageListenerInstalled = false
 
 export const useSongsStore = defineStore('songs', () => {
   // State
-  const songs = ref<Song[]>([])
+  // Every song in the catalog, as the summaries of the catalog index; full songs are loaded on demand (loadSongBySlug)
+  const songs = ref<SongSummary[]>([])
+  // Full data of the songs loaded so far, by title
+  const songDetails = ref<Record<string, Song>>({})
+  const pendingSongLoads = new Map<string, Promise<Song | undefined>>()
+  const loadingSongCount = ref(0)
   const isLoading = ref(false)
   const error = ref<string | null>(null)
   const underReviewViewEnabled = ref(false)
@@ -49,6 +54,8 @@ export const useSongsStore = defineStore('songs', () => {
 
   const songCount = computed(() => availableSongs.value.length)
 
+  const isLoadingSong = computed(() => loadingSongCount.value > 0)
+
   const allProducers = computed(() => {
     const producers = new Set<string>()
     availableSongs.value.forEach((song) => {
@@ -79,11 +86,11 @@ export const useSongsStore = defineStore('songs', () => {
     writeUserSettings({ underReviewViewEnabled: underReviewViewEnabled.value })
   }
 
-  const isUnderReviewSong = (song: Song) => {
+  const isUnderReviewSong = (song: Pick<Song, 'status'>) => {
     return song.status && song.status.toLowerCase() === 'under review'
   }
 
-  const isExplicitSong = (song: Song) => {
+  const isExplicitSong = (song: Pick<Song, 'labels'>) => {
     return song.labels?.some((label) => label.toLowerCase() === 'explicit') ?? false
   }
 
@@ -94,9 +101,13 @@ export const useSongsStore = defineStore('songs', () => {
     error.value = null
 
     try {
-      // Load from JSON files
-      const jsonSongs = await loadAllSongs()
-      songs.value = jsonSongs
+      const summaries = await loadSongSummaries()
+      if (summaries.length > 0) {
+        songs.value = summaries
+      } else {
+        // No catalog index yet (the sync hasn't written one), so load every song file
+        setSongs(await loadAllSongs())
+      }
     } catch (err) {
       console.error('Failed to load songs:', err)
       error.value = err instanceof Error ? err.message : 'Failed to load songs'
@@ -106,12 +117,49 @@ export const useSongsStore = defineStore('songs', () => {
     }
   }
 
-  const getSongBySlug = (slug: string): Song | undefined => {
+  // Replace the catalog with these fully loaded songs (e.g. handed over by the prerenderer)
+  const setSongs = (fullSongs: Song[]) => {
+    songs.value = fullSongs.map((song) => toSongSummary(song))
+    songDetails.value = Object.fromEntries(fullSongs.map((song) => [song.title, song]))
+  }
+
+  const getSongSummaryBySlug = (slug: string): SongSummary | undefined => {
     return songs.value.find((song) => generateSongSlug(song.title) === slug)
   }
 
+  // The full song, if it has been loaded (see loadSongBySlug)
+  const getSongBySlug = (slug: string): Song | undefined => {
+    const summary = getSongSummaryBySlug(slug)
+    return summary ? songDetails.value[summary.title] : undefined
+  }
+
+  // Load a song's full data from its own file, once
+  const loadSongBySlug = async (slug: string): Promise<Song | undefined> => {
+    const summary = getSongSummaryBySlug(slug)
+    if (!summary) return undefined
+    const loaded = songDetails.value[summary.title]
+    if (loaded) return loaded
+
+    let pending = pendingSongLoads.get(summary.title)
+    if (!pending) {
+      loadingSongCount.value++
+      pending = loadSong(summary.file)
+        .then((song) => {
+          if (song) songDetails.value[summary.title] = song
+          return song ?? undefined
+        })
+        .finally(() => {
+          pendingSongLoads.delete(summary.title)
+          loadingSongCount.value--
+        })
+      pendingSongLoads.set(summary.title, pending)
+    }
+    return pending
+  }
+
   const refreshSongs = async () => {
     songs.value = []
+    songDetails.value = {}
     await loadSongs()
   }
 
@@ -120,6 +168,7 @@ export const useSongsStore = defineStore('songs', () => {
     songs,
     availableSongs,
     isLoading,
+    isLoadingSong,
     error,
     underReviewViewEnabled,
 
@@ -131,7 +180,10 @@ export const useSongsStore = defineStore('songs', () => {
 
     // Actions
     loadSongs,
+    setSongs,
+    getSongSummaryBySlug,
     getSongBySlug,
+    loadSongBySlug,
     refreshSongs,
     toggleUnderReviewView,
     isUnderReviewSong,
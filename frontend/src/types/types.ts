@@ -23,3 +23,42 @@ export interface Song {
   syncedAt?: string // ISO 8601 timestamp when sync script last processed this song
   updatedAt?: string // ISO 8601 timestamp when content/status last changed (for recent activity)
 }
+
+// One song in the catalog index written by the sync (frontend/src/data/catalog), enough to list, filter and sort it.
+// The full Song is in its own file, see loadSong(summary.file)
+export interface SongSummary
+  extends Pick<
+    Song,
+    | 'title'
+    | 'alternativeNames'
+    | 'producer'
+    | 'additionalProducers'
+    | 'singer'
+    | 'additionalVoices'
+    | 'releaseDate'
+    | 'length'
+    | 'tvSizeLength'
+    | 'bpm'
+    | 'labels'
+    | 'status'
+    | 'updatedAt'
+  > {
+  file: string // "world-is-mine.json"
+  keys: Instrument[] // Keys with a PDF
+  tvSizeKeys: Instrument[] // Keys with a TV size PDF
+}
+
+export interface CatalogIndexPage {
+  file: string // "songs-0000.json"
+  count: number
+  first: string // Filename of the page's first song
+  last: string // Filename of the page's last song
+  digest: string // Changes whenever the page's content does
+}
+
+export interface CatalogIndex {
+  version: number
+  pageSize: number
+  totalSongs: number
+  pages: CatalogIndexPage[]
+}
@@ -0,0 +1,121 @@
+// utils/facetIndex.ts
+import type { Instrument } from '@/types/types'
+
+export type Facet = 'producer' | 'singer' | 'label' | 'status'
+
+// A set of songs of the index, in whichever form the sync found shorter: a base64 encoded bitset,
+// where bit i (bit i % 8 of byte i / 8) stands for the i-th song of `songs`, or a sorted list of
+// song numbers (for small sets)
+export type EncodedSongs = string | number[]
+
+export interface FacetValue {
+  count: number // Number of songs having the value
+  songs: EncodedSongs // Songs having the value
+}
+
+// Facet index written by the sync next to the catalog index (scripts/catalog_index.py, FacetIndex)
+export interface FacetIndex {
+  version: number
+  songs: string[] // Song filenames
+  titles: string[] // Song titles, in the same order
+  facets: Record<Facet, Record<string, FacetValue>>
+  keys: Partial<Record<Instrument, EncodedSongs>> // Songs with a PDF for each key
+  tvSizeKeys: Partial<Record<Instrument, EncodedSongs>> // Songs with a TV size PDF for each key
+  tvSize: EncodedSongs // Songs with any TV size PDF
+}
+
+export type Bitset = Uint8Array
+
+const facetIndexFiles = import.meta.glob('../data/catalog/facets.json')
+
+/**
+ * Load the facet index, or null if the sync hasn't written one
+ */
+export async function loadFacetIndex(): Promise<FacetIndex | null> {
+  const importer = facetIndexFiles['../data/catalog/facets.json']
+  if (!importer) return null
+  try {
+    return ((await importer()) as { default: FacetIndex }).default
+  } catch (error) {
+    console.error('Failed to load facet index:', error)
+    return null
+  }
+}
+
+const decoded = new Map<string, Bitset>()
+const decodedLists = new WeakMap<number[], Bitset>()
+
+/**
+ * Decode a set of songs of the index into a bitset (memoized, so each one is only decoded once)
+ */
+export function decodeBitset(index: FacetIndex, encoded: EncodedSongs | undefined): Bitset {
+  if (!encoded || encoded.length === 0) return new Uint8Array(Math.ceil(index.songs.length / 8))
+  if (Array.isArray(encoded)) {
+    let bitset = decodedLists.get(encoded)
+    if (!bitset) {
+      bitset = new Uint8Array(Math.ceil(index.songs.length / 8))
+      for (const i of encoded) bitset[i >> 3] |= 1 << (i & 7)
+      decodedLists.set(encoded, bitset)
+    }
+    return bitset
+  }
+  let bitset = decoded.get(encoded)
+  if (!bitset) {
+    bitset = Uint8Array.from(atob(encoded), (c) => c.charCodeAt(0))
+    decoded.set(encoded, bitset)
+  }
+  return bitset
+}
+
+export function allSongs(index: FacetIndex): Bitset {
+  const bitset = new Uint8Array(Math.ceil(index.songs.length / 8))
+  for (let i = 0; i < index.songs.length; i++) bitset[i >> 3] |= 1 << (i & 7)
+  return bitset
+}
+
+export function andBitsets(a: Bitset, b: Bitset): Bitset {
+  return a.map((byte, i) => byte & (b[i] ?? 0))
+}
+
+export function orBitsets(index: FacetIndex, bitsets: Bitset[]): Bitset {
+  const result = new Uint8Array(Math.ceil(index.songs.length / 8))
+  bitsets.forEach((bitset) => bitset.forEach((byte, i) => (result[i] |= byte)))
+  return result
+}
+
+export function isEmptyBitset(bitset: Bitset): boolean {
+  return bitset.every((byte) => byte === 0)
+}
+
+/**
+ * Bitset of the songs having any of the given values of a facet
+ */
+export function facetBitset(index: FacetIndex, facet: Facet, values: string[]): Bitset {
+  return orBitsets(
+    index,
+    values.map((value) => decodeBitset(index, index.facets[facet][value]?.songs)),
+  )
+}
+
+/**
+ * Titles of the songs in the bitset
+ */
+export function bitsetTitles(index: FacetIndex, bitset: Bitset): Set<string> {
+  const titles = new Set<string>()
+  bitset.forEach((byte, i) => {
+    for (let bit = 0; byte; bit++, byte >>= 1) {
+      if (byte & 1) titles.add(index.titles[i * 8 + bit])
+    }
+  })
+  return titles
+}
+
+/**
+ * Values of a facet held by at least one of the songs in the bitset, sorted
+ */
+export function facetValuesIn(index: FacetIndex, facet: Facet, songs: Bitset): string[] {
+  return Object.entries(index.facets[facet])
+    .filter(([, value]) => !isEmptyBitset(andBitsets(decodeBitset(index, value.songs), songs)))
+    .map(([value]) => value)
+    .sort()
+}
@@ -1,10 +1,12 @@
 // utils/jsonLoader.ts
-import type { Song } from '@/types/types'
+import type { CatalogIndex, Instrument, Song, SongSummary } from '@/types/types'
 
 import { SONG_MANIFEST } from './songManifest'
 
 // Use Vite's import.meta.glob to dynamically import all JSON files in the data directory (relative to this file)
 const songFiles = import.meta.glob('../data/*.json')
+// The paged catalog index written by the sync: index.json plus songs-NNNN.json pages
+const catalogIndexFiles = import.meta.glob('../data/catalog/*.json')
 
 /**
  * Load all JSON song files from the data directory
@@ -69,3 +71,77 @@ export async function loadSong(filename: string): Promise<Song | null> {
 export function getAvailableSongFiles(): string[] {
   return [...SONG_MANIFEST]
 }
+
+/**
+ * Load the root of the catalog index (page list and song count)
+ */
+export async function loadCatalogIndex(): Promise<CatalogIndex | null> {
+  const importer = catalogIndexFiles['../data/catalog/index.json']
+  if (!importer) {
+    console.warn('No catalog index found')
+    return null
+  }
+  try {
+    return ((await importer()) as { default: CatalogIndex }).default
+  } catch (error) {
+    console.error('Failed to load catalog index:', error)
+    return null
+  }
+}
+
+/**
+ * Summary of a fully loaded song, like the ones of the catalog index (scripts/catalog_index.py, CatalogIndex.summarize)
+ */
+export function toSongSummary(song: Song, file = ''): SongSummary {
+  return {
+    file,
+    title: song.title,
+    alternativeNames: song.alternativeNames,
+    producer: song.producer,
+    additionalProducers: song.additionalProducers,
+    singer: song.singer,
+    additionalVoices: song.additionalVoices,
+    releaseDate: song.releaseDate,
+    length: song.length,
+    tvSizeLength: song.tvSizeLength,
+    bpm: song.bpm,
+    labels: song.labels,
+    status: song.status,
+    updatedAt: song.updatedAt,
+    keys: availableKeys(song.pdfs),
+    tvSizeKeys: availableKeys(song.pdfsTvSize),
+  }
+}
+
+// Keys whose PDF path points to a file
+function availableKeys(pdfs: Partial<Record<Instrument, string>> | undefined): Instrument[] {
+  return Object.entries(pdfs ?? {})
+    .filter(([, pdfPath]) => Boolean(pdfPath?.trim()))
+    .map(([key]) => key as Instrument)
+}
+
+/**
+ * Load the summaries of all songs from the catalog index pages, without loading any per-song file.
+ * Use loadSong(summary.file) to get a song's full data when it is needed.
+ */
+export async function loadSongSummaries(): Promise<SongSummary[]> {
+  const index = await loadCatalogIndex()
+  if (!index) return []
+
+  const pageImports = await Promise.allSettled(
+    index.pages.map((page) => {
+      const importer = catalogIndexFiles[`../data/catalog/${page.file}`]
+      return importer ? importer() : Promise.reject(new Error(`No import found for ${page.file}`))
+    }),
+  )
+
+  const summaries: SongSummary[] = []
+  pageImports.forEach((result, i) => {
+    if (result.status === 'fulfilled') {
+      summaries.push(...(result.value as { default: { songs: SongSummary[] } }).default.songs)
+    } else {
+      console.error(`❌ Failed to load catalog page ${index.pages[i].file}:`, result.reason)
+    }
+  })
+  return summaries
+}
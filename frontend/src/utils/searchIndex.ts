@@ -0,0 +1,113 @@
+// utils/searchIndex.ts
+import type { Song } from '@/types/types'
+
+// Search index written by the sync next to the catalog index (scripts/catalog_index.py, SearchIndex)
+export interface SearchIndex {
+  version: number
+  songs: string[] // Song filenames; songs are referred to by their position in this list
+  titles: string[] // Song titles, in the same order
+  trigrams: Record<string, number[]> // Every 3 character substring of a searchable value -> songs having it
+}
+
+const GRAM_SIZE = 3
+
+const searchIndexFiles = import.meta.glob('../data/catalog/search.json')
+
+/**
+ * Fold text for matching exactly like the sync does (SearchIndex.normalize): compatibility forms unified, Latin accents
+ * dropped, case and katakana/hiragana folded, anything but letters, marks and digits collapsed into single spaces.
+ * Both sides are checked against scripts/tests/fixtures/search_normalization.json (npm run check-search)
+ */
+export function normalizeSearchText(text: string): string {
+  return text
+    .normalize('NFKC')
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .normalize('NFC')
+    .toLowerCase()
+    .replace(/[\u30a1-\u30f6]/g, (c) => String.fromCharCode(c.charCodeAt(0) - 0x60))
+    .replace(/[^\p{L}\p{M}\p{N}]+/gu, ' ')
+    .trim()
+}
+
+/**
+ * Every GRAM_SIZE character substring of already normalized text. Characters are code points, as in the sync, so
+ * characters outside the BMP aren't split into their UTF-16 surrogates
+ */
+export function searchTrigrams(normalized: string): Set<string> {
+  const chars = Array.from(normalized)
+  const grams = new Set<string>()
+  for (let i = 0; i + GRAM_SIZE <= chars.length; i++) {
+    grams.add(chars.slice(i, i + GRAM_SIZE).join(''))
+  }
+  return grams
+}
+
+/**
+ * Load the search index, or null if the sync hasn't written one
+ */
+export async function loadSearchIndex(): Promise<SearchIndex | null> {
+  const importer = searchIndexFiles['../data/catalog/search.json']
+  if (!importer) return null
+  try {
+    return ((await importer()) as { default: SearchIndex }).default
+  } catch (error) {
+    console.error('Failed to load search index:', error)
+    return null
+  }
+}
+
+const intersect = (a: number[], b: number[]): number[] => {
+  const inB = new Set(b)
+  return a.filter((id) => inB.has(id))
+}
+
+/**
+ * Titles of the indexed songs which may match the query, found by index probes: the songs under every trigram of the
+ * query. Candidates can still be false positives (trigrams found in different names), so check them with
+ * songMatchesSearch().
+ *
+ * Returns null when the index can't narrow the search down, so every song has to be checked with songMatchesSearch():
+ * for an empty query, which matches every song, and for queries shorter than a trigram, which may be anywhere in a name
+ */
+export function searchCandidateTitles(index: SearchIndex, query: string): Set<string> | null {
+  const grams = searchTrigrams(normalizeSearchText(query))
+  if (grams.size === 0) return null
+
+  // Probe the rarest trigrams first so the candidate list shrinks as fast as possible
+  const postings = [...grams]
+    .map((gram) => index.trigrams[gram] ?? [])
+    .sort((a, b) => a.length - b.length)
+  const ids = postings.reduce((candidates, posting) => intersect(candidates, posting))
+  return new Set(ids.map((id) => index.titles[id]))
+}
+
+/**
+ * Whether one of the song's searchable names contains the query, once both are normalized
+ */
+export function songMatchesSearch(
+  song: Pick<
+    Song,
+    | 'title'
+    | 'alternativeNames'
+    | 'producer'
+    | 'additionalProducers'
+    | 'singer'
+    | 'additionalVoices'
+    | 'labels'
+  >,
+  query: string,
+): boolean {
+  const normalized = normalizeSearchText(query)
+  if (!normalized) return true
+  const values = [
+    song.title,
+    ...(song.alternativeNames ?? []),
+    song.producer,
+    ...(song.additionalProducers ?? []),
+    song.singer,
+    ...(song.additionalVoices ?? []),
+    ...(song.labels ?? []),
+  ]
+  return values.some((value) => !!value && normalizeSearchText(value).includes(normalized))
+}
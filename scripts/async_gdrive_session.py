@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+
+import os
+import asyncio
+import hashlib
+import logging
+import pathlib
+
+import env_config
+from drive_path_cache import DrivePathCache
+from gdrive_session import GDriveSession
+from typing import Any
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+_logger = logging.getLogger(__name__)
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+class AsyncGDriveSession:
+    """
+    asyncio counterpart of GDriveSession. Every request shares one pooled connector and is bounded by a semaphore, so
+    hundreds of listing, metadata and download calls can be in flight from a single thread.
+
+    Use it as an async context manager:
+
+        async with AsyncGDriveSession() as session:
+            files = await asyncio.gather(*(session.find_files_in_dir(path) for path in paths))
+    """
+    DEFAULT_MAX_CONCURRENCY = 64
+
+    def __init__(self, path_cache: DrivePathCache | None = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncGDriveSession requires aiohttp; install it with `uv sync --project scripts --group async`"
+            )
+
+        self._credentials = env_config.get_shared_credentials()
+        self._drive_root_id = env_config.get_env_or_fail("GOOGLE_DRIVE_ID")
+
+        if path_cache is None:
+            path_cache = DrivePathCache(env_config.get_cache_dir() / "drive_paths.json")
+        self._path_cache = path_cache
+        self._path_lookups: dict[str, asyncio.Task] = {}
+
+        self._max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._token_lock = asyncio.Lock()
+        self._http: "aiohttp.ClientSession | None" = None
+
+    async def __aenter__(self) -> "AsyncGDriveSession":
+        connector = aiohttp.TCPConnector(limit=self._max_concurrency, limit_per_host=self._max_concurrency)
+        self._http = aiohttp.ClientSession(connector=connector, raise_for_status=True)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    async def _auth_headers(self) -> dict[str, str]:
+        """Returns the Authorization header, refreshing the token (once, off the event loop) if it has expired"""
+        async with self._token_lock:
+            if not self._credentials.valid:
+                await asyncio.to_thread(self._credentials.ensure_valid)
+        return {"Authorization": f"Bearer {self._credentials.token}"}
+
+    async def _get_json(self, url: str, params: dict[str, Any], timeout: float = 30) -> dict:
+        params = {key: value for key, value in params.items() if value is not None}
+        async with self._semaphore:
+            headers = await self._auth_headers()
+            async with self._http.get(
+                url, params=params, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                return await response.json()
+
+    async def find_all_files_in(self, drive_id: str, mime_type: str | None = None) -> list[dict]:
+        """See GDriveSession.find_all_files_in()"""
+        query = f"'{drive_id}' in parents and trashed=false"
+        if mime_type:
+            query += f" and mimeType='{mime_type}'"
+        params = {
+            "q": query,
+            "pageSize": 1000,
+            "fields": "nextPageToken,files(id,name,mimeType,md5Checksum,modifiedTime,size)",
+        }
+
+        files = []
+        while True:
+            payload = await self._get_json(GDriveSession.DRIVE_FILES_URL, params)
+            files.extend(payload.get("files", []))
+
+            params["pageToken"] = payload.get("nextPageToken")
+            if not params["pageToken"]:
+                return files
+
+    async def find_file(self, drive_id: str, name: str, mime_type: str | None = None) -> dict | None:
+        """See GDriveSession.find_file()"""
+        query = f"'{drive_id}' in parents and trashed=false and name='{name}'"
+        if mime_type:
+            query += f" and mimeType='{mime_type}'"
+        params = {
+            "q": query,
+            "pageSize": 1000,
+            "fields": "nextPageToken,files(id,name,md5Checksum,modifiedTime,size)",
+        }
+
+        file_result = (await self._get_json(GDriveSession.DRIVE_FILES_URL, params)).get("files", None)
+        if not file_result:
+            return None
+        if len(file_result) > 1:
+            raise ValueError(f"find_file() returned more than one file - query={params}")
+        return file_result[0]
+
+    async def find_drive_id_by_dir(self, dir_path: pathlib.Path) -> str:
+        """
+        See GDriveSession.find_drive_id_by_dir(). Folder IDs are shared with the synchronous session's on-disk path
+        cache, and concurrent lookups of the same folder are merged into one request.
+        """
+        drive_id = self._drive_root_id
+
+        parts = dir_path.parts
+        for depth, part in enumerate(parts):
+            prefix = pathlib.PurePosixPath(*parts[:depth + 1])
+            cached = self._path_cache.get(self._drive_root_id, prefix)
+            if cached:
+                drive_id = cached
+                continue
+
+            key = str(prefix)
+            task = self._path_lookups.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._lookup_folder(drive_id, prefix, dir_path))
+                self._path_lookups[key] = task
+                task.add_done_callback(lambda _, key=key: self._path_lookups.pop(key, None))
+            drive_id = await asyncio.shield(task)
+
+        return drive_id
+
+    async def _lookup_folder(self, parent_id: str, prefix: pathlib.PurePosixPath, dir_path: pathlib.Path) -> str:
+        part = prefix.name
+        escaped_part = part.replace("\\", "\\\\").replace("'", "\\'")
+        selected_metadata = await self.find_file(parent_id, escaped_part, GDriveSession.MIME_TYPE_DRIVE_FOLDER)
+
+        if not selected_metadata:
+            partial_path = os.path.join(".", *prefix.parts[:-1])
+            raise ValueError(
+                f"Drive does not contain '{dir_path}'\n"
+                f"Successfully walked '{partial_path}', but could not find '{part}' next",
+            )
+
+        self._path_cache.put(self._drive_root_id, prefix, selected_metadata["id"])
+        return selected_metadata["id"]
+
+    async def find_files_in_dir(self, dir_path: pathlib.Path) -> list[dict[str, Any]]:
+        """See GDriveSession.find_files_in_dir()"""
+        return await self.find_all_files_in(await self.find_drive_id_by_dir(dir_path))
+
+    async def get_file_metadata(self, file_id: str) -> dict[str, Any]:
+        """See GDriveSession.get_file_metadata()"""
+        return await self._get_json(
+            f"{GDriveSession.DRIVE_FILES_URL}/{file_id}",
+            {"fields": "id,name,mimeType,md5Checksum,modifiedTime,size", "supportsAllDrives": "true"},
+            timeout=15,
+        )
+
+    async def download_file(self, file_id: str, output_file_path: str, expected_md5: str | None = None) -> str | None:
+        """
+        See GDriveSession.download_file(): streams alt=media into "<output_file_path>.part" (resuming it if it holds the
+        same remote version), verifies it against expected_md5, and atomically moves it into place.
+
+        Returns:
+            The md5 checksum of the downloaded file, or None if the download failed
+        """
+        part_path = f"{output_file_path}.part"
+        directory = os.path.dirname(output_file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        try:
+            _logger.info(f"Downloading file: {file_id} -> {output_file_path}")
+            GDriveSession.prepare_part_file(part_path, expected_md5)
+            md5 = await self._download_to(file_id, part_path)
+
+            if expected_md5 and md5 != expected_md5:
+                GDriveSession.discard_part_file(part_path)
+                _logger.error(f"Download failed ({file_id}): md5 {md5} does not match expected {expected_md5}")
+                return None
+
+            os.replace(part_path, output_file_path)
+            GDriveSession.discard_part_file(part_path)
+            _logger.info(f"Downloaded file: {output_file_path} ({os.path.getsize(output_file_path)}B)")
+            return md5
+
+        except ValueError as e:
+            GDriveSession.discard_part_file(part_path)
+            _logger.error(f"Download failed ({file_id}): {e}")
+            return None
+
+        except Exception as e:
+            _logger.error(f"Download failed ({file_id}): {e}")
+            return None
+
+    async def _download_to(self, file_id: str, part_path: str) -> str:
+        hash_md5 = hashlib.md5()
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+        async with self._semaphore:
+            headers = await self._auth_headers()
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+
+            async with self._http.get(
+                f"{GDriveSession.DRIVE_FILES_URL}/{file_id}",
+                params={"alt": "media", "supportsAllDrives": "true"},
+                headers=headers,
+                raise_for_status=False,
+                timeout=aiohttp.ClientTimeout(sock_connect=10, sock_read=60),
+            ) as response:
+                if response.status == 416:
+                    os.remove(part_path)
+                    offset = 0
+                else:
+                    response.raise_for_status()
+                    if "text/html" in response.headers.get("Content-Type", ""):
+                        raise ValueError("Drive returned an HTML page instead of the file")
+
+                    if response.status == 206:
+                        _logger.info(f"Resuming download of {file_id} from byte {offset}")
+                        with open(part_path, "rb") as f:
+                            for chunk in iter(lambda: f.read(GDriveSession.DOWNLOAD_CHUNK_SIZE), b""):
+                                hash_md5.update(chunk)
+                        mode = "ab"
+                    else:
+                        mode = "wb"
+
+                    first_chunk = mode == "wb"
+                    with open(part_path, mode) as f:
+                        async for chunk in response.content.iter_chunked(GDriveSession.DOWNLOAD_CHUNK_SIZE):
+                            if first_chunk:
+                                first_chunk = False
+                                if chunk.lstrip()[:15].lower().startswith((b"<!doctype html", b"<html")):
+                                    raise ValueError("Drive returned an HTML page instead of the file")
+                            hash_md5.update(chunk)
+                            f.write(chunk)
+                    return hash_md5.hexdigest()
+
+        # The partial file couldn't be resumed, so start over (outside of the semaphore we were holding)
+        return await self._download_to(file_id, part_path)
+
+
+async def _main_async(args: dict) -> None:
+    import tabulate
+
+    async with AsyncGDriveSession() as session:
+        if args.get("list_paths"):
+            listings = await asyncio.gather(
+                *(session.find_files_in_dir(pathlib.Path(path)) for path in args["list_paths"])
+            )
+            for path, files in zip(args["list_paths"], listings):
+                print(path)
+                print(tabulate.tabulate(files))
+        elif args.get("file_ids"):
+            metadata = await asyncio.gather(*(session.get_file_metadata(file_id) for file_id in args["file_ids"]))
+            print(tabulate.tabulate(metadata))
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="asyncio Google Drive handle for concurrent file viewing operations.",
+    )
+
+    subparsers = parser.add_subparsers(help='subcommand help')
+    parser_list = subparsers.add_parser('list', help='list help')
+    parser_list.add_argument("list_paths", nargs="+", help="List files in these subdirectories of the drive")
+
+    parser_metadata = subparsers.add_parser('metadata', help='metadata help')
+    parser_metadata.add_argument("file_ids", nargs="+", help="Fetch metadata for these Drive file IDs")
+    args = vars(parser.parse_args())
+
+    if not args.get("list_paths") and not args.get("file_ids"):
+        parser.print_help()
+        exit(1)
+
+    asyncio.run(_main_async(args))
+
+if __name__ == "__main__":
+    main()
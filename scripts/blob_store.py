@@ -0,0 +1,81 @@
+import os
+import errno
+import shutil
+import logging
+import pathlib
+import tempfile
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+_logger = logging.getLogger(__name__)
+
+class BlobStore:
+    """
+    Content-addressed store of downloaded files, keyed by their md5 checksum (which is what Drive reports as
+    md5Checksum). A file with a known checksum never needs to be downloaded again: it is materialized at whatever path
+    wants it, by hardlink when the store and the destination share a filesystem and by copy otherwise.
+    """
+
+    def __init__(self, root: str | os.PathLike):
+        self._root = pathlib.Path(root)
+
+    def path_for(self, md5: str) -> pathlib.Path:
+        return self._root / md5[:2] / md5
+
+    def has(self, md5: str) -> bool:
+        return self.path_for(md5).is_file()
+
+    def add(self, src_path: str | os.PathLike, md5: str) -> None:
+        """
+        Adds the file at src_path to the store under md5. The caller is responsible for md5 actually being the
+        checksum of the file.
+        """
+        if self.has(md5):
+            return
+        try:
+            BlobStore._place(src_path, self.path_for(md5))
+        except Exception as e:
+            _logger.warning(f"Failed to add {src_path} to the blob store: {e}")
+
+    def materialize(self, md5: str, dest_path: str | os.PathLike) -> bool:
+        """
+        Places the blob for md5 at dest_path, replacing whatever is there.
+
+        Returns:
+            True if the blob was materialized, False if the store doesn't have it (or it couldn't be placed)
+        """
+        blob_path = self.path_for(md5)
+        if not blob_path.is_file():
+            return False
+
+        try:
+            if os.path.exists(dest_path) and os.path.samefile(blob_path, dest_path):
+                return True
+            BlobStore._place(blob_path, dest_path)
+            return True
+        except Exception as e:
+            _logger.warning(f"Failed to materialize blob {md5} at {dest_path}: {e}")
+            return False
+
+    @staticmethod
+    def _place(src_path: str | os.PathLike, dest_path: str | os.PathLike) -> None:
+        """Atomically puts a hardlink to (or, across filesystems, a copy of) src_path at dest_path"""
+        directory = os.path.dirname(dest_path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+        os.remove(temp_path)
+        try:
+            try:
+                os.link(src_path, temp_path)
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                    raise
+                shutil.copyfile(src_path, temp_path)
+            os.replace(temp_path, dest_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
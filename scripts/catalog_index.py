@@ -0,0 +1,261 @@
+import json
+import base64
+import hashlib
+import unicodedata
+
+from typing import Any, Mapping
+
+def _available_keys(pdfs: Mapping[str, str]) -> list[str]:
+    """The keys of pdfs that point to a file"""
+    return [key for key, pdf_path in pdfs.items() if pdf_path and str(pdf_path).strip()]
+
+class CatalogIndex:
+    """
+    Compact summary of the catalog for the frontend's song list, split into fixed-size pages plus a small root.
+
+    Every song gets one summary holding only what the list needs to render, filter and sort it (no links, checksums or
+    PDF paths, just which keys have a chart). Full detail stays in the per-song files, which the frontend loads on
+    demand. Songs are paged in filename order, so a page's bytes only change when one of its songs does, or when songs
+    are added or removed ahead of it.
+
+    Layout, relative to the index directory:
+
+        index.json         {"version", "pageSize", "totalSongs", "pages": [{"file", "count", "first", "last", "digest"}]}
+        songs-0000.json    {"songs": [summary, ...]}
+        songs-0001.json    ...
+    """
+    INDEX_VERSION = 1
+    PAGE_SIZE = 200
+    ROOT_FILENAME = "index.json"
+    PAGE_PREFIX = "songs-"
+
+    # Frontend JSON fields copied into each summary
+    SUMMARY_KEYS = (
+        "title", "alternativeNames", "producer", "additionalProducers", "singer", "additionalVoices", "releaseDate",
+        "length", "tvSizeLength", "bpm", "labels", "status", "updatedAt",
+    )
+
+    def __init__(self, page_size: int = PAGE_SIZE):
+        self._page_size = page_size
+        self._summaries: dict[str, dict[str, Any]] = {}
+
+    @staticmethod
+    def summarize(filename: str, frontend_data: Mapping[str, Any]) -> dict[str, Any]:
+        """The summary of one song, from its frontend JSON content"""
+        summary = {"file": filename}
+        summary.update({key: frontend_data[key] for key in CatalogIndex.SUMMARY_KEYS if key in frontend_data})
+        summary["keys"] = _available_keys(frontend_data.get("pdfs", {}))
+        summary["tvSizeKeys"] = _available_keys(frontend_data.get("pdfsTvSize", {}))
+        return summary
+
+    def add(self, filename: str, frontend_data: Mapping[str, Any]) -> None:
+        """Adds (or replaces) the song written to filename"""
+        self._summaries[filename] = CatalogIndex.summarize(filename, frontend_data)
+
+    @staticmethod
+    def is_page(filename: str) -> bool:
+        return filename.startswith(CatalogIndex.PAGE_PREFIX) and filename.endswith(".json")
+
+    @staticmethod
+    def _encode(payload: Any) -> bytes:
+        return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode("utf-8")
+
+    def files(self) -> dict[str, bytes]:
+        """
+        Serializes the index.
+
+        Returns:
+            the content of every index file (root first, then pages in order), by filename
+        """
+        filenames = sorted(self._summaries)
+        pages = {}
+        page_entries = []
+        for start in range(0, len(filenames), self._page_size):
+            page_filenames = filenames[start:start + self._page_size]
+            page_file = f"{CatalogIndex.PAGE_PREFIX}{start // self._page_size:04d}.json"
+            pages[page_file] = CatalogIndex._encode({"songs": [self._summaries[f] for f in page_filenames]})
+            page_entries.append({
+                "file": page_file,
+                "count": len(page_filenames),
+                "first": page_filenames[0],
+                "last": page_filenames[-1],
+                # Lets clients tell whether a page they cached is still current without fetching it
+                "digest": hashlib.sha256(pages[page_file]).hexdigest()[:16],
+            })
+
+        root = {
+            "version": CatalogIndex.INDEX_VERSION,
+            "pageSize": self._page_size,
+            "totalSongs": len(filenames),
+            "pages": page_entries,
+        }
+        return {CatalogIndex.ROOT_FILENAME: CatalogIndex._encode(root), **pages}
+
+class SearchIndex:
+    """
+    Search index over the catalog's names, so the frontend answers a search with a few index probes instead of scanning
+    every song.
+
+    Every searchable value is normalized (see normalize()), and every 3 character substring of it (padded with a space on
+    both ends) is mapped to the songs having it: a query of 3+ characters matches the songs found under all of its
+    trigrams. Shorter queries can appear anywhere in a name, so the frontend checks every song for those.
+
+    Songs are referred to by their position in "songs", the sorted list of song filenames ("titles" holds their titles
+    in the same order), and posting lists are sorted.
+    """
+    INDEX_VERSION = 3
+    FILENAME = "search.json"
+    GRAM_SIZE = 3
+
+    # Frontend JSON fields which are searched
+    SEARCH_KEYS = (
+        "title", "alternativeNames", "producer", "additionalProducers", "singer", "additionalVoices", "labels",
+    )
+
+    def __init__(self):
+        self._values: dict[str, set[str]] = {}
+        self._titles: dict[str, str] = {}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Folds text for matching: compatibility forms (full width letters, half width kana) are unified, Latin accents
+        dropped, case and katakana/hiragana folded, and anything but letters, marks and digits (Unicode categories L, M
+        and N, so kana voicing marks which don't compose and the vowel signs of Indic scripts stay part of their word)
+        collapsed into single spaces. The frontend normalizes queries the same way (src/utils/searchIndex.ts), which is
+        checked against tests/fixtures/search_normalization.json on both sides.
+        """
+        text = unicodedata.normalize("NFKD", unicodedata.normalize("NFKC", str(text)))
+        text = "".join(c for c in text if not "\u0300" <= c <= "\u036f")
+        text = unicodedata.normalize("NFC", text).lower()
+        text = "".join(chr(ord(c) - 0x60) if "\u30a1" <= c <= "\u30f6" else c for c in text)
+        return " ".join("".join(c if unicodedata.category(c)[0] in "LMN" else " " for c in text).split())
+
+    @staticmethod
+    def trigrams(text: str) -> set[str]:
+        """Every GRAM_SIZE code point substring of text"""
+        return {text[i:i + SearchIndex.GRAM_SIZE] for i in range(len(text) - SearchIndex.GRAM_SIZE + 1)}
+
+    def add(self, filename: str, frontend_data: Mapping[str, Any]) -> None:
+        """Adds (or replaces) the song written to filename"""
+        values = set()
+        for key in SearchIndex.SEARCH_KEYS:
+            value = frontend_data.get(key)
+            for item in (value if isinstance(value, list) else [value]):
+                normalized = SearchIndex.normalize(item) if item else ""
+                if normalized:
+                    values.add(normalized)
+        self._values[filename] = values
+        self._titles[filename] = frontend_data.get("title", "")
+
+    def to_bytes(self) -> bytes:
+        """Serializes the index"""
+        filenames = sorted(self._values)
+        trigrams: dict[str, set[int]] = {}
+        for song_id, filename in enumerate(filenames):
+            for value in self._values[filename]:
+                for gram in SearchIndex.trigrams(f" {value} "):
+                    trigrams.setdefault(gram, set()).add(song_id)
+
+        payload = {
+            "version": SearchIndex.INDEX_VERSION,
+            "songs": filenames,
+            "titles": [self._titles[filename] for filename in filenames],
+            "trigrams": {gram: sorted(ids) for gram, ids in trigrams.items()},
+        }
+        return CatalogIndex._encode(payload)
+
+class FacetIndex:
+    """
+    Facets of the catalog, so the frontend filters songs by intersecting bitsets instead of walking every song.
+
+    Holds the distinct values of each facet with the number of songs having them, plus the set of songs having each
+    value, having a PDF for each key, and having any TV size PDF. Songs are numbered by their position in "songs", the
+    sorted list of song filenames ("titles" holds their titles in the same order).
+
+    A set of songs is written in whichever of two forms is shorter: a base64 encoded bitset, where bit i (bit i % 8 of
+    byte i // 8) stands for song i, or a sorted list of song numbers. A bitset costs about 1.33 characters per 8 songs
+    of the catalog whatever it holds, and a list about 4-5 characters per song it holds in a catalog of a few thousand,
+    so the crossover is around one song in 30: most producers, singers and labels (a handful of songs each) are
+    written as lists, while keys and statuses (most of the catalog) are written as bitsets.
+
+        {"version", "songs", "titles",
+         "facets": {"producer" | "singer" | "label" | "status": {value: {"count", "songs"}}},
+         "keys": {key: songs}, "tvSizeKeys": {key: songs}, "tvSize": songs}
+    """
+    INDEX_VERSION = 2
+    FILENAME = "facets.json"
+
+    # Frontend JSON fields whose values make up each facet
+    FACET_KEYS = {
+        "producer": ("producer", "additionalProducers"),
+        "singer": ("singer", "additionalVoices"),
+        "label": ("labels",),
+        "status": ("status",),
+    }
+
+    def __init__(self):
+        self._songs: dict[str, Mapping[str, Any]] = {}
+
+    def add(self, filename: str, frontend_data: Mapping[str, Any]) -> None:
+        """Adds (or replaces) the song written to filename"""
+        self._songs[filename] = frontend_data
+
+    @staticmethod
+    def _encode_bitset(bits: int, size: int) -> str:
+        return base64.b64encode(bits.to_bytes((size + 7) // 8, "little")).decode("ascii")
+
+    @staticmethod
+    def _encode_songs(bits: int, size: int) -> str | list[int]:
+        """Encodes the songs whose bits are set in bits, as a bitset or a list of song numbers, whichever is shorter"""
+        bitset = FacetIndex._encode_bitset(bits, size)
+        # Every listed song takes at least two characters (a digit and a comma), so don't bother listing big sets
+        if 2 * bits.bit_count() > len(bitset):
+            return bitset
+
+        song_ids = []
+        while bits:
+            lowest = bits & -bits
+            song_ids.append(lowest.bit_length() - 1)
+            bits ^= lowest
+        return song_ids if len(CatalogIndex._encode(song_ids)) < len(bitset) + 2 else bitset
+
+    def to_bytes(self) -> bytes:
+        """Serializes the index"""
+        filenames = sorted(self._songs)
+        facets: dict[str, dict[str, int]] = {facet: {} for facet in FacetIndex.FACET_KEYS}
+        keys: dict[str, int] = {}
+        tv_size_keys: dict[str, int] = {}
+        tv_size = 0
+        for song_id, filename in enumerate(filenames):
+            song_data = self._songs[filename]
+            bit = 1 << song_id
+            for facet, facet_keys in FacetIndex.FACET_KEYS.items():
+                for key in facet_keys:
+                    value = song_data.get(key)
+                    for item in (value if isinstance(value, list) else [value]):
+                        if item:
+                            facets[facet][item] = facets[facet].get(item, 0) | bit
+            for key in _available_keys(song_data.get("pdfs", {})):
+                keys[key] = keys.get(key, 0) | bit
+            for key in _available_keys(song_data.get("pdfsTvSize", {})):
+                tv_size_keys[key] = tv_size_keys.get(key, 0) | bit
+                tv_size |= bit
+
+        size = len(filenames)
+        payload = {
+            "version": FacetIndex.INDEX_VERSION,
+            "songs": filenames,
+            "titles": [self._songs[filename].get("title", "") for filename in filenames],
+            "facets": {
+                facet: {
+                    value: {"count": bits.bit_count(), "songs": FacetIndex._encode_songs(bits, size)}
+                    for value, bits in values.items()
+                }
+                for facet, values in facets.items()
+            },
+            "keys": {key: FacetIndex._encode_songs(bits, size) for key, bits in keys.items()},
+            "tvSizeKeys": {key: FacetIndex._encode_songs(bits, size) for key, bits in tv_size_keys.items()},
+            "tvSize": FacetIndex._encode_songs(tv_size, size),
+        }
+        return CatalogIndex._encode(payload)
@@ -0,0 +1,144 @@
+import json
+import hashlib
+import dataclasses
+
+from song_data_access import SongRecord
+from typing import Any, Mapping
+
+class SheetRow:
+    """
+    One row of the Songs (or TV Size Sheets) worksheet, along with what we resolved for it from Drive and the sheet's
+    smart chips. Column values are read with get(), like the gspread record dict the row was built from.
+    """
+    __slots__ = ("row_index", "values", "song_record", "hyperlinks")
+
+    def __init__(
+        self,
+        row_index: int,
+        values: Mapping[str, Any],
+        song_record: SongRecord | None = None,
+        hyperlinks: dict[str, str] | None = None,
+    ):
+        self.row_index = row_index
+        self.values = values
+        self.song_record = song_record
+        self.hyperlinks = hyperlinks if hyperlinks is not None else {}
+
+    def get(self, column: str, default: Any = None) -> Any:
+        return self.values.get(column, default)
+
+    def content_hash(self) -> str:
+        """Hash of the row's cell values and smart chip links, used to tell which rows changed since the last sync"""
+        content = {"values": self.values, "hyperlinks": self.hyperlinks}
+        return hashlib.sha256(
+            json.dumps(content, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest()
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CatalogSong:
+    """
+    A song as it is written to frontend/src/data/<slug>.json (minus the syncedAt/updatedAt timestamps).
+
+    Built once per song and never copied: its canonical JSON encoding and the digest of that encoding are computed once
+    at construction and reused for content hashing and for diffing against what is already on disk.
+    """
+    title: str
+    alternative_names: list[str]
+    producer: str
+    additional_producers: list[str]
+    singer: str
+    additional_voices: list[str]
+    release_date: str
+    length: str
+    tv_size_length: str
+    bpm: int | None
+    labels: list[str]
+    transcriber: str
+    video_links: dict[str, str]
+    links: dict[str, str]
+    pdf_checksums: dict[str, str | None]
+    pdfs: dict[str, str]
+    pdfs_tv_size: dict[str, str]
+    status: str
+
+    # Whether any PDF was downloaded for this song during this run; not part of the song's content
+    downloaded: bool = dataclasses.field(default=False, compare=False)
+    canonical: bytes = dataclasses.field(init=False, repr=False, compare=False)
+    digest: str = dataclasses.field(init=False, repr=False, compare=False)
+
+    # Frontend JSON key for each field, in the order the fields are written
+    FRONTEND_KEYS = {
+        "title": "title",
+        "alternative_names": "alternativeNames",
+        "producer": "producer",
+        "additional_producers": "additionalProducers",
+        "singer": "singer",
+        "additional_voices": "additionalVoices",
+        "release_date": "releaseDate",
+        "length": "length",
+        "tv_size_length": "tvSizeLength",
+        "bpm": "bpm",
+        "labels": "labels",
+        "transcriber": "transcriber",
+        "video_links": "videoLinks",
+        "links": "links",
+        "pdf_checksums": "pdfChecksums",
+        "pdfs": "pdfs",
+        "pdfs_tv_size": "pdfsTvSize",
+        "status": "status",
+    }
+    TIMESTAMP_KEYS = ("syncedAt", "updatedAt")
+
+    def __post_init__(self):
+        object.__setattr__(self, "canonical", CatalogSong.canonical_bytes(self.to_frontend_dict()))
+        object.__setattr__(self, "digest", hashlib.sha256(self.canonical).hexdigest())
+
+    @staticmethod
+    def canonical_bytes(frontend_data: Mapping[str, Any]) -> bytes:
+        """Deterministic JSON encoding of a song's frontend data, used for hashing and comparisons"""
+        return json.dumps(frontend_data, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+
+    def to_frontend_dict(self) -> dict[str, Any]:
+        """The song's frontend JSON content, in the order it is written"""
+        return {key: getattr(self, field) for field, key in CatalogSong.FRONTEND_KEYS.items()}
+
+    def content_snapshot(self) -> dict[str, Any]:
+        """The content-bearing part of the song (status and PDFs); changes to it bump updatedAt"""
+        return CatalogSong.content_snapshot_of(self.to_frontend_dict())
+
+    @staticmethod
+    def content_snapshot_of(frontend_data: Mapping[str, Any]) -> dict[str, Any]:
+        return {
+            'status': frontend_data.get('status', 'completed'),
+            'pdfs': frontend_data.get('pdfs', {}),
+            'pdfsTvSize': frontend_data.get('pdfsTvSize', {}),
+            'pdfChecksums': frontend_data.get('pdfChecksums', {}),
+            'links': frontend_data.get('links', {}),
+        }
+
+    @classmethod
+    def from_frontend_json(cls, data: Mapping[str, Any]) -> "CatalogSong":
+        """Rebuilds a song from its existing frontend JSON (timestamps are ignored)"""
+        defaults = {
+            "alternativeNames": [], "additionalProducers": [], "additionalVoices": [], "length": "",
+            "tvSizeLength": "", "bpm": None, "labels": [], "transcriber": "", "videoLinks": {}, "links": {},
+            "pdfChecksums": {}, "pdfs": {}, "pdfsTvSize": {}, "status": "completed",
+        }
+        return cls(**{
+            field: data.get(key, defaults.get(key, ""))
+            for field, key in CatalogSong.FRONTEND_KEYS.items()
+        })
+
+    @staticmethod
+    def root_digest(song_digests: Mapping[str, str]) -> str:
+        """
+        Digest of a whole catalog, computed from the per-song digests alone (the root of a two level hash tree), so
+        the catalog never has to be re-serialized to hash it.
+
+        Args:
+            song_digests: Mapping of each song's filename to its digest
+        """
+        hash_root = hashlib.sha256()
+        for filename in sorted(song_digests):
+            hash_root.update(f"{filename}\0{song_digests[filename]}\n".encode("utf-8"))
+        return hash_root.hexdigest()
@@ -0,0 +1,150 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+_logger = logging.getLogger(__name__)
+
+class ChecksumIndex:
+    """
+    Persistent index of the md5 checksums of local files, so files which haven't changed are never read again just to
+    hash them.
+
+    Each entry is keyed by the file's path and remembers the (size, mtime_ns, inode) it had when it was hashed; a file
+    whose stat no longer matches is hashed again. Whoever writes a file with a known checksum should record() it, so
+    even freshly written files don't need to be read back.
+
+    A fresh checkout (every CI run) gives every file a new mtime and inode, so callers which know the checksum a file
+    was committed with can pass it to md5(), which then trusts it as long as the file's size still matches.
+    """
+    INDEX_VERSION = 1
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, index_file: str | os.PathLike | None = None, rebuild: bool = False):
+        """
+        Args:
+            index_file: Path of the JSON file backing this index. If None, the index only lives in memory.
+            rebuild: Ignore the saved entries, so every file is hashed again (and the index rewritten) this run
+        """
+        self._index_file = index_file
+        self._lock = threading.Lock()
+        self._rebuild = rebuild
+        self._entries: dict[str, dict] = {} if rebuild else self._load()
+        self._dirty = rebuild
+
+    def _load(self) -> dict[str, dict]:
+        if not self._index_file or not os.path.exists(self._index_file):
+            return {}
+
+        try:
+            with open(self._index_file, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except Exception as e:
+            _logger.warning(f"Ignoring unreadable checksum index {self._index_file}: {e}")
+            return {}
+
+        if payload.get("version") != ChecksumIndex.INDEX_VERSION:
+            return {}
+        return payload.get("entries", {})
+
+    def save(self) -> None:
+        """Atomically persists the index to disk (if anything changed), dropping entries for files that are gone"""
+        if not self._index_file:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+            self._entries = {path: entry for path, entry in self._entries.items() if os.path.exists(path)}
+            entries = dict(self._entries)
+            self._dirty = False
+
+        directory = os.path.dirname(self._index_file) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False, encoding='utf-8') as f:
+                json.dump({"version": ChecksumIndex.INDEX_VERSION, "entries": entries}, f)
+                temp_path = f.name
+            os.replace(temp_path, self._index_file)
+        except Exception as e:
+            _logger.warning(f"Failed to persist checksum index {self._index_file}: {e}")
+
+    @staticmethod
+    def _key(path: str | os.PathLike) -> str:
+        return os.path.abspath(path)
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> dict:
+        return {"size": stat.st_size, "mtimeNs": stat.st_mtime_ns, "inode": stat.st_ino}
+
+    def md5(
+        self, path: str | os.PathLike, expected_md5: str | None = None, expected_size: int | str | None = None
+    ) -> str | None:
+        """
+        Returns the md5 of the file at path, only reading the file if it changed since it was last hashed or recorded.
+
+        Args:
+            path: File to hash
+            expected_md5: Checksum the file is known to have been committed with. If only the file's mtime or inode
+                          changed, as they do on a fresh checkout, it is trusted without reading the file as long as
+                          the file's size matches its entry (if that entry has the same md5) or expected_size. Ignored
+                          when the index is rebuilt.
+            expected_size: Size of the file expected_md5 belongs to, for files with no entry yet
+
+        Returns:
+            the md5 hex digest, or None if the file doesn't exist or can't be read
+        """
+        key = ChecksumIndex._key(path)
+        try:
+            signature = ChecksumIndex._signature(os.stat(path))
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            _logger.warning(f"Unable to stat file {path}: {e}")
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and all(entry.get(field) == value for field, value in signature.items()):
+            return entry["md5"]
+
+        if expected_md5 and not self._rebuild:
+            known_size = entry.get("size") if entry and entry.get("md5") == expected_md5 else expected_size
+            if known_size is not None and str(known_size) == str(signature["size"]):
+                with self._lock:
+                    self._entries[key] = {**signature, "md5": expected_md5}
+                    self._dirty = True
+                return expected_md5
+
+        try:
+            hash_md5 = hashlib.md5()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(ChecksumIndex.HASH_CHUNK_SIZE), b''):
+                    hash_md5.update(chunk)
+        except OSError as e:
+            _logger.warning(f"Unable to hash file {path}: {e}")
+            return None
+
+        md5 = hash_md5.hexdigest()
+        with self._lock:
+            self._entries[key] = {**signature, "md5": md5}
+            self._dirty = True
+        return md5
+
+    def record(self, path: str | os.PathLike, md5: str) -> None:
+        """Records md5 as the checksum of the file just written at path, without reading it"""
+        try:
+            signature = ChecksumIndex._signature(os.stat(path))
+        except OSError as e:
+            _logger.warning(f"Unable to stat file {path}: {e}")
+            return
+
+        with self._lock:
+            self._entries[ChecksumIndex._key(path)] = {**signature, "md5": md5}
+            self._dirty = True
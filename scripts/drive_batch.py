@@ -0,0 +1,247 @@
+import time
+import uuid
+import heapq
+import logging
+import itertools
+import threading
+import urllib.parse
+import concurrent.futures
+
+import requests
+
+from rate_limit import RateLimiter, get_rate_limiter
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+_logger = logging.getLogger(__name__)
+
+class DriveMetadataBatcher:
+    """
+    Collects Drive file metadata requests made from any thread and sends them together as Drive batch requests
+    (multipart/mixed, up to MAX_BATCH_SIZE requests each), DataLoader style.
+
+    Callers keep a per-file API: load() blocks until the batch containing the request comes back, then returns that
+    file's metadata (or raises requests.HTTPError, just like a standalone files.get call would).
+
+    Items throttled within an otherwise successful batch are handed back to the dispatcher with the time their backoff
+    ends, and join whichever batch is sent after that, so no batch worker ever sleeps through a backoff.
+    """
+    BATCH_URL = "https://www.googleapis.com/batch/drive/v3"
+    FILES_PATH = "/drive/v3/files"
+    MAX_BATCH_SIZE = 100
+
+    def __init__(
+        self,
+        session: requests.Session,
+        fields: str = "id,name,mimeType,md5Checksum,modifiedTime,size",
+        window_seconds: float = 0.02,
+        max_inflight_batches: int = 4,
+    ):
+        """
+        Args:
+            session: (Authorized) HTTP session which batch requests are sent with
+            fields: Drive metadata fields requested for every file
+            window_seconds: How long to wait for more requests to join a batch before sending it
+            max_inflight_batches: How many batch requests may be in flight at once
+        """
+        self._session = session
+        self._fields = fields
+        self._window_seconds = window_seconds
+
+        self._condition = threading.Condition()
+        # Items to put in the next batch: file ID -> (future, attempt)
+        self._pending: dict[str, tuple[concurrent.futures.Future, int]] = {}
+        # Throttled items waiting out their backoff: a heap of (due time, sequence, file ID), and file ID -> (future,
+        # attempt)
+        self._retry_times: list[tuple[float, int, str]] = []
+        self._retrying: dict[str, tuple[concurrent.futures.Future, int]] = {}
+        self._retry_sequence = itertools.count()
+        self._dispatcher: threading.Thread | None = None
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_inflight_batches, thread_name_prefix="drive-batch"
+        )
+
+    def load(self, file_id: str) -> dict:
+        """Returns the metadata of file_id, fetched as part of a batch request."""
+        return self.load_async(file_id).result()
+
+    def load_async(self, file_id: str) -> concurrent.futures.Future:
+        """Queues file_id for the next batch and returns a future for its metadata."""
+        with self._condition:
+            # Identical requests within the same window (or while the item waits out a backoff) share a single item
+            entry = self._pending.get(file_id) or self._retrying.get(file_id)
+            if entry is None:
+                entry = (concurrent.futures.Future(), 0)
+                self._pending[file_id] = entry
+            future = entry[0]
+
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, name="drive-batch-dispatch", daemon=True)
+                self._dispatcher.start()
+            self._condition.notify()
+        return future
+
+    def _promote_due_retries(self) -> None:
+        """Moves the throttled items whose backoff is over back into the pending items. Called with the lock held."""
+        now = time.monotonic()
+        while self._retry_times and self._retry_times[0][0] <= now:
+            _, _, file_id = heapq.heappop(self._retry_times)
+            self._pending[file_id] = self._retrying.pop(file_id)
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    self._promote_due_retries()
+                    if self._pending:
+                        break
+                    # Sleep until something is queued or the next backoff ends
+                    timeout = self._retry_times[0][0] - time.monotonic() if self._retry_times else None
+                    self._condition.wait(timeout)
+
+                # Give other threads a short window to add to this batch, unless it is already full
+                self._condition.wait_for(
+                    lambda: len(self._pending) >= DriveMetadataBatcher.MAX_BATCH_SIZE, timeout=self._window_seconds
+                )
+                self._promote_due_retries()
+
+                batch = dict(list(self._pending.items())[:DriveMetadataBatcher.MAX_BATCH_SIZE])
+                for file_id in batch:
+                    del self._pending[file_id]
+
+            self._executor.submit(self._send_batch, batch)
+
+    def _retry_later(self, items: dict[str, tuple[concurrent.futures.Future, int]]) -> None:
+        """Hands throttled items back to the dispatcher, to be sent again once their backoff is over"""
+        delays = {file_id: RateLimiter.backoff_delay(attempt) for file_id, (_, attempt) in items.items()}
+        _logger.warning(
+            f"{len(items)} Drive batch items were throttled, retrying them in up to {max(delays.values()):.1f}s"
+        )
+        with self._condition:
+            now = time.monotonic()
+            for file_id, (future, attempt) in items.items():
+                if file_id in self._pending:
+                    # The file was requested again while this item was in flight, and is about to be sent anyway
+                    DriveMetadataBatcher._follow(self._pending[file_id][0], future)
+                    continue
+                self._retrying[file_id] = (future, attempt + 1)
+                heapq.heappush(self._retry_times, (now + delays[file_id], next(self._retry_sequence), file_id))
+            self._condition.notify()
+
+    @staticmethod
+    def _follow(source: concurrent.futures.Future, target: concurrent.futures.Future) -> None:
+        """Completes target with whatever source completes with"""
+        def copy(done: concurrent.futures.Future) -> None:
+            if done.exception() is not None:
+                target.set_exception(done.exception())
+            else:
+                target.set_result(done.result())
+        source.add_done_callback(copy)
+
+    def _send_batch(self, batch: dict[str, tuple[concurrent.futures.Future, int]]) -> None:
+        file_ids = list(batch.keys())
+        try:
+            responses = self._execute(file_ids)
+        except Exception as e:
+            _logger.warning(f"Drive batch request of {len(file_ids)} items failed: {e}")
+            for future, _ in batch.values():
+                future.set_exception(e)
+            return
+
+        # The batch request itself can succeed while individual items are throttled; retry just those items
+        retry_items = {}
+        for index, file_id in enumerate(file_ids):
+            future, attempt = batch[file_id]
+            response = responses.get(index)
+            if response is not None and RateLimiter.is_retryable(response) and attempt < RateLimiter.MAX_RETRIES:
+                if RateLimiter.is_throttled(response):
+                    get_rate_limiter().record_throttle("drive")
+                retry_items[file_id] = batch[file_id]
+                continue
+            try:
+                if response is None:
+                    raise requests.HTTPError(f"Drive batch response is missing an entry for {file_id}")
+                response.raise_for_status()
+                future.set_result(response.json())
+            except Exception as e:
+                future.set_exception(e)
+
+        if retry_items:
+            self._retry_later(retry_items)
+
+    def _execute(self, file_ids: list[str]) -> dict[int, requests.Response]:
+        """Sends one batch request and returns the response to each item, keyed by the item's index."""
+        boundary = f"batch_{uuid.uuid4().hex}"
+        query = urllib.parse.urlencode({"fields": self._fields, "supportsAllDrives": "true"})
+
+        parts = []
+        for index, file_id in enumerate(file_ids):
+            parts.append(
+                f"--{boundary}\r\n"
+                f"Content-Type: application/http\r\n"
+                f"Content-ID: <item{index}>\r\n"
+                f"\r\n"
+                f"GET {DriveMetadataBatcher.FILES_PATH}/{urllib.parse.quote(file_id)}?{query}\r\n"
+                f"\r\n"
+            )
+        body = "".join(parts) + f"--{boundary}--\r\n"
+
+        response = self._session.post(
+            DriveMetadataBatcher.BATCH_URL,
+            data=body.encode("utf-8"),
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+            timeout=60,
+        )
+        response.raise_for_status()
+        return DriveMetadataBatcher.parse_batch_response(
+            response.headers.get("Content-Type", ""), response.content, file_ids
+        )
+
+    @staticmethod
+    def parse_batch_response(content_type: str, content: bytes, file_ids: list[str]) -> dict[int, requests.Response]:
+        """
+        Splits a multipart/mixed batch response into one requests.Response per item.
+
+        Returns:
+            a dictionary mapping each item's index (from its "response-item<index>" Content-ID) to its response
+        """
+        boundary = None
+        for param in content_type.split(";")[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "boundary":
+                boundary = value.strip('"')
+        if not boundary:
+            raise ValueError(f"Drive batch response has no multipart boundary (Content-Type: {content_type})")
+
+        text = content.decode("utf-8")
+        responses = {}
+        for part in text.split(f"--{boundary}"):
+            part = part.strip("\r\n")
+            if not part or part == "--":
+                continue
+
+            part_headers, _, http_response = part.replace("\r\n", "\n").partition("\n\n")
+            content_id = None
+            for line in part_headers.split("\n"):
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "content-id":
+                    content_id = value.strip().strip("<>")
+            if not content_id or not content_id.startswith("response-item"):
+                continue
+            index = int(content_id[len("response-item"):])
+
+            status_line, _, rest = http_response.partition("\n")
+            _, _, body = rest.partition("\n\n")
+            _, status_code, reason = (status_line.split(" ", 2) + [""])[:3]
+
+            item_response = requests.Response()
+            item_response.status_code = int(status_code)
+            item_response.reason = reason
+            item_response.url = f"https://www.googleapis.com{DriveMetadataBatcher.FILES_PATH}/{file_ids[index]}"
+            item_response._content = body.strip().encode("utf-8")
+            item_response.encoding = "utf-8"
+            responses[index] = item_response
+
+        return responses
@@ -0,0 +1,89 @@
+import logging
+
+from gdrive_session import GDriveSession
+from song_data_access import SongDataAccess, normalize_name
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+_logger = logging.getLogger(__name__)
+
+# Key reported for a song when a change touches it but we can't tell which chart was affected
+UNKNOWN_KEY = "*"
+
+def parse_chart_filename(filename: str) -> tuple[str, str, bool] | None:
+    """
+    Splits a chart PDF filename into its parts (see SongDataAccess.parse_chart_filename()).
+
+    Returns:
+        a tuple of (normalized song basename "{producer} - {song name}", key, is_tv_size), or None if the filename
+        isn't a chart
+    """
+    return SongDataAccess.parse_chart_filename(filename)
+
+def chart_label(key: str, is_tv: bool) -> str:
+    return f"TV-{key}" if is_tv else key
+
+def map_changes_to_songs(
+    changes: list[dict],
+    file_index: dict[str, dict],
+    folder_index: dict[str, str],
+    basename_to_slug: dict[str, str],
+) -> dict[str, set[str]]:
+    """
+    Maps the results of GDriveSession.list_changes() back onto the songs (and keys) they affect.
+
+    A change is attributed to a song when any of these match, in order:
+    - its file ID is a chart we resolved for the song last run (file_index)
+    - it lives in (or is) the song's chart folder (folder_index)
+    - its name follows the chart naming convention for a known song (basename_to_slug), compared after normalization
+
+    Args:
+        changes: Changes as returned by GDriveSession.list_changes()
+        file_index: Drive file ID -> {"slug": <song slug>, "key": <key>, "tv": <is TV size chart>}
+        folder_index: Drive folder ID -> song slug
+        basename_to_slug: "{producer} - {song name}" -> song slug
+
+    Returns:
+        a dictionary mapping each affected song slug to the chart labels that changed ("C", "TV-Bb", ...). Changes
+        which couldn't be pinned to a single key are reported as UNKNOWN_KEY.
+    """
+    affected: dict[str, set[str]] = {}
+    normalized_basename_to_slug = {normalize_name(basename): slug for basename, slug in basename_to_slug.items()}
+
+    for change in changes:
+        file_id = change.get("fileId")
+        file_meta = change.get("file") or {}
+        name = file_meta.get("name", "")
+
+        if file_id in file_index:
+            entry = file_index[file_id]
+            affected.setdefault(entry["slug"], set()).add(chart_label(entry["key"], entry.get("tv", False)))
+            continue
+
+        if file_id in folder_index:
+            affected.setdefault(folder_index[file_id], set()).add(UNKNOWN_KEY)
+            continue
+
+        parsed = parse_chart_filename(name)
+        parent_slugs = {folder_index[parent] for parent in file_meta.get("parents", []) if parent in folder_index}
+        if parent_slugs:
+            label = chart_label(parsed[1], parsed[2]) if parsed else UNKNOWN_KEY
+            for slug in parent_slugs:
+                affected.setdefault(slug, set()).add(label)
+            continue
+
+        if parsed and parsed[0] in normalized_basename_to_slug:
+            affected.setdefault(normalized_basename_to_slug[parsed[0]], set()).add(chart_label(parsed[1], parsed[2]))
+            continue
+
+        # A new or renamed chart folder for a song we already know about
+        folder_slug = normalized_basename_to_slug.get(normalize_name(name))
+        if file_meta.get("mimeType") == GDriveSession.MIME_TYPE_DRIVE_FOLDER and folder_slug:
+            affected.setdefault(folder_slug, set()).add(UNKNOWN_KEY)
+            continue
+
+        _logger.debug(f"Drive change for {file_id} ('{name}') doesn't map to any song")
+
+    return affected
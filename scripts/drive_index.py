@@ -0,0 +1,374 @@
+#!/usr/bin/env python
+
+import os
+import time
+import sqlite3
+import logging
+import pathlib
+import threading
+
+import env_config
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    from gdrive_session import GDriveSession
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+_logger = logging.getLogger(__name__)
+
+class DriveIndex:
+    """
+    Local SQLite mirror of one Drive folder tree (by default "Lead Sheets"), so lookups which would otherwise cost a
+    Drive API round trip each are answered from disk.
+
+    The mirror is built by a single breadth-first crawl (one multi-folder query per tree level, see build()) and kept
+    current in place with the Drive Changes API (see refresh()). Every folder inside the tree is fully mirrored, so a
+    lookup in one of them is authoritative: a file missing from the index is missing from Drive as of the last refresh.
+    """
+    SCHEMA_VERSION = 2
+    MIME_TYPE_DRIVE_FOLDER = "application/vnd.google-apps.folder"
+
+    def __init__(self, db_path: str | os.PathLike | None = None):
+        """
+        Args:
+            db_path: SQLite file holding the mirror. Defaults to drive_index.sqlite in the cache dir.
+        """
+        if db_path is None:
+            db_path = env_config.get_cache_dir() / "drive_index.sqlite"
+        self._db_path = db_path
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        with self._lock:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            version = self._get_meta("schemaVersion")
+            if version is not None and int(version) != DriveIndex.SCHEMA_VERSION:
+                # Tables are recreated rather than emptied, since their columns may have changed
+                _logger.info(f"Drive index schema changed ({version} -> {DriveIndex.SCHEMA_VERSION}), discarding it")
+                self._connection.executescript(
+                    "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS parents; DELETE FROM meta;"
+                )
+
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    mimeType TEXT NOT NULL,
+                    md5Checksum TEXT,
+                    modifiedTime TEXT,
+                    size TEXT
+                );
+                CREATE TABLE IF NOT EXISTS parents (
+                    file_id TEXT NOT NULL,
+                    parent_id TEXT NOT NULL,
+                    PRIMARY KEY (file_id, parent_id)
+                );
+                CREATE INDEX IF NOT EXISTS parents_by_parent ON parents (parent_id);
+                CREATE INDEX IF NOT EXISTS files_by_name ON files (name);
+                """
+            )
+            self._set_meta("schemaVersion", str(DriveIndex.SCHEMA_VERSION))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _get_meta(self, key: str) -> str | None:
+        row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def root_id(self) -> str | None:
+        """Drive ID of the folder this index mirrors, or None if it has never been built"""
+        with self._lock:
+            return self._get_meta("rootId")
+
+    @property
+    def is_built(self) -> bool:
+        return self.root_id is not None
+
+    # Lookups
+
+    @staticmethod
+    def _row_to_metadata(row: sqlite3.Row, parents: list[str]) -> dict[str, Any]:
+        """Converts a row into the same shape of metadata dictionary the Drive API returns"""
+        metadata = {
+            "id": row["id"],
+            "name": row["name"],
+            "mimeType": row["mimeType"],
+            "parents": parents,
+        }
+        if row["md5Checksum"] is not None:
+            metadata["md5Checksum"] = row["md5Checksum"]
+        if row["modifiedTime"] is not None:
+            metadata["modifiedTime"] = row["modifiedTime"]
+        if row["size"] is not None:
+            metadata["size"] = row["size"]
+        return metadata
+
+    def _query(self, sql: str, params: Iterable[Any]) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute(sql, tuple(params)).fetchall()
+            parents: dict[str, list[str]] = {}
+            ids = [row["id"] for row in rows]
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                for parent_row in self._connection.execute(
+                    f"SELECT file_id, parent_id FROM parents WHERE file_id IN ({','.join('?' * len(chunk))})", chunk
+                ):
+                    parents.setdefault(parent_row["file_id"], []).append(parent_row["parent_id"])
+        return [DriveIndex._row_to_metadata(row, parents.get(row["id"], [])) for row in rows]
+
+    def covers(self, folder_id: str) -> bool:
+        """True if folder_id is a folder inside the mirrored tree, i.e. its contents are fully known"""
+        with self._lock:
+            if folder_id == self._get_meta("rootId"):
+                return True
+            row = self._connection.execute("SELECT mimeType FROM files WHERE id = ?", (folder_id,)).fetchone()
+            return row is not None and row["mimeType"] == DriveIndex.MIME_TYPE_DRIVE_FOLDER
+
+    def get(self, file_id: str) -> dict[str, Any] | None:
+        """Returns the metadata of file_id, or None if it isn't in the index"""
+        results = self._query("SELECT * FROM files WHERE id = ?", (file_id,))
+        return results[0] if results else None
+
+    def children(self, folder_ids: str | Iterable[str], mime_type: str | None = None) -> list[dict[str, Any]]:
+        """Returns the metadata of every file directly inside any of folder_ids (optionally only of mime_type)"""
+        if isinstance(folder_ids, str):
+            folder_ids = [folder_ids]
+        folder_ids = list(dict.fromkeys(folder_ids))
+
+        results = []
+        for start in range(0, len(folder_ids), 500):
+            chunk = folder_ids[start:start + 500]
+            sql = (
+                "SELECT DISTINCT files.* FROM files JOIN parents ON parents.file_id = files.id "
+                f"WHERE parents.parent_id IN ({','.join('?' * len(chunk))})"
+            )
+            params = list(chunk)
+            if mime_type:
+                sql += " AND files.mimeType = ?"
+                params.append(mime_type)
+            results.extend(self._query(sql, params))
+        return results
+
+    def find(self, folder_id: str, name: str, mime_type: str | None = None) -> list[dict[str, Any]]:
+        """Returns the metadata of every file named name directly inside folder_id (optionally only of mime_type)"""
+        sql = (
+            "SELECT files.* FROM files JOIN parents ON parents.file_id = files.id "
+            "WHERE parents.parent_id = ? AND files.name = ?"
+        )
+        params = [folder_id, name]
+        if mime_type:
+            sql += " AND files.mimeType = ?"
+            params.append(mime_type)
+        return self._query(sql, params)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counts = self._connection.execute(
+                "SELECT COUNT(*) AS total, SUM(mimeType = ?) AS folders FROM files", (DriveIndex.MIME_TYPE_DRIVE_FOLDER,)
+            ).fetchone()
+            return {
+                "rootId": self._get_meta("rootId"),
+                "builtAt": self._get_meta("builtAt"),
+                "refreshedAt": self._get_meta("refreshedAt"),
+                "files": counts["total"] or 0,
+                "folders": counts["folders"] or 0,
+            }
+
+    # Maintenance
+
+    def _upsert(self, metadata: dict[str, Any]) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO files (id, name, mimeType, md5Checksum, modifiedTime, size) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                metadata["id"],
+                metadata.get("name", ""),
+                metadata.get("mimeType", ""),
+                metadata.get("md5Checksum"),
+                metadata.get("modifiedTime"),
+                metadata.get("size"),
+            ),
+        )
+        self._connection.execute("DELETE FROM parents WHERE file_id = ?", (metadata["id"],))
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO parents (file_id, parent_id) VALUES (?, ?)",
+            [(metadata["id"], parent_id) for parent_id in metadata.get("parents", [])],
+        )
+
+    def _delete_tree(self, file_id: str) -> None:
+        """Removes file_id and, if it is a folder, everything below it"""
+        self._connection.execute(
+            """
+            WITH RECURSIVE subtree(id) AS (
+                SELECT ?
+                UNION
+                SELECT parents.file_id FROM parents JOIN subtree ON parents.parent_id = subtree.id
+            )
+            DELETE FROM files WHERE id IN subtree
+            """,
+            (file_id,),
+        )
+        self._connection.execute("DELETE FROM parents WHERE file_id NOT IN (SELECT id FROM files)")
+
+    def _crawl(self, session: "GDriveSession", folder_ids: list[str]) -> int:
+        """Mirrors everything below folder_ids, one multi-folder listing per tree level. Returns the number of files."""
+        total = 0
+        level = folder_ids
+        while level:
+            files = session.find_all_files_in_many(level, live=True)
+            for metadata in files:
+                self._upsert(metadata)
+            total += len(files)
+            level = [metadata["id"] for metadata in files if metadata["mimeType"] == DriveIndex.MIME_TYPE_DRIVE_FOLDER]
+        return total
+
+    def build(self, session: "GDriveSession", root_dir: pathlib.Path = pathlib.Path("Lead Sheets")) -> None:
+        """
+        (Re)builds the whole mirror of root_dir with a fresh crawl.
+
+        The changes page token is taken before crawling, so anything modified during the crawl is picked up again by
+        the next refresh().
+        """
+        started = time.monotonic()
+        root_id = session.find_drive_id_by_dir(root_dir)
+        page_token = session.get_changes_start_page_token()
+
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.execute("DELETE FROM files")
+                self._connection.execute("DELETE FROM parents")
+                total = self._crawl(session, [root_id])
+                self._set_meta("rootId", root_id)
+                self._set_meta("rootDir", root_dir.as_posix())
+                self._set_meta("changesPageToken", page_token)
+                self._set_meta("builtAt", str(time.time()))
+                self._set_meta("refreshedAt", str(time.time()))
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+        _logger.info(f"Built Drive index of '{root_dir}': {total} files in {time.monotonic() - started:.1f}s")
+
+    def refresh(self, session: "GDriveSession") -> int:
+        """
+        Applies every Drive change since the last build()/refresh() to the mirror.
+
+        Returns:
+            the number of changes which touched the mirrored tree
+        """
+        with self._lock:
+            page_token = self._get_meta("changesPageToken")
+            root_id = self._get_meta("rootId")
+        if page_token is None or root_id is None:
+            raise ValueError("Drive index has not been built yet; call build() first")
+
+        changes, new_page_token = session.list_changes(page_token)
+
+        applied = 0
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                for change in changes:
+                    if self._apply_change(session, root_id, change):
+                        applied += 1
+                self._set_meta("changesPageToken", new_page_token)
+                self._set_meta("refreshedAt", str(time.time()))
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+        _logger.info(f"Refreshed Drive index: {applied} of {len(changes)} changes touched the mirrored tree")
+        return applied
+
+    def _apply_change(self, session: "GDriveSession", root_id: str, change: dict) -> bool:
+        file_id = change.get("fileId")
+        metadata = change.get("file") or {}
+        known = self._connection.execute("SELECT 1 FROM files WHERE id = ?", (file_id,)).fetchone() is not None
+
+        if change.get("removed") or metadata.get("trashed"):
+            if known:
+                self._delete_tree(file_id)
+            return known
+
+        parents = metadata.get("parents", [])
+        inside = any(
+            parent_id == root_id or self._connection.execute(
+                "SELECT 1 FROM files WHERE id = ? AND mimeType = ?", (parent_id, DriveIndex.MIME_TYPE_DRIVE_FOLDER)
+            ).fetchone()
+            for parent_id in parents
+        )
+
+        if not inside:
+            # Moved out of the tree (or never in it)
+            if known:
+                self._delete_tree(file_id)
+            return known
+
+        self._upsert({**metadata, "id": file_id})
+        if not known and metadata.get("mimeType") == DriveIndex.MIME_TYPE_DRIVE_FOLDER:
+            # A folder moved into the tree brings its contents along without a change entry for each of them
+            self._crawl(session, [file_id])
+        return True
+
+    def build_or_refresh(self, session: "GDriveSession", root_dir: pathlib.Path = pathlib.Path("Lead Sheets")) -> None:
+        """Refreshes the mirror of root_dir in place, building it from scratch if it doesn't exist or can't be refreshed"""
+        with self._lock:
+            built_root = self._get_meta("rootDir")
+        if built_root == root_dir.as_posix():
+            try:
+                self.refresh(session)
+                return
+            except Exception as e:
+                _logger.warning(f"Failed to refresh the Drive index, rebuilding it: {e}")
+        self.build(session, root_dir)
+
+
+def main():
+    import argparse
+    import tabulate
+    from gdrive_session import GDriveSession
+
+    parser = argparse.ArgumentParser(description="Local SQLite mirror of the Drive chart folders")
+    parser.add_argument("--db", default=None, help="Index database path (default: drive_index.sqlite in the cache dir)")
+
+    subparsers = parser.add_subparsers(dest="command", help='subcommand help')
+    parser_build = subparsers.add_parser("build", help="Crawl the drive and rebuild the index from scratch")
+    parser_build.add_argument("root_dir", nargs="?", default="Lead Sheets", help="Folder to mirror")
+    subparsers.add_parser("refresh", help="Apply Drive changes since the last build/refresh")
+    subparsers.add_parser("stats", help="Show what the index contains")
+    parser_list = subparsers.add_parser("list", help="List a folder from the index")
+    parser_list.add_argument("folder_id", help="Drive ID of the folder")
+    args = parser.parse_args()
+
+    index = DriveIndex(args.db)
+    if args.command == "build":
+        index.build(GDriveSession(), pathlib.Path(args.root_dir))
+    elif args.command == "refresh":
+        index.refresh(GDriveSession())
+    elif args.command == "stats":
+        print(tabulate.tabulate(index.stats().items()))
+    elif args.command == "list":
+        print(tabulate.tabulate(index.children(args.folder_id)))
+    else:
+        parser.print_help()
+        exit(1)
+
+if __name__ == "__main__":
+    main()
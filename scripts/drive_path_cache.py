@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import logging
+import pathlib
+import tempfile
+import threading
+import concurrent.futures
+
+from typing import Callable, Iterable
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+_logger = logging.getLogger(__name__)
+
+class DrivePathCache:
+    """
+    Persistent cache which maps folder paths (relative to a Drive root) to their Google Drive IDs.
+
+    Entries are stored in a JSON file so that they survive between runs, expire after a TTL, and can be explicitly
+    invalidated, either by path or by the IDs of folders which were renamed, moved or removed (see invalidate_ids()).
+    Concurrent lookups for the same path are merged so only one request is ever in flight per path.
+    """
+    DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_file: str | os.PathLike | None = None, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Args:
+            cache_file: Path of the JSON file backing this cache. If None, the cache only lives in memory.
+            ttl_seconds: How long a resolved path stays valid before it must be looked up again.
+        """
+        self._cache_file = cache_file
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._inflight: dict[str, concurrent.futures.Future] = {}
+        self._entries: dict[str, dict] = self._load()
+
+    @staticmethod
+    def _key(root_id: str, dir_path: pathlib.PurePath) -> str:
+        return f"{root_id}:{pathlib.PurePosixPath(*dir_path.parts)}"
+
+    def _load(self) -> dict[str, dict]:
+        if not self._cache_file or not os.path.exists(self._cache_file):
+            return {}
+
+        try:
+            with open(self._cache_file, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except Exception as e:
+            _logger.warning(f"Ignoring unreadable drive path cache {self._cache_file}: {e}")
+            return {}
+
+        if payload.get("version") != DrivePathCache.CACHE_VERSION:
+            return {}
+        return payload.get("entries", {})
+
+    def _save(self) -> None:
+        """Atomically persist the cache to disk. Must be called with the lock held."""
+        if not self._cache_file:
+            return
+
+        directory = os.path.dirname(self._cache_file) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False, encoding='utf-8') as f:
+                json.dump({"version": DrivePathCache.CACHE_VERSION, "entries": self._entries}, f, indent=2)
+                temp_path = f.name
+            os.replace(temp_path, self._cache_file)
+        except Exception as e:
+            _logger.warning(f"Failed to persist drive path cache {self._cache_file}: {e}")
+
+    def get(self, root_id: str, dir_path: pathlib.PurePath) -> str | None:
+        """Returns the cached drive ID for dir_path, or None if it is unknown or has expired."""
+        with self._lock:
+            entry = self._entries.get(self._key(root_id, dir_path))
+        if not entry or time.time() - entry["resolvedAt"] > self._ttl_seconds:
+            return None
+        return entry["id"]
+
+    def put(self, root_id: str, dir_path: pathlib.PurePath, drive_id: str) -> None:
+        with self._lock:
+            self._entries[self._key(root_id, dir_path)] = {"id": drive_id, "resolvedAt": time.time()}
+            self._save()
+
+    def invalidate(self, root_id: str | None = None, dir_path: pathlib.PurePath | None = None) -> None:
+        """
+        Drops cached entries. Invalidating a path also drops every path underneath it, since their IDs were resolved
+        through it.
+
+        Args:
+            root_id: Drive root the paths are relative to. If None, the whole cache is cleared.
+            dir_path: Path to invalidate. If None, every path under root_id is invalidated.
+        """
+        with self._lock:
+            if root_id is None:
+                self._entries.clear()
+            elif dir_path is None:
+                self._entries = {k: v for k, v in self._entries.items() if not k.startswith(f"{root_id}:")}
+            else:
+                target = self._key(root_id, dir_path)
+                self._entries = {
+                    k: v for k, v in self._entries.items() if k != target and not k.startswith(f"{target}/")
+                }
+            self._save()
+
+    def invalidate_ids(self, drive_ids: Iterable[str]) -> int:
+        """
+        Drops the cached paths which resolved to any of drive_ids, plus every path underneath them. Fed with the folders
+        reported by the Drive Changes API, this keeps a renamed, moved or replaced folder from resolving to its old ID.
+
+        Returns:
+            the number of entries dropped
+        """
+        drive_ids = set(drive_ids)
+        with self._lock:
+            stale = [k for k, v in self._entries.items() if v["id"] in drive_ids]
+            if not stale:
+                return 0
+            kept = {
+                k: v for k, v in self._entries.items()
+                if not any(k == target or k.startswith(f"{target}/") for target in stale)
+            }
+            dropped = len(self._entries) - len(kept)
+            self._entries = kept
+            self._save()
+        _logger.info(f"Dropped {dropped} cached drive path(s) of folders which changed")
+        return dropped
+
+    def resolve(self, root_id: str, dir_path: pathlib.PurePath, loader: Callable[[], str]) -> str:
+        """
+        Returns the drive ID for dir_path, calling loader() to look it up on a cache miss. If another thread is
+        already looking up the same path, this waits for its result instead of issuing a second request.
+
+        Exceptions raised by loader() are propagated to every waiting caller, and nothing is cached for them.
+        """
+        cached = self.get(root_id, dir_path)
+        if cached:
+            return cached
+
+        key = self._key(root_id, dir_path)
+        with self._lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = concurrent.futures.Future()
+                self._inflight[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            drive_id = loader()
+            self.put(root_id, dir_path, drive_id)
+            future.set_result(drive_id)
+            return drive_id
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
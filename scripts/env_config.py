@@ -1,9 +1,17 @@
 import os
 import logging
+import pathlib
+import datetime
 import tempfile
+import threading
 
+import requests
+import google.auth.credentials
+import google.auth.transport.requests
 from google.oauth2.service_account import Credentials
 
+from rate_limit import rate_limit_session
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -29,6 +37,21 @@ def get_env_or_fail(varname: str) -> str:
         raise ValueError(f"Missing environment variable {varname}; please add to .env")
     return val
 
+def get_cache_dir() -> pathlib.Path:
+    """
+    Get the directory used for caches which persist between sync runs. This lives outside of the repo so that it
+    survives fresh checkouts and never ends up committed.
+
+    Defaults to $XDG_CACHE_HOME/pvls (or ~/.cache/pvls), and can be overridden with PVLS_CACHE_DIR.
+    """
+    cache_dir = os.environ.get("PVLS_CACHE_DIR")
+    if not cache_dir:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        cache_dir = os.path.join(cache_home, "pvls")
+
+    os.makedirs(cache_dir, exist_ok=True)
+    return pathlib.Path(cache_dir)
+
 def get_gdrive_credentials() -> Credentials:
     credential_path = "service_account.json"
     temp_file_path = None
@@ -62,3 +85,84 @@ def get_gdrive_credentials() -> Credentials:
         os.unlink(temp_file_path)
 
     return credentials
+
+class SharedCredentials(google.auth.credentials.Credentials):
+    """
+    Service account credentials shared by everything in a sync run: GDriveSession (and its per-thread, download and
+    batch sessions), AsyncGDriveSession and the gspread client.
+
+    The access token is cached in memory until REFRESH_MARGIN before it expires, and is then refreshed exactly once
+    under a lock; threads that find it expired while a refresh is in flight wait for that refresh rather than starting
+    their own token exchange.
+
+    Token exchanges always go through a rate limited session of their own, so they are recorded in the run's HTTP
+    report as "oauth2.token" whichever transport asked for the refresh.
+    """
+    REFRESH_MARGIN = datetime.timedelta(minutes=5)
+
+    def __init__(self, credentials: Credentials):
+        super().__init__()
+        self._credentials = credentials
+        self._refresh_lock = threading.Lock()
+        self._token_request: google.auth.transport.requests.Request | None = None
+        self.refresh_count = 0
+
+    @property
+    def expired(self) -> bool:
+        if not self.expiry:
+            return False
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return now >= self.expiry - SharedCredentials.REFRESH_MARGIN
+
+    def refresh(self, request) -> None:
+        """
+        Exchanges for a new access token (AuthorizedSession calls this after a 401), unless another thread already
+        replaced the token this one saw while it waited for the lock. request is only there for google.auth's
+        interface; the exchange is sent through the instrumented token session.
+        """
+        stale_token = self.token
+        with self._refresh_lock:
+            # Every thread whose request was rejected with the same token ends up here; only the first one exchanges it,
+            # the others retry with the token it got
+            if self.token == stale_token or not self.valid:
+                self._refresh()
+
+    def ensure_valid(self, request=None) -> None:
+        """Refreshes the access token if there is none yet or it is about to expire, at most once across threads"""
+        if self.valid:
+            return
+        with self._refresh_lock:
+            if not self.valid:
+                self._refresh()
+
+    def _refresh(self) -> None:
+        """Exchanges for a new access token. Must be called with _refresh_lock held."""
+        if self._token_request is None:
+            self._token_request = google.auth.transport.requests.Request(
+                session=rate_limit_session(requests.Session())
+            )
+        self._credentials.refresh(self._token_request)
+        self.token = self._credentials.token
+        self.expiry = self._credentials.expiry
+        self.refresh_count += 1
+        _logger.info(f"Refreshed Google access token (valid until {self.expiry} UTC)")
+
+    def before_request(self, request, method, url, headers) -> None:
+        self.ensure_valid(request)
+        self.apply(headers)
+
+    def auth_header(self) -> dict[str, str]:
+        """Authorization header for a raw HTTP request, refreshing the token first if needed"""
+        self.ensure_valid()
+        return {"Authorization": f"Bearer {self.token}"}
+
+_shared_credentials: SharedCredentials | None = None
+_shared_credentials_lock = threading.Lock()
+
+def get_shared_credentials() -> SharedCredentials:
+    """The process-wide SharedCredentials, loaded with get_gdrive_credentials() on first use"""
+    global _shared_credentials
+    with _shared_credentials_lock:
+        if _shared_credentials is None:
+            _shared_credentials = SharedCredentials(get_gdrive_credentials())
+        return _shared_credentials
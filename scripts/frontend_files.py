@@ -0,0 +1,93 @@
+import os
+import logging
+import tempfile
+import threading
+import concurrent.futures
+
+from typing import Iterable
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+_logger = logging.getLogger(__name__)
+
+class FrontendFiles:
+    """
+    The files the sync generates for the frontend (song JSON files and manifests), each read from disk at most once per
+    run.
+
+    Callers serialize a file once and hand its final bytes to write(), which compares them with what is on disk and only
+    touches the file if they differ, so unchanged files keep their mtime and don't churn the git index. Changed files
+    are replaced atomically, so an interrupted run never leaves a half written file behind.
+    """
+    FILE_MODE = 0o644
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Current content of every file read or written so far (None if it doesn't exist)
+        self._contents: dict[str, bytes | None] = {}
+
+    def preload(self, paths: Iterable[str | os.PathLike], workers: int = 8) -> dict[str, bytes | None]:
+        """
+        Reads the given files in parallel, so later reads of them are answered from memory.
+
+        Returns:
+            the content of each file by path (None if it doesn't exist or can't be read)
+        """
+        paths = [os.fspath(path) for path in paths]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(paths, executor.map(self.read, paths)))
+
+    def read(self, path: str | os.PathLike) -> bytes | None:
+        """Content of the file at path, or None if it doesn't exist or can't be read"""
+        path = os.fspath(path)
+        with self._lock:
+            if path in self._contents:
+                return self._contents[path]
+
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            content = None
+        except OSError as e:
+            _logger.warning(f"Unable to read {path}: {e}")
+            content = None
+
+        with self._lock:
+            return self._contents.setdefault(path, content)
+
+    def write(self, path: str | os.PathLike, content: bytes) -> bool:
+        """
+        Atomically replaces the file at path with content, unless it already holds exactly that.
+
+        Returns:
+            True if the file was written, False if it was already up to date
+        """
+        path = os.fspath(path)
+        if self.read(path) == content:
+            return False
+
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile('wb', dir=directory, suffix='.tmp', delete=False) as f:
+            f.write(content)
+            temp_path = f.name
+        try:
+            os.chmod(temp_path, FrontendFiles.FILE_MODE)
+            os.replace(temp_path, path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+        with self._lock:
+            self._contents[path] = content
+        return True
+
+    def delete(self, path: str | os.PathLike) -> None:
+        """Deletes the file at path"""
+        path = os.fspath(path)
+        os.remove(path)
+        with self._lock:
+            self._contents[path] = None
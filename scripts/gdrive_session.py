@@ -1,17 +1,24 @@
 #!/usr/bin/env python
 
 import os
+import hashlib
 import logging
 import tempfile
 import pathlib
+import queue
 import requests
 import threading
+import concurrent.futures
 
 from google.auth.transport.requests import AuthorizedSession
 import gspread
 
 import env_config
-from typing import Any
+from drive_batch import DriveMetadataBatcher
+from drive_index import DriveIndex
+from drive_path_cache import DrivePathCache
+from rate_limit import rate_limit_session
+from typing import Any, Iterable, Iterator
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,27 +28,79 @@ _logger = logging.getLogger(__name__)
 
 class GDriveSession:
     DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+    DRIVE_CHANGES_URL = "https://www.googleapis.com/drive/v3/changes"
     MIME_TYPE_DRIVE_FOLDER = "application/vnd.google-apps.folder"
+    MIME_TYPE_PDF = "application/pdf"
 
-    def __init__(self):
-        self._credentials = env_config.get_gdrive_credentials()
+    # Number of folders OR'ed together in a single "in parents" query
+    MAX_PARENTS_PER_QUERY = 100
+
+    MAX_CONCURRENT_DOWNLOADS = 8
+    MAX_WALK_WORKERS = 16
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, path_cache: DrivePathCache | None = None, drive_index: DriveIndex | None = None):
+        """
+        Args:
+            path_cache: Cache of folder path -> Drive ID lookups. Defaults to drive_paths.json in the cache dir.
+            drive_index: Local mirror of (part of) the drive. Lookups inside the mirrored tree are answered from it
+                         instead of the Drive API; anything outside of it is still queried live.
+        """
+        self._credentials = env_config.get_shared_credentials()
         self._local = threading.local()
 
         self._drive_root_id = env_config.get_env_or_fail("GOOGLE_DRIVE_ID")
 
+        if path_cache is None:
+            path_cache = DrivePathCache(env_config.get_cache_dir() / "drive_paths.json")
+        self._path_cache = path_cache
+        self._drive_index = drive_index
+        self._metadata_batcher: DriveMetadataBatcher | None = None
+        self._metadata_batcher_lock = threading.Lock()
+
+        self._download_slots = threading.BoundedSemaphore(GDriveSession.MAX_CONCURRENT_DOWNLOADS)
+        self._download_lock = threading.Lock()
+        self._shared_download_session: AuthorizedSession | None = None
+
     @property
     def _drive_session(self) -> AuthorizedSession:
         if not hasattr(self._local, "session"):
-            self._local.session = AuthorizedSession(self._credentials)
+            self._local.session = rate_limit_session(AuthorizedSession(self._credentials))
         return self._local.session
 
-    def find_all_files_in(self, drive_id: str) -> list[dict]:
+    def _list_files(self, query: str, fields: str) -> list[dict]:
+        """Runs a files.list query and returns the files from every page of results."""
+        return [file for page in self._iter_file_pages(query, fields) for file in page]
+
+    def _iter_file_pages(self, query: str, fields: str) -> Iterator[list[dict]]:
+        """Runs a files.list query and yields each page of files as soon as it arrives."""
+        params = {
+            "q": query,
+            "pageSize": 1000,
+            "fields": f"nextPageToken,files({fields})",
+        }
+
+        page_token = None
+        while True:
+            params["pageToken"] = page_token
+
+            response = self._drive_session.get(GDriveSession.DRIVE_FILES_URL, params=params, timeout=30)
+            response.raise_for_status()
+            payload = response.json()
+            yield payload.get("files", [])
+
+            page_token = payload.get("nextPageToken")
+            if not page_token:
+                return
+
+    def find_all_files_in(self, drive_id: str, mime_type: str | None = None) -> list[dict]:
         """
         Searches the folder that drive_id point to and returns a list of GDrive metadata dictionaries (one dict per
         file discovered inside of the folder which points to drive_id)
 
         Args:
             drive_id: Drive ID (hash as supplied from Google Drive APIs or from URL). Must be a folder.
+            mime_type: If specified, only return files of this type
 
         Returns:
             a list of dictionaries, each of which contains the following contents:
@@ -51,29 +110,90 @@ class GDriveSession:
                 "mimeType": <File type>
                 "md5Checksum": <File checksum>
                 "modifiedTime": Last modified time
+                "size": <File size in bytes, as a string>
             }
 
             Or an empty list if the folder is empty.
         """
-        params = {
-            "q": f"'{drive_id}' in parents and trashed=false",
-            "pageSize": 1000,
-            "fields": "nextPageToken,files(id,name,mimeType,md5Checksum,modifiedTime)",
-        }
+        if self._drive_index is not None and self._drive_index.covers(drive_id):
+            return self._drive_index.children(drive_id, mime_type)
+
+        query = f"'{drive_id}' in parents and trashed=false"
+        if mime_type:
+            query += f" and mimeType='{mime_type}'"
+        return self._list_files(query, "id,name,mimeType,md5Checksum,modifiedTime,size")
+
+    def find_all_files_in_many(
+        self, drive_ids: Iterable[str], mime_type: str | None = None, live: bool = False
+    ) -> list[dict]:
+        """
+        Searches every folder in drive_ids and returns the GDrive metadata dictionaries of all files inside of them.
+
+        Folders are queried together (up to MAX_PARENTS_PER_QUERY per query) instead of one at a time, so listing N
+        folders costs roughly N / MAX_PARENTS_PER_QUERY requests plus one request per 1000 files found.
+
+        Args:
+            drive_ids: Drive IDs of the folders to search
+            mime_type: If specified, only return files of this type (filtered server-side)
+            live: Always query the Drive API, even for folders covered by the drive index
+
+        Returns:
+            a list of dictionaries, one per file, with the same contents as find_all_files_in() plus:
+            {
+                "parents": [<GDrive ID of the containing folder>]
+            }
+        """
+        drive_ids = list(dict.fromkeys(drive_ids))
 
         files = []
-        page_token = None
-        while True:
-            params["pageToken"] = page_token
+        if self._drive_index is not None and not live:
+            indexed_ids = {drive_id for drive_id in drive_ids if self._drive_index.covers(drive_id)}
+            files.extend(self._drive_index.children(indexed_ids, mime_type))
+            drive_ids = [drive_id for drive_id in drive_ids if drive_id not in indexed_ids]
+
+        for start in range(0, len(drive_ids), GDriveSession.MAX_PARENTS_PER_QUERY):
+            chunk = drive_ids[start:start + GDriveSession.MAX_PARENTS_PER_QUERY]
+            parents_clause = " or ".join(f"'{drive_id}' in parents" for drive_id in chunk)
+            query = f"({parents_clause}) and trashed=false"
+            if mime_type:
+                query += f" and mimeType='{mime_type}'"
+            files.extend(self._list_files(query, "id,name,mimeType,md5Checksum,modifiedTime,size,parents"))
+        return files
+
+    def newest_modified_time(self, drive_ids: Iterable[str]) -> str | None:
+        """
+        Finds the most recent modifiedTime of any file directly inside of the given folders, always asking the Drive
+        API. Each query covers up to MAX_PARENTS_PER_QUERY folders and asks Drive for only its single newest file, and
+        the queries run in parallel, so this is cheap enough to run before deciding whether a sync has any work to do.
 
+        Args:
+            drive_ids: Drive IDs of the folders to check
+
+        Returns:
+            the newest RFC 3339 modifiedTime found, or None if the folders are all empty
+        """
+        drive_ids = list(dict.fromkeys(drive_ids))
+
+        def newest_in(chunk: list[str]) -> str | None:
+            parents_clause = " or ".join(f"'{drive_id}' in parents" for drive_id in chunk)
+            params = {
+                "q": f"({parents_clause}) and trashed=false",
+                "orderBy": "modifiedTime desc",
+                "pageSize": 1,
+                "fields": "files(modifiedTime)",
+            }
             response = self._drive_session.get(GDriveSession.DRIVE_FILES_URL, params=params, timeout=30)
             response.raise_for_status()
-            payload = response.json()
-            files.extend(payload.get("files", []))
+            files = response.json().get("files", [])
+            return files[0]["modifiedTime"] if files else None
 
-            page_token = payload.get("nextPageToken")
-            if not page_token:
-                return files
+        chunks = [
+            drive_ids[start:start + GDriveSession.MAX_PARENTS_PER_QUERY]
+            for start in range(0, len(drive_ids), GDriveSession.MAX_PARENTS_PER_QUERY)
+        ]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=GDriveSession.MAX_WALK_WORKERS) as executor:
+            modified_times = [modified_time for modified_time in executor.map(newest_in, chunks) if modified_time]
+        return max(modified_times, default=None)
 
     def find_file(self, drive_id: str, name: str, mime_type: str | None = None) -> dict | None:
         """
@@ -92,18 +212,27 @@ class GDriveSession:
                 "name": <Name of file>
                 "md5Checksum": <File checksum>
                 "modifiedTime": Last modified time
+                "size": <File size in bytes, as a string>
             }
 
             Or None if we couldn't find the file.
         """
 
+        if self._drive_index is not None and self._drive_index.covers(drive_id):
+            # Names are escaped for the query language; the index stores them as-is
+            unescaped_name = name.replace("\\'", "'").replace("\\\\", "\\")
+            file_result = self._drive_index.find(drive_id, unescaped_name, mime_type)
+            if len(file_result) > 1:
+                raise ValueError(f"find_file() found more than one '{unescaped_name}' in {drive_id} in the drive index")
+            return file_result[0] if file_result else None
+
         query = f"'{drive_id}' in parents and trashed=false and name='{name}'"
         if mime_type:
             query += f" and mimeType='{mime_type}'"
         params = {
             "q": query,
             "pageSize": 1000,
-            "fields": "nextPageToken,files(id,name,md5Checksum,modifiedTime)",
+            "fields": "nextPageToken,files(id,name,md5Checksum,modifiedTime,size)",
         }
 
         response = self._drive_session.get(GDriveSession.DRIVE_FILES_URL, params=params, timeout=30)
@@ -123,6 +252,9 @@ class GDriveSession:
         Searches for the drive_id which represents the folder which dir_path refers to. The path is absolute, based on
         the root of the drive folder this context works under.
 
+        Each folder along the path is resolved through the path cache, so shared prefixes (e.g. "Lead Sheets") are only
+        looked up once across calls, threads and runs.
+
         Args:
             dir_path: Path (in pathlib.Path format) of directory to search
 
@@ -132,23 +264,107 @@ class GDriveSession:
 
         drive_id = self._drive_root_id
 
-        path_successful = ["."]
-        for part in dir_path.parts:
-            escaped_part = part.replace("\\", "\\\\").replace("'", "\\'")
-            selected_metadata = self.find_file(drive_id, escaped_part, GDriveSession.MIME_TYPE_DRIVE_FOLDER)
+        parts = dir_path.parts
+        for depth, part in enumerate(parts):
+            parent_id = drive_id
+            prefix = pathlib.PurePosixPath(*parts[:depth + 1])
 
-            if not selected_metadata:
-                partial_path = os.path.join(*path_successful)
-                raise ValueError(
-                    f"Drive does not contain '{dir_path}'\n"
-                    f"Successfully walked '{partial_path}', but could not find '{part}' next",
-                )
+            def lookup(parent_id=parent_id, part=part, depth=depth) -> str:
+                escaped_part = part.replace("\\", "\\\\").replace("'", "\\'")
+                selected_metadata = self.find_file(parent_id, escaped_part, GDriveSession.MIME_TYPE_DRIVE_FOLDER)
 
-            path_successful.append(part)
-            drive_id = selected_metadata["id"]
+                if not selected_metadata:
+                    partial_path = os.path.join(".", *parts[:depth])
+                    raise ValueError(
+                        f"Drive does not contain '{dir_path}'\n"
+                        f"Successfully walked '{partial_path}', but could not find '{part}' next",
+                    )
+                return selected_metadata["id"]
+
+            drive_id = self._path_cache.resolve(self._drive_root_id, prefix, lookup)
 
         return drive_id
 
+    def walk(
+        self, root: pathlib.Path = pathlib.Path("."), max_workers: int = MAX_WALK_WORKERS
+    ) -> Iterator[tuple[pathlib.PurePosixPath, dict[str, Any]]]:
+        """
+        Crawls the folder tree below root breadth-first, listing up to max_workers folders at once, and yields every
+        file and folder found as soon as the page of results containing it arrives.
+
+        Memory stays flat however large the tree is: only a bounded number of pages are buffered between the crawling
+        threads and the caller, and the crawl stops as soon as the caller stops iterating.
+
+        Args:
+            root: Path (in pathlib.Path format) of the directory to crawl, based off of the root of the Google Drive
+            max_workers: How many folders are listed concurrently
+
+        Yields:
+            tuples of (path of the file from the root of the drive, GDrive metadata of the file), where the metadata has
+            the same contents as find_all_files_in_many()
+        """
+        pages: queue.Queue = queue.Queue(maxsize=max_workers * 2)
+        stop = threading.Event()
+
+        def emit(item: tuple) -> bool:
+            # Waits for room in the queue, unless the caller has stopped iterating
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def list_folder(folder_id: str, folder_path: pathlib.PurePosixPath) -> None:
+            try:
+                if self._drive_index is not None and self._drive_index.covers(folder_id):
+                    folder_pages = iter([self._drive_index.children(folder_id)])
+                else:
+                    folder_pages = self._iter_file_pages(
+                        f"'{folder_id}' in parents and trashed=false",
+                        "id,name,mimeType,md5Checksum,modifiedTime,size,parents",
+                    )
+                for page in folder_pages:
+                    if not emit(("page", folder_path, page)):
+                        return
+                emit(("done", folder_path, None))
+            except Exception as e:
+                emit(("error", folder_path, e))
+
+        root_path = pathlib.PurePosixPath(root.as_posix())
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="drive-walk")
+        try:
+            executor.submit(list_folder, self.find_drive_id_by_dir(pathlib.Path(root)), root_path)
+            pending = 1
+            while pending:
+                kind, folder_path, payload = pages.get()
+                if kind == "error":
+                    raise payload
+                if kind == "done":
+                    pending -= 1
+                    continue
+
+                for metadata in payload:
+                    file_path = folder_path / metadata["name"]
+                    if metadata.get("mimeType") == GDriveSession.MIME_TYPE_DRIVE_FOLDER:
+                        executor.submit(list_folder, metadata["id"], file_path)
+                        pending += 1
+                    yield file_path, metadata
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def set_drive_index(self, drive_index: DriveIndex | None) -> None:
+        """Starts answering lookups from drive_index (or stops using a local index, if None)"""
+        self._drive_index = drive_index
+
+    def invalidate_path_cache(self, dir_path: pathlib.Path | None = None) -> None:
+        """
+        Forgets cached folder IDs for dir_path (and everything below it), or for the whole drive if dir_path is None.
+        """
+        self._path_cache.invalidate(self._drive_root_id, dir_path)
+
 
     def find_files_in_dir(self, dir_path: pathlib.Path) -> list[dict[str, any]]:
         """
@@ -162,55 +378,235 @@ class GDriveSession:
             specified, or an empty list if no files are within that directory
         """
 
+        try:
+            return self.find_all_files_in(self.find_drive_id_by_dir(dir_path))
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+
+        # A cached folder ID can go stale if the folder was moved or deleted; resolve the path again from scratch
+        _logger.info(f"Cached drive ID for '{dir_path}' is stale, resolving it again")
+        self.invalidate_path_cache(dir_path)
         return self.find_all_files_in(self.find_drive_id_by_dir(dir_path))
 
-    def download_file(file_id: str, output_file_path: str) -> bool:
-        """
-        Download a PDF from Google Drive and save it locally to the output path specified
+    @property
+    def _download_session(self) -> AuthorizedSession:
+        """Session shared by all downloads, with a connection pool sized for MAX_CONCURRENT_DOWNLOADS"""
+        with self._download_lock:
+            if self._shared_download_session is None:
+                self._shared_download_session = rate_limit_session(
+                    AuthorizedSession(self._credentials),
+                    pool_connections=1,
+                    pool_maxsize=GDriveSession.MAX_CONCURRENT_DOWNLOADS,
+                )
+            return self._shared_download_session
 
-        Currently this uses an HTTP GET session, so this only works on publicly-viewable drive folders.
+    def download_file(self, file_id: str, output_file_path: str, expected_md5: str | None = None) -> str | None:
         """
-        try:
-            download_url = f"https://drive.google.com/uc?export=download&id={file_id}"
-            _logger.info(f"Downloading file: {download_url} -> {output_file_path}")
-
-            session = requests.Session()
-            response = session.get(download_url, stream=True)
-            if 'text/html' in response.headers.get('Content-Type', ''):
-                for key, value in response.cookies.items():
-                    if key.startswith('download_warning'):
-                        params = {'id': file_id, 'confirm': value}
-                        response = session.get(download_url, params=params, stream=True)
-                        break
+        Download a file from Google Drive and save it locally to the output path specified.
 
-            response.raise_for_status()
-
-            # Save download to file (create subdirectory if needed)
-            directory = os.path.dirname(output_file_path)
-            if directory:
-                os.makedirs(directory, exist_ok=True)
+        The file is streamed through the Drive API (alt=media) into "<output_file_path>.part", and is only moved into
+        place once it is complete and verified. A partial file left behind by an interrupted download is resumed only if
+        it was a download of the same remote version (see prepare_part_file()). At most MAX_CONCURRENT_DOWNLOADS
+        downloads run at once across all threads.
 
-            with open(output_file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+        Args:
+            file_id: Drive ID of the file to download
+            output_file_path: Local path to save the file to
+            expected_md5: Drive md5Checksum of the file. If given, downloads which don't match it are rejected.
 
-            file_size = os.path.getsize(output_file_path)
-            _logger.info(f"Downloaded file: {output_file_path} ({file_size}B)")
-            return True
+        Returns:
+            The md5 checksum of the downloaded file, or None if the download failed
+        """
+        part_path = f"{output_file_path}.part"
+        directory = os.path.dirname(output_file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._download_slots:
+            try:
+                _logger.info(f"Downloading file: {file_id} -> {output_file_path}")
+                GDriveSession.prepare_part_file(part_path, expected_md5)
+                md5 = self._download_to(file_id, part_path)
+
+                if expected_md5 and md5 != expected_md5:
+                    GDriveSession.discard_part_file(part_path)
+                    _logger.error(f"Download failed ({file_id}): md5 {md5} does not match expected {expected_md5}")
+                    return None
+
+                os.replace(part_path, output_file_path)
+                GDriveSession.discard_part_file(part_path)
+                _logger.info(f"Downloaded file: {output_file_path} ({os.path.getsize(output_file_path)}B)")
+                return md5
+
+            except ValueError as e:
+                # The response wasn't the file at all, so there's nothing worth resuming from
+                GDriveSession.discard_part_file(part_path)
+                _logger.error(f"Download failed ({file_id}): {e}")
+                return None
+
+            except Exception as e:
+                _logger.error(f"Download failed ({file_id}): {e}")
+                return None
+
+    @staticmethod
+    def prepare_part_file(part_path: str, expected_md5: str | None) -> None:
+        """
+        Gets part_path ready for a download of the remote version whose checksum is expected_md5.
 
-        except Exception as e:
-            _logger.error(f"Download failed ({file_id}): {e}")
-            return False
+        A partial file is only safe to resume if the remote file hasn't changed since it was started, so the checksum a
+        download expects is recorded next to it (in "<part_path>.md5"). A partial file is kept only if it was started
+        for the same checksum; without an expected checksum there's no telling which version it holds, so it's
+        dropped and the download starts over.
+        """
+        version_path = f"{part_path}.md5"
+        recorded_md5 = None
+        if os.path.exists(version_path):
+            with open(version_path, "r") as f:
+                recorded_md5 = f.read().strip()
+
+        if os.path.exists(part_path) and (not expected_md5 or recorded_md5 != expected_md5):
+            _logger.info(f"Discarding partial download {part_path}: it may be of another version of the file")
+            os.remove(part_path)
+
+        if not expected_md5:
+            if recorded_md5 is not None:
+                os.remove(version_path)
+        elif recorded_md5 != expected_md5:
+            with open(version_path, "w") as f:
+                f.write(expected_md5)
+
+    @staticmethod
+    def discard_part_file(part_path: str) -> None:
+        """Removes part_path and the checksum recorded for it, if they exist"""
+        for path in (part_path, f"{part_path}.md5"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _download_to(self, file_id: str, part_path: str) -> str:
+        """Streams file_id into part_path (resuming it if it already exists) and returns the md5 of the whole file"""
+        hash_md5 = hashlib.md5()
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+
+        response = self._download_session.get(
+            f"{GDriveSession.DRIVE_FILES_URL}/{file_id}",
+            params={"alt": "media", "supportsAllDrives": "true"},
+            headers=headers,
+            stream=True,
+            timeout=(10, 60),
+        )
+        with response:
+            if response.status_code == 416:
+                # The partial file is no good for resuming (e.g. the remote file shrank), so start over
+                os.remove(part_path)
+                return self._download_to(file_id, part_path)
+            response.raise_for_status()
 
-    def get_file_metadata(self, file_id: str) -> dict[str, Any]:
+            if "text/html" in response.headers.get("Content-Type", ""):
+                raise ValueError("Drive returned an HTML page instead of the file")
+
+            if response.status_code == 206:
+                _logger.info(f"Resuming download of {file_id} from byte {offset}")
+                with open(part_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(GDriveSession.DOWNLOAD_CHUNK_SIZE), b""):
+                        hash_md5.update(chunk)
+                mode = "ab"
+            else:
+                mode = "wb"
+
+            first_chunk = mode == "wb"
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=GDriveSession.DOWNLOAD_CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    if first_chunk:
+                        first_chunk = False
+                        if chunk.lstrip()[:15].lower().startswith((b"<!doctype html", b"<html")):
+                            raise ValueError("Drive returned an HTML page instead of the file")
+                    hash_md5.update(chunk)
+                    f.write(chunk)
+
+        return hash_md5.hexdigest()
+
+    def get_changes_start_page_token(self) -> str:
+        """
+        Returns a Drive changes page token which points at "now". Passing it to list_changes() later on returns every
+        change made in between.
+        """
         response = self._drive_session.get(
-            f"https://www.googleapis.com/drive/v3/files/{file_id}",
-            params={"fields": "id,name,mimeType,md5Checksum,modifiedTime", "supportsAllDrives": "true"},
+            f"{GDriveSession.DRIVE_CHANGES_URL}/startPageToken",
+            params={"supportsAllDrives": "true"},
             timeout=15,
         )
         response.raise_for_status()
-        return response.json()
+        return response.json()["startPageToken"]
+
+    def list_changes(self, page_token: str) -> tuple[list[dict], str]:
+        """
+        Lists every change visible to this session since page_token was issued.
+
+        Args:
+            page_token: Token from get_changes_start_page_token(), or the new token from a previous list_changes() call
+
+        Returns:
+            a tuple of (changes, new_page_token), where each change is a dictionary containing:
+            {
+                "fileId": <GDrive file ID>
+                "removed": True if the file was deleted or access to it was lost
+                "file": <GDrive metadata (id, name, mimeType, parents, md5Checksum, modifiedTime, size, trashed)>
+            }
+            and new_page_token should be saved for the next call.
+
+            Cached paths through any folder which changed (or any file which was removed) are dropped from the path
+            cache, since the folder may have been renamed, moved or replaced.
+        """
+        params = {
+            "pageToken": page_token,
+            "pageSize": 1000,
+            "includeItemsFromAllDrives": "true",
+            "supportsAllDrives": "true",
+            "fields": "nextPageToken,newStartPageToken,"
+                      "changes(fileId,removed,file(id,name,mimeType,parents,md5Checksum,modifiedTime,size,trashed))",
+        }
+
+        changes = []
+        while True:
+            response = self._drive_session.get(GDriveSession.DRIVE_CHANGES_URL, params=params, timeout=30)
+            response.raise_for_status()
+            payload = response.json()
+            changes.extend(payload.get("changes", []))
+
+            if "newStartPageToken" in payload:
+                break
+            params["pageToken"] = payload["nextPageToken"]
+
+        self._path_cache.invalidate_ids(
+            change["fileId"] for change in changes
+            if change.get("removed")
+            or (change.get("file") or {}).get("mimeType") == GDriveSession.MIME_TYPE_DRIVE_FOLDER
+        )
+        return changes, payload["newStartPageToken"]
+
+    def get_file_metadata(self, file_id: str) -> dict[str, Any]:
+        """
+        Fetches the GDrive metadata of a single file (id, name, mimeType, md5Checksum, modifiedTime, size).
+
+        Calls made around the same time (e.g. from a pool of worker threads) are transparently combined into Drive
+        batch requests, so this costs far less than one round trip per file.
+        """
+        if self._drive_index is not None:
+            metadata = self._drive_index.get(file_id)
+            if metadata is not None:
+                return metadata
+
+        with self._metadata_batcher_lock:
+            if self._metadata_batcher is None:
+                self._metadata_batcher = DriveMetadataBatcher(rate_limit_session(AuthorizedSession(self._credentials)))
+        return self._metadata_batcher.load(file_id)
 
 
 def main():
@@ -221,9 +617,14 @@ def main():
         description="Google Drive handle for basic file viewing operations.",
     )
 
+    parser.add_argument("--refresh-cache", action="store_true", help="Forget cached folder IDs before running")
+
     subparsers = parser.add_subparsers(help='subcommand help')
     parser_list = subparsers.add_parser('list', help='list help')
     parser_list.add_argument("list_path", help="List files in a specific subdirectory of the drive")
+    parser_list.add_argument(
+        "-r", "--recursive", action="store_true", help="List everything below the directory, streaming results"
+    )
 
     parser_download = subparsers.add_parser("download", help="download help")
     parser_download.add_argument("download_path", help="Path to file in Google Drive")
@@ -231,7 +632,13 @@ def main():
     args = vars(parser.parse_args())
 
     session = GDriveSession()
-    if args.get("list_path", None):
+    if args["refresh_cache"]:
+        session.invalidate_path_cache()
+
+    if args.get("list_path", None) and args.get("recursive"):
+        for path, metadata in session.walk(pathlib.Path(args["list_path"])):
+            print(f"{path}\t{metadata['id']}\t{metadata['mimeType']}\t{metadata.get('md5Checksum', '')}", flush=True)
+    elif args.get("list_path", None):
         files = session.find_files_in_dir(pathlib.Path(args["list_path"]))
         print(tabulate.tabulate(files))
     elif args.get("download_path", None):
@@ -241,8 +648,11 @@ def main():
         dir_id = session.find_drive_id_by_dir(directory)
         target_meta = session.find_file(dir_id, basename)
 
-        GDriveSession.download_file(target_meta["id"], args["output"])
-        exit(0)
+        if not target_meta:
+            print(f"Could not find '{args['download_path']}'")
+            exit(1)
+
+        exit(0 if session.download_file(target_meta["id"], args["output"], target_meta.get("md5Checksum")) else 1)
 
     else:
         parser.print_help()
@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+import urllib.parse
+from datetime import datetime, timezone
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+_logger = logging.getLogger(__name__)
+
+# Upper bounds (in milliseconds) of the latency histogram buckets; anything slower lands in the overflow bucket
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+def classify_endpoint(method: str, url: str) -> str:
+    """
+    Groups a request into an endpoint class such as "drive.files.list" or "sheets.spreadsheets.get", so calls to the
+    same API method are accounted together regardless of which file or spreadsheet they touch.
+    """
+    parsed = urllib.parse.urlsplit(url)
+    host = parsed.hostname or ""
+    path = parsed.path.rstrip("/")
+    query = urllib.parse.parse_qs(parsed.query)
+
+    if host == "sheets.googleapis.com":
+        if "/values" in path:
+            return "sheets.values"
+        if path.endswith(":batchUpdate"):
+            return "sheets.spreadsheets.batchUpdate"
+        return "sheets.spreadsheets.get"
+
+    if host == "oauth2.googleapis.com" or path.endswith("/token"):
+        return "oauth2.token"
+
+    if host == "www.googleapis.com":
+        if path.startswith("/batch/drive"):
+            return "drive.batch"
+        if path.startswith("/drive/v3/changes"):
+            return "drive.changes.startPageToken" if path.endswith("/startPageToken") else "drive.changes.list"
+        if path.startswith("/drive/v3/files"):
+            if path == "/drive/v3/files":
+                return "drive.files.list"
+            if query.get("alt") == ["media"]:
+                return "drive.files.download"
+            return "drive.files.get"
+
+    return f"{method.lower()} {host}"
+
+class _EndpointStats:
+    def __init__(self):
+        self.calls = 0
+        self.retries = 0
+        self.errors = 0
+        self.status_codes: dict[str, int] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def to_dict(self) -> dict:
+        labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "errors": self.errors,
+            "statusCodes": dict(sorted(self.status_codes.items())),
+            "bytesSent": self.bytes_sent,
+            "bytesReceived": self.bytes_received,
+            "latency": {
+                "totalSeconds": round(self.latency_total, 3),
+                "meanSeconds": round(self.latency_total / self.calls, 3) if self.calls else 0,
+                "maxSeconds": round(self.latency_max, 3),
+                "histogramMs": dict(zip(labels, self.latency_histogram)),
+            },
+        }
+
+class HttpMetrics:
+    """
+    Per-endpoint accounting of every HTTP call a run makes: call count, latency histogram, bytes transferred, retries
+    and status codes. Calls are recorded by the transport adapter (see rate_limit.RateLimitedAdapter), so everything
+    sent through a rate limited session is covered no matter which module made the call.
+
+    Latency is measured up to the response headers; for streamed downloads the body is transferred afterwards and
+    its size is taken from Content-Length.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, _EndpointStats] = {}
+        self._started_at = datetime.now(timezone.utc)
+        self._started = time.monotonic()
+
+    def _stats(self, endpoint: str) -> _EndpointStats:
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = _EndpointStats()
+        return stats
+
+    def record(
+        self,
+        endpoint: str,
+        latency: float,
+        status_code: int | None,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ) -> None:
+        """Records one attempted call. status_code is None if the call failed without a response."""
+        latency_ms = latency * 1000
+        bucket = next(
+            (index for index, bound in enumerate(LATENCY_BUCKETS_MS) if latency_ms <= bound), len(LATENCY_BUCKETS_MS)
+        )
+
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.calls += 1
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            stats.latency_total += latency
+            stats.latency_max = max(stats.latency_max, latency)
+            stats.latency_histogram[bucket] += 1
+            if status_code is None:
+                stats.errors += 1
+            else:
+                stats.status_codes[str(status_code)] = stats.status_codes.get(str(status_code), 0) + 1
+
+    def record_retry(self, endpoint: str) -> None:
+        with self._lock:
+            self._stats(endpoint).retries += 1
+
+    def report(self) -> dict:
+        with self._lock:
+            endpoints = {name: stats.to_dict() for name, stats in sorted(self._endpoints.items())}
+
+        return {
+            "version": 1,
+            "startedAt": self._started_at.isoformat(),
+            "wallSeconds": round(time.monotonic() - self._started, 3),
+            "totals": {
+                "calls": sum(endpoint["calls"] for endpoint in endpoints.values()),
+                "retries": sum(endpoint["retries"] for endpoint in endpoints.values()),
+                "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+                "bytesSent": sum(endpoint["bytesSent"] for endpoint in endpoints.values()),
+                "bytesReceived": sum(endpoint["bytesReceived"] for endpoint in endpoints.values()),
+                "latencySeconds": round(sum(e["latency"]["totalSeconds"] for e in endpoints.values()), 3),
+            },
+            "endpoints": endpoints,
+        }
+
+    def write_report(self, path: str | os.PathLike) -> dict:
+        """Atomically writes report() as JSON to path, logs a one-line summary per endpoint and returns the report"""
+        report = self.report()
+
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+                f.write("\n")
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        for name, endpoint in report["endpoints"].items():
+            _logger.info(
+                f"HTTP {name}: {endpoint['calls']} calls, {endpoint['retries']} retries, "
+                f"{endpoint['latency']['totalSeconds']}s, {endpoint['bytesReceived']}B received"
+            )
+        _logger.info(f"HTTP report written to {path}")
+        return report
+
+_http_metrics = HttpMetrics()
+
+def get_http_metrics() -> HttpMetrics:
+    """Returns the process-wide HttpMetrics"""
+    return _http_metrics
@@ -0,0 +1,144 @@
+import queue
+import logging
+import threading
+
+from typing import Any, Callable, Iterable, NamedTuple
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+_logger = logging.getLogger(__name__)
+
+class StageFailure(NamedTuple):
+    """An item a stage function raised on"""
+    stage: str
+    item: Any
+    error: Exception
+
+class Pipeline:
+    """
+    A chain of stages connected by bounded queues, each stage served by its own pool of worker threads. Items flow
+    through as soon as the previous stage is done with them, so network, disk and CPU bound stages overlap, and the
+    bounded queues keep a fast stage from running arbitrarily far ahead of a slow one.
+
+    Usage:
+
+        pipeline = Pipeline("songs")
+        pipeline.stage("resolve", resolve, workers=16).stage("write", write)
+        results = pipeline.start(rows).join()
+
+    A stage function takes one item and returns the item to hand to the next stage, or None to drop it. Whatever the
+    last stage returns is collected and returned by join(). An exception raised by a stage function drops that item
+    only: it is logged and recorded in failures, so callers can tell a dropped item from a filtered one. An exception
+    raised while producing the items is re-raised by join(), since the results would be missing an unknown number of
+    them.
+    """
+    DEFAULT_QUEUE_SIZE = 64
+
+    class _Done:
+        pass
+
+    def __init__(self, name: str):
+        self._name = name
+        self._stages: list[tuple[str, Callable[[Any], Any], int, int]] = []
+        self._threads: list[threading.Thread] = []
+        self._results: list[Any] = []
+        self._failures: list[StageFailure] = []
+        self._feed_error: Exception | None = None
+        self._lock = threading.Lock()
+
+    def stage(
+        self, name: str, fn: Callable[[Any], Any], workers: int = 1, queue_size: int = DEFAULT_QUEUE_SIZE
+    ) -> "Pipeline":
+        """
+        Appends a stage to the pipeline.
+
+        Args:
+            name: Name of the stage, used for its thread names and in logs
+            fn: Function applied to every item
+            workers: Number of threads running fn
+            queue_size: How many items may wait for this stage before the previous one blocks
+        """
+        if self._threads:
+            raise RuntimeError(f"Pipeline {self._name} is already running")
+        self._stages.append((name, fn, workers, queue_size))
+        return self
+
+    def start(self, items: Iterable[Any]) -> "Pipeline":
+        """Starts feeding items into the first stage, in the background"""
+        if not self._stages:
+            raise RuntimeError(f"Pipeline {self._name} has no stages")
+
+        queues = [queue.Queue(maxsize=queue_size) for _, _, _, queue_size in self._stages]
+        remaining_workers = [workers for _, _, workers, _ in self._stages]
+
+        def feed() -> None:
+            try:
+                for item in items:
+                    queues[0].put(item)
+            except Exception as e:
+                _logger.exception(f"Pipeline {self._name}: failed to produce items")
+                self._feed_error = e
+            finally:
+                for _ in range(self._stages[0][2]):
+                    queues[0].put(Pipeline._Done)
+
+        def work(index: int) -> None:
+            name, fn, _, _ = self._stages[index]
+            is_last = index == len(self._stages) - 1
+            while True:
+                item = queues[index].get()
+                if item is Pipeline._Done:
+                    break
+                try:
+                    result = fn(item)
+                except Exception as e:
+                    _logger.exception(f"Pipeline {self._name}: stage {name} failed")
+                    with self._lock:
+                        self._failures.append(StageFailure(name, item, e))
+                    continue
+                if result is None:
+                    continue
+                if is_last:
+                    with self._lock:
+                        self._results.append(result)
+                else:
+                    queues[index + 1].put(result)
+
+            # The last worker of a stage to finish tells every worker of the next stage that nothing else is coming
+            with self._lock:
+                remaining_workers[index] -= 1
+                stage_done = remaining_workers[index] == 0
+            if stage_done and not is_last:
+                for _ in range(self._stages[index + 1][2]):
+                    queues[index + 1].put(Pipeline._Done)
+
+        self._threads.append(threading.Thread(target=feed, name=f"{self._name}-feed", daemon=True))
+        for index, (name, _, workers, _) in enumerate(self._stages):
+            for worker in range(workers):
+                self._threads.append(
+                    threading.Thread(target=work, args=(index,), name=f"{self._name}-{name}-{worker}", daemon=True)
+                )
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def join(self) -> list[Any]:
+        """
+        Waits for every item to make it through the pipeline and returns what the last stage returned.
+
+        Raises:
+            the exception raised while producing the items, if any (once every item produced before it is through)
+        """
+        for thread in self._threads:
+            thread.join()
+        if self._feed_error is not None:
+            raise self._feed_error
+        return self._results
+
+    @property
+    def failures(self) -> list[StageFailure]:
+        """The items stage functions raised on so far, in no particular order"""
+        with self._lock:
+            return list(self._failures)
@@ -0,0 +1,267 @@
+import os
+import time
+import random
+import logging
+import threading
+
+import requests
+import requests.adapters
+
+from http_metrics import classify_endpoint, get_http_metrics
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+_logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Classic token bucket: refills at `rate` tokens per second, holding at most `capacity` tokens"""
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost: float = 1) -> None:
+        """Blocks until `cost` tokens are available, then takes them"""
+        cost = min(cost, self._capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return
+                wait = (cost - self._tokens) / self._rate
+            time.sleep(wait)
+
+class AdaptiveConcurrency:
+    """
+    Limits the number of requests in flight, adjusting the limit with AIMD: the limit grows additively while requests
+    succeed at a healthy latency, and is cut multiplicatively when requests are throttled or latency climbs well above
+    the best observed baseline.
+    """
+    LATENCY_TOLERANCE = 2.0
+    THROTTLE_DECREASE = 0.5
+    LATENCY_DECREASE = 0.9
+
+    def __init__(self, initial: int = 8, minimum: int = 1, maximum: int = 64):
+        self._limit = float(initial)
+        self._minimum = minimum
+        self._maximum = maximum
+        self._inflight = 0
+        self._baseline_latency: float | None = None
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        with self._condition:
+            self._condition.wait_for(lambda: self._inflight < int(self._limit))
+            self._inflight += 1
+
+    def release(self, latency: float | None = None, throttled: bool = False) -> None:
+        """
+        Args:
+            latency: How long the request took, or None if it failed without a meaningful latency
+            throttled: True if the request was rejected for exceeding a rate limit
+        """
+        with self._condition:
+            self._inflight -= 1
+
+            if throttled:
+                self._limit = max(self._minimum, self._limit * AdaptiveConcurrency.THROTTLE_DECREASE)
+            elif latency is not None:
+                if self._baseline_latency is None or latency < self._baseline_latency:
+                    self._baseline_latency = latency
+                else:
+                    # Let the baseline drift up slowly so one unusually fast response doesn't pin it forever
+                    self._baseline_latency *= 1.01
+
+                if latency > self._baseline_latency * AdaptiveConcurrency.LATENCY_TOLERANCE:
+                    self._limit = max(self._minimum, self._limit * AdaptiveConcurrency.LATENCY_DECREASE)
+                else:
+                    self._limit = min(self._maximum, self._limit + 1 / self._limit)
+
+            self._condition.notify_all()
+
+    def record_throttle(self) -> None:
+        """Cuts the limit for a throttled request which didn't hold a slot (e.g. one item of a batch request)"""
+        with self._condition:
+            self._limit = max(self._minimum, self._limit * AdaptiveConcurrency.THROTTLE_DECREASE)
+
+class RateLimiter:
+    """
+    Shared limiter for every Google API call the sync makes. Each API gets a token bucket sized to its per-user quota
+    and an adaptive concurrency limit; throttled or failed calls are retried with jittered exponential backoff.
+    """
+    # Default per-user quotas, in queries per minute. Override with PVLS_<API>_QPM if the project's quota is raised.
+    DEFAULT_QUOTAS_PER_MINUTE = {
+        "drive": 12000,
+        "sheets": 60,
+    }
+
+    MAX_RETRIES = 6
+    BACKOFF_BASE_SECONDS = 1.0
+    BACKOFF_MAX_SECONDS = 64.0
+
+    # Upper bound for worker pools: the adaptive limits decide how many of those workers actually have requests in flight
+    MAX_WORKERS = 32
+
+    RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+    RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded", "RATE_LIMIT_EXCEEDED")
+
+    def __init__(self):
+        self._buckets: dict[str, TokenBucket] = {}
+        self._concurrency: dict[str, AdaptiveConcurrency] = {}
+        for api, default_qpm in RateLimiter.DEFAULT_QUOTAS_PER_MINUTE.items():
+            qpm = float(os.environ.get(f"PVLS_{api.upper()}_QPM", default_qpm))
+            self._buckets[api] = TokenBucket(rate=qpm / 60, capacity=max(qpm / 60, min(qpm, 200)))
+            self._concurrency[api] = AdaptiveConcurrency()
+
+    @staticmethod
+    def classify(url: str) -> str | None:
+        """Returns which quota a request URL counts against, or None if it isn't rate limited"""
+        if "sheets.googleapis.com" in url:
+            return "sheets"
+        if "googleapis.com/drive/" in url or "googleapis.com/batch/drive/" in url or "googleapis.com/upload/drive/" in url:
+            return "drive"
+        return None
+
+    @staticmethod
+    def is_throttled(response: requests.Response) -> bool:
+        if response.status_code == 429:
+            return True
+        if response.status_code == 403:
+            try:
+                body = response.text
+            except Exception:
+                return False
+            return any(reason in body for reason in RateLimiter.RATE_LIMIT_REASONS)
+        return False
+
+    @staticmethod
+    def is_retryable(response: requests.Response) -> bool:
+        return response.status_code in RateLimiter.RETRYABLE_STATUS_CODES or RateLimiter.is_throttled(response)
+
+    @staticmethod
+    def backoff_delay(attempt: int, retry_after: str | None = None) -> float:
+        """Full-jitter exponential backoff, honoring a Retry-After header (in seconds) when the server sends one"""
+        if retry_after and retry_after.isdigit():
+            return float(retry_after) + random.uniform(0, 1)
+        return random.uniform(0, min(RateLimiter.BACKOFF_MAX_SECONDS, RateLimiter.BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    def concurrency_limit(self, api: str) -> int:
+        return self._concurrency[api].limit
+
+    def acquire(self, api: str, cost: float = 1) -> None:
+        self._buckets[api].acquire(cost)
+        self._concurrency[api].acquire()
+
+    def release(self, api: str, latency: float | None = None, throttled: bool = False) -> None:
+        self._concurrency[api].release(latency, throttled)
+
+    def record_throttle(self, api: str) -> None:
+        """Report a throttled request which wasn't made through acquire() (e.g. one item of a batch request)"""
+        self._concurrency[api].record_throttle()
+
+class RateLimitedAdapter(requests.adapters.HTTPAdapter):
+    """
+    Transport adapter which routes every request through a RateLimiter, retrying throttled and transiently failed
+    requests, and records every attempt in the run's HttpMetrics. Mount it on a requests.Session (or
+    AuthorizedSession) to rate limit and account for everything the session sends.
+    """
+
+    def __init__(self, limiter: "RateLimiter | None" = None, **kwargs):
+        super().__init__(**kwargs)
+        self._limiter = limiter or get_rate_limiter()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        api = RateLimiter.classify(request.url)
+        endpoint = classify_endpoint(request.method, request.url)
+        if api is None:
+            return self._send_once(request, endpoint, **kwargs)
+
+        # Every request inside a batch request counts against the quota on its own
+        cost = 1
+        if isinstance(request.body, bytes) and "/batch/" in request.url:
+            cost = max(1, request.body.count(b"Content-Type: application/http"))
+
+        for attempt in range(RateLimiter.MAX_RETRIES + 1):
+            if attempt:
+                get_http_metrics().record_retry(endpoint)
+
+            self._limiter.acquire(api, cost)
+            started = time.monotonic()
+            response, latency, throttled = None, None, False
+            try:
+                response = self._send_once(request, endpoint, **kwargs)
+                latency = time.monotonic() - started
+                throttled = RateLimiter.is_throttled(response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == RateLimiter.MAX_RETRIES:
+                    raise
+                delay = RateLimiter.backoff_delay(attempt)
+                _logger.warning(f"{api} request failed ({e}), retrying in {delay:.1f}s")
+            finally:
+                # Whatever happened to the attempt (including errors which aren't retried), its slot is given back
+                self._limiter.release(api, latency, throttled)
+
+            if response is None:
+                time.sleep(delay)
+                continue
+            if not RateLimiter.is_retryable(response) or attempt == RateLimiter.MAX_RETRIES:
+                return response
+
+            delay = RateLimiter.backoff_delay(attempt, response.headers.get("Retry-After"))
+            _logger.warning(f"{api} request returned {response.status_code}, retrying in {delay:.1f}s")
+            response.close()
+            time.sleep(delay)
+
+    def _send_once(self, request: requests.PreparedRequest, endpoint: str, **kwargs) -> requests.Response:
+        """Sends a single attempt of request, recording it in the run's HTTP metrics"""
+        body = request.body
+        bytes_sent = len(body) if isinstance(body, (bytes, str)) else 0
+
+        started = time.monotonic()
+        try:
+            response = super().send(request, **kwargs)
+        except Exception:
+            get_http_metrics().record(endpoint, time.monotonic() - started, None, bytes_sent)
+            raise
+        latency = time.monotonic() - started
+
+        content_length = response.headers.get("Content-Length")
+        if content_length and content_length.isdigit():
+            bytes_received = int(content_length)
+        elif not kwargs.get("stream"):
+            # The session reads the whole body right after this anyway
+            bytes_received = len(response.content)
+        else:
+            bytes_received = 0
+
+        get_http_metrics().record(endpoint, latency, response.status_code, bytes_sent, bytes_received)
+        return response
+
+_rate_limiter: RateLimiter | None = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """Returns the process-wide RateLimiter, so every session shares the same quotas"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
+
+def rate_limit_session(session: requests.Session, **adapter_kwargs) -> requests.Session:
+    """Mounts a RateLimitedAdapter on session for all HTTPS traffic and returns the session"""
+    session.mount("https://", RateLimitedAdapter(**adapter_kwargs))
+    return session
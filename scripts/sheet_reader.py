@@ -0,0 +1,126 @@
+import logging
+import requests
+
+from gspread.utils import numericise_all
+from catalog_song import SheetRow
+from typing import Any, Iterable
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+_logger = logging.getLogger(__name__)
+
+class SheetReader:
+    """
+    Reads whole worksheets of a spreadsheet (cell values plus smart chip links) with a single spreadsheets.get call.
+
+    Every worksheet the sync needs is requested as one range of the same call, and the field mask trims the grid data
+    down to each cell's formatted value and chip URIs, so the sheet is read in one round trip instead of a values call
+    and a grid data call per worksheet.
+    """
+    SHEETS_URL = "https://sheets.googleapis.com/v4/spreadsheets"
+
+    # Columns read from every worksheet
+    COLUMNS = "A:Z"
+    GRID_FIELDS = (
+        "sheets(properties(title),"
+        "data(rowData(values(formattedValue,chipRuns(chip(richLinkProperties(uri)))))))"
+    )
+
+    def __init__(self, http: requests.Session, spreadsheet_id: str):
+        """
+        Args:
+            http: Session authorized for the Sheets API
+            spreadsheet_id: ID of the spreadsheet to read
+        """
+        self._http = http
+        self.spreadsheet_id = spreadsheet_id
+
+    def worksheet_titles(self) -> list[str]:
+        """Titles of the spreadsheet's worksheets, in tab order"""
+        response = self._http.get(
+            f"{SheetReader.SHEETS_URL}/{self.spreadsheet_id}", params={"fields": "sheets(properties(title))"}, timeout=30
+        )
+        response.raise_for_status()
+        return [sheet["properties"]["title"] for sheet in response.json().get("sheets", [])]
+
+    def read(self, titles: Iterable[str], optional: Iterable[str] = ()) -> dict[str, list[SheetRow]]:
+        """
+        Reads the given worksheets.
+
+        Args:
+            titles: Titles of the worksheets to read
+            optional: Titles of further worksheets to read if the spreadsheet has them
+
+        Returns:
+            a dictionary mapping each worksheet title to its rows, like gspread's get_all_records(): the first row is
+            the header, every other row becomes a SheetRow whose values are keyed by header (numbers numericised, blank
+            cells as "") and whose hyperlinks map each header to the URI of the smart chip in that cell, if any.
+            Missing optional worksheets are left out.
+        """
+        titles = list(dict.fromkeys(titles))
+        optional = [title for title in dict.fromkeys(optional) if title not in titles]
+
+        try:
+            payload = self._get_grid(titles + optional)
+        except requests.HTTPError as e:
+            # Sheets rejects the whole call with a 400 when any range names a worksheet that doesn't exist
+            if not optional or e.response is None or e.response.status_code != 400:
+                raise
+            _logger.info(f"Worksheet(s) {optional} not found, reading {titles} only")
+            payload = self._get_grid(titles)
+
+        worksheets = {}
+        for sheet in payload.get("sheets", []):
+            title = sheet["properties"]["title"]
+            grid = sheet.get("data", [{}])[0]
+            worksheets[title] = SheetReader._to_rows(grid.get("rowData", []))
+            _logger.info(f"Read {len(worksheets[title])} rows from '{title}'")
+        return worksheets
+
+    def _get_grid(self, titles: list[str]) -> dict:
+        params = {
+            "includeGridData": "true",
+            "ranges": [f"'{SheetReader._quote_title(title)}'!{SheetReader.COLUMNS}" for title in titles],
+            "fields": SheetReader.GRID_FIELDS,
+        }
+        response = self._http.get(f"{SheetReader.SHEETS_URL}/{self.spreadsheet_id}", params=params, timeout=60)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _quote_title(title: str) -> str:
+        # Single quotes in a worksheet title are escaped by doubling them inside an A1 range
+        return title.replace("'", "''")
+
+    @staticmethod
+    def _chip_uri(cell: dict[str, Any]) -> str | None:
+        uri = None
+        for chip_run in cell.get("chipRuns", []):
+            uri = chip_run.get("chip", {}).get("richLinkProperties", {}).get("uri") or uri
+        return uri
+
+    @staticmethod
+    def _to_rows(row_data: list[dict]) -> list[SheetRow]:
+        if not row_data:
+            return []
+
+        headers = [cell.get("formattedValue", "") for cell in row_data[0].get("values", [])]
+        # Like get_all_records(), trailing blank rows are dropped but blank rows in between are kept
+        while len(row_data) > 1 and not any("formattedValue" in cell for cell in row_data[-1].get("values", [])):
+            row_data = row_data[:-1]
+
+        rows = []
+        for row_index, row in enumerate(row_data[1:], start=2):
+            cells = row.get("values", [])[:len(headers)]
+            cells += [{}] * (len(headers) - len(cells))
+
+            values = numericise_all([cell.get("formattedValue", "") for cell in cells], default_blank="")
+            hyperlinks = {}
+            for header, cell in zip(headers, cells):
+                uri = SheetReader._chip_uri(cell)
+                if header and uri:
+                    hyperlinks[header] = uri
+            rows.append(SheetRow(row_index, dict(zip(headers, values)), hyperlinks=hyperlinks))
+        return rows
@@ -1,19 +1,31 @@
 #!/usr/bin/env python3
-import concurrent.futures
 import os
 import sys
-import gspread
 import json
 import logging
 import argparse
 import threading
-from oauth2client.service_account import ServiceAccountCredentials
+import concurrent.futures
+from google.auth.transport.requests import AuthorizedSession
 from datetime import datetime
 import re
 import hashlib
-from typing import Dict, List, Any, Optional
-
+import pathlib
+from typing import Dict, List, Any, Iterator, Optional, Set
+
+import env_config
+from blob_store import BlobStore
+from catalog_index import CatalogIndex, FacetIndex, SearchIndex
+from catalog_song import CatalogSong, SheetRow
+from checksum_index import ChecksumIndex
+from drive_changes import map_changes_to_songs
+from drive_index import DriveIndex
+from frontend_files import FrontendFiles
 from gdrive_session import GDriveSession
+from http_metrics import get_http_metrics
+from pipeline import Pipeline
+from rate_limit import RateLimiter, rate_limit_session
+from sheet_reader import SheetReader
 from song_data_access import SongDataAccess, SongRecord
 
 # Setup logging
@@ -32,28 +44,79 @@ except ImportError:
     logger.info("ℹ️ python-dotenv not installed, using environment variables only")
 
 class SongSyncManager:
-    def __init__(self, force_sync: bool = False):
-        self.sheet = None
+    TV_SIZE_WORKSHEET = 'TV Size Sheets'
+    # Normalizing is CPU bound, so more threads than this only contend for the GIL
+    NORMALIZE_WORKERS = 4
+    # Writing the frontend files is quick local disk I/O, a few threads are enough to overlap it
+    WRITE_WORKERS = 8
+
+    def __init__(
+        self, force_sync: bool = False, incremental: bool = True, use_drive_index: bool = True, rehash: bool = False
+    ):
+        self.spreadsheet_id: Optional[str] = None
+        self.sheet_reader: Optional[SheetReader] = None
+        self.worksheet_title: Optional[str] = None
+        self.worksheet_rows: Dict[str, List[SheetRow]] = {}
         self.sync_state_file = '.sync_state.json'
         self.force_sync = force_sync
+        self.incremental = incremental
         self.downloads_performed = False  # Tracks if any PDF was re-downloaded in a run
+        # Single run timestamp used when a song is new or changed
+        self.synced_at_now = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
-        # FIXME: Until we move away from the setup_google_sheets() function, we'll end up authenticating twice.
-        #        This is fine for now, but is worth a cleanup once architecture becomes more defined
+        self.credentials = env_config.get_shared_credentials()
         self.session = GDriveSession()
+        self.use_drive_index = use_drive_index
         self.song_data_access = SongDataAccess(self.session)
 
+        # Raw Sheets/Drive API calls go through the shared rate limiter and credentials, just like GDriveSession's
+        self.http = rate_limit_session(AuthorizedSession(self.credentials))
+
         # Set /data as JSON file output directory
         self.frontend_data_dir = os.environ.get('FRONTEND_DATA_DIR', 'frontend/src/data')
         # Path for the committed generated manifest that persists across CI runs
         self.generated_manifest_path = os.path.join(self.frontend_data_dir, 'generated-manifest.json')
+        # Paged summary of the catalog for the song list, next to the per-song files
+        self.catalog_index_dir = os.path.join(self.frontend_data_dir, 'catalog')
+        # Every generated file is read at most once and only written when its bytes change
+        self.frontend_files = FrontendFiles()
+        self._existing_catalog: Optional[Dict[str, Dict[str, Any]]] = None
+        self._existing_catalog_lock = threading.Lock()
         
         # PDF storage directory
         self.pdf_dir = os.path.join('frontend', 'public', 'pdfs')
         os.makedirs(self.pdf_dir, exist_ok=True)
 
-        # Hyperlinks cache
-        self.hyperlinks_data: Dict[int, Dict[str, str]] = {}
+        # Every PDF we've downloaded, keyed by md5, so known charts are never downloaded twice
+        self.blob_store = BlobStore(env_config.get_cache_dir() / 'pdf-blobs')
+        # md5 of every local PDF as of its last (size, mtime, inode), so unchanged PDFs aren't re-read to hash them
+        self.rehash = rehash
+        self.checksum_index = ChecksumIndex(env_config.get_cache_dir() / 'pdf_checksums.json', rebuild=rehash)
+        self._local_pdfs_by_md5: Optional[Dict[str, str]] = None
+        self._local_pdfs_lock = threading.Lock()
+
+        # Drive change tracking, persisted in the sync state so incremental runs can map changes back to songs
+        self.changes_page_token: Optional[str] = None
+        # Drive changes since the last run's changes token, listed by the preflight (None if they couldn't be listed)
+        self.drive_changes: Optional[List[Dict[str, Any]]] = None
+        self.sheet_modified_time: Optional[str] = None
+        self.drive_modified_time: Optional[str] = None
+        self.drive_file_index: Dict[str, Dict[str, Any]] = {}
+        self.drive_folder_index: Dict[str, str] = {}
+        self.song_basenames: Dict[str, str] = {}
+        # Content hash of each song's sheet rows, {'songs': {slug: hash}, 'tvSize': {slug: hash}}, so incremental runs
+        # only reprocess the rows that were edited
+        self.row_hashes: Dict[str, Dict[str, str]] = {}
+
+        # Songs carried over unchanged from their existing JSON during an incremental sync, or because processing them
+        # failed
+        self.reused_songs: Dict[str, CatalogSong] = {}
+        # Titles of the songs whose processing failed this run (see process_songs())
+        self.failed_songs: Set[str] = set()
+        # JSON file content of the songs finished by process_songs(), by title, written by update_frontend_files()
+        self.staged_song_files: Dict[str, bytes] = {}
+        # Digest of every song's content by filename, the leaves of the catalog's content hash
+        self.song_digests: Dict[str, str] = {}
         
     def slugify(self, text: str) -> str:
         """Convert text to a URL-friendly slug"""
@@ -65,84 +128,47 @@ class SongSyncManager:
     def setup_google_sheets(self) -> None:
         """Set up Google Sheets API connection with better error handling and .env support"""
         try:
-            scope = [
-                'https://spreadsheets.google.com/feeds',
-                'https://www.googleapis.com/auth/drive'
-            ]
-            
-            # Try different methods to get service account credentials
-            creds = None
-            
-            # Method 1: From JSON file path (for .env usage)
-            json_file_path = os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON_FILE')
-            if json_file_path and os.path.exists(json_file_path):
-                logger.info(f"Loading service account from file: {json_file_path}")
-                creds = ServiceAccountCredentials.from_json_keyfile_name(json_file_path, scope)
-            
-            # Method 2: From JSON content (for GitHub Actions)
-            elif os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON'):
-                logger.info("Loading service account from JSON content")
-                import tempfile
-                json_content = os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON')
-                
-                # Write to temporary file
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
-                    temp_file.write(json_content)
-                    temp_file_path = temp_file.name
-                
-                creds = ServiceAccountCredentials.from_json_keyfile_name(temp_file_path, scope)
-                os.unlink(temp_file_path)  # Clean up temp file
-            
-            # Method 3: Fallback to default service_account.json
-            elif os.path.exists('service_account.json'):
-                logger.info("Loading service account from default service_account.json")
-                creds = ServiceAccountCredentials.from_json_keyfile_name('service_account.json', scope)
-            
-            else:
-                raise ValueError(
-                    "No service account credentials found. Please set:\n"
-                    "- GOOGLE_SERVICE_ACCOUNT_JSON_FILE (path to JSON file), or\n"
-                    "- GOOGLE_SERVICE_ACCOUNT_JSON (JSON content), or\n"
-                    "- Place service_account.json in the current directory"
-                )
-            
-            client = gspread.authorize(creds)
-            
             sheet_id = os.environ.get('GOOGLE_SHEET_ID')
             if not sheet_id:
                 raise ValueError("GOOGLE_SHEET_ID environment variable not set")
-            
-            # Try to open the sheet and get specific worksheet
-            workbook = client.open_by_key(sheet_id)
-            
+
+            # Save spreadsheet id for later use
+            self.spreadsheet_id = sheet_id
+            self.sheet_reader = SheetReader(self.http, sheet_id)
+
             # Get worksheet by name or index
             worksheet_name = os.environ.get('GOOGLE_SHEET_WORKSHEET_NAME')
             worksheet_index = os.environ.get('GOOGLE_SHEET_WORKSHEET_INDEX')
-            
+
             if worksheet_name:
                 logger.info(f"Using worksheet by name: '{worksheet_name}'")
-                self.sheet = workbook.worksheet(worksheet_name)
+                self.worksheet_title = worksheet_name
             elif worksheet_index:
                 # Convert to 0-based index (user provides 1-based)
                 index = int(worksheet_index) - 1
-                logger.info(f"Using worksheet by index: {index + 1} ('{workbook.worksheets()[index].title}')")
-                self.sheet = workbook.worksheets()[index]
+                self.worksheet_title = self.sheet_reader.worksheet_titles()[index]
+                logger.info(f"Using worksheet by index: {index + 1} ('{self.worksheet_title}')")
             else:
                 logger.info("Using first worksheet (default)")
-                self.sheet = workbook.sheet1  # Use first worksheet
-            
-            logger.info(f"Successfully connected to Google Sheet: {sheet_id}")
-            logger.info(f"Active worksheet: '{self.sheet.title}'")
+                self.worksheet_title = self.sheet_reader.worksheet_titles()[0]
 
-            # Save spreadsheet id for later use
-            self.spreadsheet_id = sheet_id
-            self.hyperlinks_data = self._extract_hyperlinks_simple()
+            # Both worksheets, values and smart chip links, in a single call
+            self.worksheet_rows = self.sheet_reader.read(
+                [self.worksheet_title], optional=[SongSyncManager.TV_SIZE_WORKSHEET]
+            )
+            if self.worksheet_title not in self.worksheet_rows:
+                raise ValueError(f"Worksheet '{self.worksheet_title}' not found")
+
+            logger.info(f"Successfully connected to Google Sheet: {sheet_id}")
+            logger.info(f"Active worksheet: '{self.worksheet_title}'")
             
         except Exception as e:
             logger.error(f"Failed to setup Google Sheets connection: {e}")
             raise
 
-    def _sync_record_fetch_metadata(self, row_idx: int, sync_record: dict[str, Any]) -> dict[str, Any]:
+    def _sync_record_fetch_metadata(
+        self, row_idx: int, sync_record: SheetRow, song_records: Optional[Dict[tuple, SongRecord]] = None
+    ) -> Optional[SheetRow]:
         # Check if at least one PDF is provided (check both hyperlinks and text)
         pdf_columns = SongDataAccess.TRANSCRIPTIONS
         has_pdf = False
@@ -152,18 +178,24 @@ class SongSyncManager:
         song_producer = sync_record.get("Producer", "").strip()
 
         # Attempt to autodetect PDFs from presence in the drive
-        # NOTE: If the song name is not an EXACT MATCH to what is in the drive, we're going to miss the chart
+        # NOTE: Names are matched after normalization (case, whitespace, Unicode form); anything else is still a miss
         try:
-            song_record = self.song_data_access.get_record_by_attrs(song_name, song_producer)
+            if song_records is None:
+                song_record = self.song_data_access.get_record_by_attrs(song_name, song_producer)
+            elif (song_name, song_producer) in song_records:
+                song_record = song_records[(song_name, song_producer)]
+            else:
+                raise ValueError(f"Drive does not contain a chart folder for '{song_producer} - {song_name}'")
             has_pdf = song_record.has_any_full()
         except ValueError as e:
             logger.warning(f"Could not autodetect PDFs for {song_name}, resolve via manual hyperlink...")
 
+        if song_record and song_record.folder_id:
+            self.drive_folder_index[song_record.folder_id] = self.slugify(song_name)
+
         if not has_pdf:
             # Check hyperlinks first
-            if row_idx in self.hyperlinks_data:
-                hyperlinks_for_row = self.hyperlinks_data[row_idx]
-                has_pdf = any(col in hyperlinks_for_row for col in pdf_columns)
+            has_pdf = any(col in sync_record.hyperlinks for col in pdf_columns)
 
         # Fallback to text validation if no hyperlinks found
         if not has_pdf:
@@ -173,55 +205,49 @@ class SongSyncManager:
             logger.warning(f"No valid PDF files found for '{song_name}'")
             return None
 
-        # Add hyperlink data if available
-        if row_idx in self.hyperlinks_data:
-            hyperlinks_for_row = self.hyperlinks_data.get(row_idx, dict())
-
-            if song_record:
-                extra_hyperlinks = song_record.compute_hyperlinks_full()
-                for transcription, hyperlink in extra_hyperlinks.items():
-                    if transcription not in hyperlinks_for_row.keys():
-                        hyperlinks_for_row[transcription] = hyperlink
-            sync_record['_song_record'] = song_record
-            sync_record['_hyperlinks'] = hyperlinks_for_row
+        # Charts found in the drive fill in any PDF column without a smart chip link
+        sync_record.song_record = song_record
+        if song_record:
+            extra_hyperlinks = song_record.compute_hyperlinks_full()
+            for transcription, hyperlink in extra_hyperlinks.items():
+                if transcription not in sync_record.hyperlinks.keys():
+                    sync_record.hyperlinks[transcription] = hyperlink
         return sync_record
 
 
-    def _sync_record_fetch_all_metadata(self, sync_records: dict[int, dict[str, Any]]) -> list[dict[str, Any]]:
-        populated_songs = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            futures = {
-                executor.submit(self._sync_record_fetch_metadata, row_idx, record): row_idx
-                for row_idx, record in sync_records.items()
-            }
-
-            for future in concurrent.futures.as_completed(futures):
-                row_idx = futures[future]
-                try:
-                    sync_record = future.result()
-                except Exception:
-                    logger.exception(f"Row {row_idx}: failed to autopopulate metadata")
-                    continue
+    def _bulk_song_records(self, sync_records: Dict[int, SheetRow]) -> Optional[Dict[tuple, SongRecord]]:
+        """Resolve every song's Drive folder in a few bulk listings instead of a folder walk per row.
 
-                song_name = str(sync_record.get("Song Name", "")).strip()
-                if sync_record:
-                    populated_songs.append(sync_record)
-                    logger.info(f"Row {row_idx}: Selected '{song_name}' for sync")
-                else:
-                    logger.warning(f"Row {row_idx}: Ignoring '{song_name}' from sync process")
+        Returns None if the bulk lookup failed, in which case each row falls back to its own lookup.
+        """
+        if not sync_records:
+            return {}
+        try:
+            return self.song_data_access.get_records_bulk(
+                (str(record.get("Song Name", "")).strip(), str(record.get("Producer", "")).strip())
+                for record in sync_records.values()
+            )
+        except Exception as e:
+            logger.warning(f"Bulk Drive lookup failed, falling back to per-song lookups: {e}")
+            return None
 
-        return populated_songs
+    def select_accepted_rows(self, slug_match: str = None, only_slugs: Optional[Set[str]] = None) -> Dict[int, SheetRow]:
+        """Select the accepted (completed or under review) rows of the main worksheet which need to be processed
 
-    def fetch_accepted_songs(self, slug_match: str = None) -> List[Dict[str, Any]]:
-        """Fetch accepted songs with enhanced validation and hyperlink extraction"""
+        Args:
+            slug_match: If specified, only fetch the song with this slug
+            only_slugs: If specified, songs outside of this set which already have a JSON file are not fetched again;
+                their existing data is kept in self.reused_songs instead
+        """
         try:
-            records = self.sheet.get_all_records()
+            records = self.worksheet_rows.get(self.worksheet_title, [])
             
             # Filter for accepted songs and under review songs, validate required fields
             required_fields = ['Song Name', 'Status']
 
-            candidate_records: dict[int, dict[str, Any]] = {}
-            for i, record in enumerate(records, start=2):  # Start at 2 for sheet row numbers
+            candidate_records: dict[int, SheetRow] = {}
+            for record in records:
+                i = record.row_index
                 status = str(record.get('Status', '')).lower().strip()
                 original_status = str(record.get('Status', '')).strip()
                 song_name = str(record.get('Song Name', '')).strip()
@@ -253,18 +279,58 @@ class SongSyncManager:
                     logger.info(f"Row {i}: '{song_name}' doesn't match the requested slug '{slug_match}'")
                     continue
 
+                song_slug = self.slugify(song_name)
+                self.song_basenames[f"{song_producer} - {song_name}"] = song_slug
+
+                if only_slugs is not None and song_slug not in only_slugs:
+                    existing_song_data = self._load_existing_song_data(song_name)
+                    if existing_song_data is not None:
+                        logger.info(f"Row {i}: '{song_name}' has no Drive changes, reusing existing data")
+                        self.reused_songs[song_name] = CatalogSong.from_frontend_json(existing_song_data)
+                        continue
+
                 candidate_records[i] = record
 
-            accepted_songs = self._sync_record_fetch_all_metadata(candidate_records)
-            logger.info(f"Found {len(accepted_songs)} valid songs (completed + under review)")
-            return accepted_songs
+            return candidate_records
 
         except Exception as e:
             logger.error(f"Failed to fetch songs from sheet: {e}")
             raise
 
-    def fetch_tv_size_sheets(self, slug_match: str = None) -> Dict[str, Dict[str, Any]]:
-        """Fetch TV size sheet data from the 'TV Size Sheets' worksheet.
+    def select_tv_size_rows(self, slug_match: str = None) -> Dict[str, List[SheetRow]]:
+        """Select the rows of the 'TV Size Sheets' worksheet which need to be processed, grouped by song slug.
+
+        Rows for songs reused from their existing JSON (see select_accepted_rows) are skipped. Rows are grouped per slug
+        so that rows writing the same PDFs are processed in order, by the same thread.
+        """
+        # The TV Size Sheets worksheet was read along with the main one (if it exists)
+        records = self.worksheet_rows.get(SongSyncManager.TV_SIZE_WORKSHEET)
+        if records is None:
+            logger.info(f"'{SongSyncManager.TV_SIZE_WORKSHEET}' worksheet not found, skipping TV size PDFs")
+            return {}
+        logger.info(f"Found '{SongSyncManager.TV_SIZE_WORKSHEET}' worksheet")
+
+        rows_by_slug: Dict[str, List[SheetRow]] = {}
+        for record in records:
+            i = record.row_index
+            song_name = str(record.get('Song Name', '')).strip()
+            
+            if not song_name:
+                continue
+
+            song_slug = self.slugify(song_name)
+            if slug_match is not None and song_slug != slug_match:
+                logger.info(f"Row {i}: '{song_name}' doesn't match the requested slug '{slug_match}'")
+                continue
+
+            if song_name in self.reused_songs:
+                continue
+
+            rows_by_slug.setdefault(song_slug, []).append(record)
+        return rows_by_slug
+
+    def _process_tv_size_rows(self, rows: List[SheetRow]) -> Dict[str, Dict[str, Any]]:
+        """Resolve and fetch the TV size PDFs of the given rows, in order (for each song, the last row with data wins).
         
         Returns a dict mapping song names to TV size metadata:
         {
@@ -278,302 +344,126 @@ class SongSyncManager:
             }
         }
         """
-        try:
-            # Try to get the TV Size Sheets worksheet
-            workbook = self.sheet.spreadsheet
-            tv_sheet = None
-            
-            try:
-                tv_sheet = workbook.worksheet('TV Size Sheets')
-                logger.info(f"Found 'TV Size Sheets' worksheet")
-            except gspread.exceptions.WorksheetNotFound:
-                logger.info("'TV Size Sheets' worksheet not found, skipping TV size PDFs")
-                return {}
-            
-            records = tv_sheet.get_all_records()
-            
-            # Get hyperlinks for this worksheet
-            hyperlinks_data = self._extract_hyperlinks_from_worksheet(tv_sheet)
+        tv_size_pdfs = {}
+        pdf_columns = SongDataAccess.TRANSCRIPTIONS
+
+        for record in rows:
+            song_name = str(record.get('Song Name', '')).strip()
+            song_slug = self.slugify(song_name)
+            pdfs = {}
+            tv_size_length = self._parse_length(record.get('TV Size Length', ''))
             
-            tv_size_pdfs = {}
-            pdf_columns = SongDataAccess.TRANSCRIPTIONS
+            # Smart chip links for this row, if any
+            row_hyperlinks = record.hyperlinks
             
-            for i, record in enumerate(records, start=2):  # Start at 2 for sheet row numbers
-                song_name = str(record.get('Song Name', '')).strip()
-                
-                if not song_name:
-                    continue
-
-                song_slug = self.slugify(song_name)
-                if slug_match is not None and song_slug != slug_match:
-                    logger.info(f"Row {i}: '{song_name}' doesn't match the requested slug '{slug_match}'")
-                    continue
-
-                pdfs = {}
-                tv_size_length = self._parse_length(record.get('TV Size Length', ''))
+            # Parse PDF links for each instrument column
+            for column_name in pdf_columns:
+                drive_id = None
                 
-                # Extract hyperlinks for this row if available
-                row_hyperlinks = hyperlinks_data.get(i, {})
+                # First try hyperlinks (chip format)
+                if column_name in row_hyperlinks:
+                    drive_url = row_hyperlinks[column_name]
+                    drive_id = self._validate_drive_id(drive_url)
+                else:
+                    # Fallback to text content
+                    drive_id = self._validate_drive_id(record.get(column_name, ''))
                 
-                # Parse PDF links for each instrument column
-                for column_name in pdf_columns:
-                    drive_id = None
+                if drive_id:
+                    self.drive_file_index[drive_id] = {'slug': song_slug, 'key': column_name, 'tv': True}
+
+                    # Use TV size subdirectory naming: /pdfs/{song-slug}-tv/{song-slug}-tv-{instrument}.pdf
+                    pdf_filename = f"{song_slug}-tv/{song_slug}-tv-{column_name.lower()}.pdf"
+                    pdf_path = os.path.join(self.pdf_dir, pdf_filename)
+                    
+                    # Fetch Drive metadata for change detection
+                    metadata = self._get_drive_file_metadata(drive_id)
+                    remote_md5 = metadata.get('md5Checksum') if metadata else None
                     
-                    # First try hyperlinks (chip format)
-                    if column_name in row_hyperlinks:
-                        drive_url = row_hyperlinks[column_name]
-                        drive_id = self._validate_drive_id(drive_url)
+                    # Compare and download if needed
+                    local_md5 = self._file_md5(pdf_path) if os.path.exists(pdf_path) else None
+                    should_download = False
+                    
+                    if not os.path.exists(pdf_path):
+                        logger.info(f"TV PDF not found locally: {pdf_filename}")
+                        should_download = True
+                    elif remote_md5 and local_md5 and remote_md5 != local_md5:
+                        logger.info(f"Remote TV PDF changed for {column_name} in {song_name}, will re-download")
+                        should_download = True
+                    elif remote_md5 and not local_md5:
+                        should_download = True
+                    elif not remote_md5 and not os.path.exists(pdf_path):
+                        should_download = True
                     else:
-                        # Fallback to text content
-                        drive_id = self._validate_drive_id(record.get(column_name, ''))
+                        logger.info(f"TV PDF up to date: {pdf_filename}")
+                        if local_md5:
+                            self.blob_store.add(pdf_path, local_md5)
                     
-                    if drive_id:
-                        # Use TV size subdirectory naming: /pdfs/{song-slug}-tv/{song-slug}-tv-{instrument}.pdf
-                        pdf_filename = f"{song_slug}-tv/{song_slug}-tv-{column_name.lower()}.pdf"
-                        pdf_path = os.path.join(self.pdf_dir, pdf_filename)
-                        
-                        # Fetch Drive metadata for change detection
-                        metadata = self._get_drive_file_metadata(drive_id)
-                        remote_md5 = metadata.get('md5Checksum') if metadata else None
-                        
-                        # Compare and download if needed
-                        local_md5 = self._file_md5(pdf_path) if os.path.exists(pdf_path) else None
-                        should_download = False
-                        
-                        if not os.path.exists(pdf_path):
-                            logger.info(f"TV PDF not found locally: {pdf_filename}")
-                            should_download = True
-                        elif remote_md5 and local_md5 and remote_md5 != local_md5:
-                            logger.info(f"Remote TV PDF changed for {column_name} in {song_name}, will re-download")
-                            should_download = True
-                        elif remote_md5 and not local_md5:
-                            should_download = True
-                        elif not remote_md5 and not os.path.exists(pdf_path):
-                            should_download = True
+                    if should_download:
+                        if self._fetch_pdf(drive_id, pdf_path, remote_md5):
+                            pdfs[column_name] = f"/pdfs/{pdf_filename}"
+                            self.downloads_performed = True
                         else:
-                            logger.info(f"TV PDF up to date: {pdf_filename}")
-                        
-                        if should_download:
-                            if GDriveSession.download_file(drive_id, os.path.join(self.pdf_dir, pdf_filename)):
+                            logger.warning(f"Failed to download TV PDF for {column_name}, keeping existing if present")
+                            if os.path.exists(pdf_path):
                                 pdfs[column_name] = f"/pdfs/{pdf_filename}"
-                                self.downloads_performed = True
-                            else:
-                                logger.warning(f"Failed to download TV PDF for {column_name}, keeping existing if present")
-                                if os.path.exists(pdf_path):
-                                    pdfs[column_name] = f"/pdfs/{pdf_filename}"
-                        else:
-                            pdfs[column_name] = f"/pdfs/{pdf_filename}"
-                
-                if pdfs or tv_size_length:
-                    tv_size_pdfs[song_name] = {
-                        'pdfs': pdfs,
-                        'tvSizeLength': tv_size_length,
-                    }
-            
-            logger.info(f"Found {len(tv_size_pdfs)} songs with TV size sheets")
-            return tv_size_pdfs
-            
-        except Exception as e:
-            logger.error(f"Failed to fetch TV size sheets: {e}")
-            return {}
-
-    def _extract_hyperlinks_from_worksheet(self, worksheet) -> Dict[int, Dict[str, str]]:
-        """Extract hyperlinks from a specific worksheet using Google Sheets API"""
-        try:
-            import requests
-            
-            client = worksheet.spreadsheet.client
-            credentials = client.auth
-            
-            if hasattr(credentials, 'token') and hasattr(credentials, 'refresh'):
-                if getattr(credentials, 'expired', False):
-                    credentials.refresh(requests.Request())
-            
-            access_token = getattr(credentials, 'token', None)
-            if not access_token:
-                return {}
-            
-            spreadsheet_id = worksheet.spreadsheet.id
-            url = f"https://sheets.googleapis.com/v4/spreadsheets/{spreadsheet_id}"
-            
-            params = {
-                'includeGridData': 'true',
-                'ranges': f"'{worksheet.title}'!A:Z",
-                'fields': 'sheets.data.rowData.values.chipRuns,sheets.data.rowData.values.formattedValue'
-            }
-            
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            
-            data = response.json()
-            hyperlinks_by_row = {}
-            
-            if 'sheets' in data and len(data['sheets']) > 0:
-                sheet_data = data['sheets'][0]
-                if 'data' in sheet_data and len(sheet_data['data']) > 0:
-                    grid_data = sheet_data['data'][0]
-                    
-                    if 'rowData' in grid_data:
-                        # Get header row
-                        headers = []
-                        if len(grid_data['rowData']) > 0 and 'values' in grid_data['rowData'][0]:
-                            for cell in grid_data['rowData'][0]['values']:
-                                headers.append(cell.get('formattedValue', ''))
-                        
-                        # Process data rows
-                        for row_idx, row_data in enumerate(grid_data['rowData'][1:], start=2):
-                            if 'values' not in row_data:
-                                continue
-                            
-                            row_hyperlinks = {}
-                            
-                            for col_idx, cell_data in enumerate(row_data['values']):
-                                if 'chipRuns' in cell_data:
-                                    for chip_run in cell_data['chipRuns']:
-                                        if 'chip' in chip_run and 'richLinkProperties' in chip_run['chip']:
-                                            uri = chip_run['chip']['richLinkProperties'].get('uri')
-                                            if uri and col_idx < len(headers):
-                                                col_name = headers[col_idx]
-                                                if col_name:
-                                                    row_hyperlinks[col_name] = uri
-                            
-                            if row_hyperlinks:
-                                hyperlinks_by_row[row_idx] = row_hyperlinks
-            
-            logger.info(f"Extracted hyperlinks for {len(hyperlinks_by_row)} rows from {worksheet.title}")
-            return hyperlinks_by_row
+                    else:
+                        pdfs[column_name] = f"/pdfs/{pdf_filename}"
             
-        except Exception as e:
-            logger.warning(f"Failed to extract hyperlinks from {worksheet.title}: {e}")
-            return {}
+            if pdfs or tv_size_length:
+                tv_size_pdfs[song_name] = {
+                    'pdfs': pdfs,
+                    'tvSizeLength': tv_size_length,
+                }
 
-    def _extract_hyperlinks_simple(self) -> Dict[int, Dict[str, str]]:
-        """Extract hyperlinks from chip format using Google Sheets API"""
-        try:
-            # Get the credentials and make direct API calls
-            import requests
-            
-            # Get the access token from gspread client
-            client = self.sheet.spreadsheet.client
-            credentials = client.auth
-            
-            # Refresh token if needed
-            if hasattr(credentials, 'token') and hasattr(credentials, 'refresh'):
-                if credentials.expired:
-                    credentials.refresh(requests.Request())
-            
-            access_token = credentials.token
-            
-            # Construct the API URL for getting grid data with chip information
-            spreadsheet_id = self.sheet.spreadsheet.id
-            url = f"https://sheets.googleapis.com/v4/spreadsheets/{spreadsheet_id}"
-            
-            params = {
-                'includeGridData': 'true',
-                'ranges': f"'{self.sheet.title}'!A:Z",
-                'fields': 'sheets.data.rowData.values.chipRuns,sheets.data.rowData.values.formattedValue'
-            }
-            
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            
-            data = response.json()
-            hyperlinks_by_row = {}
-            
-            if 'sheets' in data and len(data['sheets']) > 0:
-                sheet_data = data['sheets'][0]
-                if 'data' in sheet_data and len(sheet_data['data']) > 0:
-                    grid_data = sheet_data['data'][0]
-                    
-                    if 'rowData' in grid_data:
-                        # Get header row to map column indices to names
-                        headers = []
-                        if len(grid_data['rowData']) > 0 and 'values' in grid_data['rowData'][0]:
-                            for cell in grid_data['rowData'][0]['values']:
-                                headers.append(cell.get('formattedValue', ''))
-                        
-                        # Process data rows (skip header)
-                        for row_idx, row_data in enumerate(grid_data['rowData'][1:], start=2):
-                            if 'values' not in row_data:
-                                continue
-                            
-                            row_hyperlinks = {}
-                            
-                            for col_idx, cell_data in enumerate(row_data['values']):
-                                # Look for chipRuns with richLinkProperties
-                                if 'chipRuns' in cell_data:
-                                    for chip_run in cell_data['chipRuns']:
-                                        if 'chip' in chip_run and 'richLinkProperties' in chip_run['chip']:
-                                            uri = chip_run['chip']['richLinkProperties'].get('uri')
-                                            if uri and col_idx < len(headers):
-                                                col_name = headers[col_idx]
-                                                # Include both link columns and PDF columns
-                                                if col_name and ('link' in col_name.lower() or col_name in ['Vocals', 'Bb', 'C', 'Eb', 'F', 'G', 'Alto', 'Bass', 'Percussion', 'Youtube', 'Transcriber']):
-                                                    row_hyperlinks[col_name] = uri
-                                                    logger.debug(f"Found link in row {row_idx}, col {col_name}: {uri}")
-                            
-                            if row_hyperlinks:
-                                hyperlinks_by_row[row_idx] = row_hyperlinks
-            
-            logger.info(f"Extracted hyperlinks for {len(hyperlinks_by_row)} rows")
-            return hyperlinks_by_row
-            
-        except Exception as e:
-            logger.warning(f"Failed to extract hyperlinks: {e}")
-            return {}
+        return tv_size_pdfs
 
-    def normalize_song_data(self, song: Dict[str, Any], existing_song_data: Optional[Dict[str, Any]] = None, tv_size_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def normalize_song_data(
+        self,
+        song: SheetRow,
+        existing_song_data: Optional[Dict[str, Any]] = None,
+        tv_size_data: Optional[Dict[str, Any]] = None,
+        parsed_pdfs: Optional[tuple] = None,
+    ) -> CatalogSong:
         """Normalize song data based on the sheet structure
         
         Args:
-            song: Dict with song data from main Songs worksheet
+            song: Row from main Songs worksheet
             existing_song_data: Existing frontend JSON data for comparison (if available)
             tv_size_data: Dict containing TV size metadata for this song (from TV Size Sheets worksheet)
+            parsed_pdfs: What _parse_pdfs_new() returned for this song, if the PDFs were already fetched
         """
         tv_size_data = tv_size_data or {}
 
         # Parse PDFs with change detection (Drive md5 checksums included)
-        pdfs, links, pdf_checksums, downloaded_any = self._parse_pdfs_new(song, existing_song_data)
+        if parsed_pdfs is None:
+            parsed_pdfs = self._parse_pdfs_new(song, existing_song_data)
+        pdfs, links, pdf_checksums, downloaded_any = parsed_pdfs
         if downloaded_any:
             self.downloads_performed = True
         
         # Map sheet columns to JSON format
-        normalized = {
-            'title': str(song.get('Song Name', '')).strip(),
-            'alternativeNames': self._parse_alternative_names(song.get('Alternative Names', '')),
-            'producer': str(song.get('Producer', '')).strip(),
-            'additionalProducers': self._parse_comma_separated(song.get('Additional Producers (comma sep)', '')),
-            'singer': str(song.get('Original Voice', '')).strip(),
-            'additionalVoices': self._parse_comma_separated(song.get('Additional Voices (comma sep)', '')),
-            'releaseDate': self._format_date(song.get('Release Date (ISO)', '')),
-            'length': self._parse_length(song.get('Length', '')),
-            'tvSizeLength': self._parse_length(tv_size_data.get('tvSizeLength', '')),
-            'bpm': self._parse_bpm(song.get('BPM', '')),
-            'labels': self._parse_comma_separated(song.get('Labels (comma sep)', '')),
-            'transcriber': str(song.get('Transcriber', '')).strip(),
-            'videoLinks': self._parse_video_links_new(song),
-            'pdfs': pdfs,
-            'pdfsTvSize': tv_size_data.get('pdfs', {}),
-            'links': links,
-            'pdfChecksums': pdf_checksums,
+        return CatalogSong(
+            title=str(song.get('Song Name', '')).strip(),
+            alternative_names=self._parse_alternative_names(song.get('Alternative Names', '')),
+            producer=str(song.get('Producer', '')).strip(),
+            additional_producers=self._parse_comma_separated(song.get('Additional Producers (comma sep)', '')),
+            singer=str(song.get('Original Voice', '')).strip(),
+            additional_voices=self._parse_comma_separated(song.get('Additional Voices (comma sep)', '')),
+            release_date=self._format_date(song.get('Release Date (ISO)', '')),
+            length=self._parse_length(song.get('Length', '')),
+            tv_size_length=self._parse_length(tv_size_data.get('tvSizeLength', '')),
+            bpm=self._parse_bpm(song.get('BPM', '')),
+            labels=self._parse_comma_separated(song.get('Labels (comma sep)', '')),
+            transcriber=str(song.get('Transcriber', '')).strip(),
+            video_links=self._parse_video_links_new(song),
+            links=links,
+            pdf_checksums=pdf_checksums,
+            pdfs=pdfs,
+            pdfs_tv_size=tv_size_data.get('pdfs', {}),
+            status=self._normalize_status(song.get('Status', '')),
             # Track whether this song downloaded any PDFs this run for per-song syncedAt decisions
-            'downloaded': downloaded_any,
-            'metadata': {
-                'status': self._normalize_status(song.get('Status', ''))
-            }
-        }
-        
-        return normalized
+            downloaded=downloaded_any,
+        )
 
     def _normalize_status(self, status: Any) -> str:
         """Normalize status to standard values"""
@@ -611,12 +501,12 @@ class SongSyncManager:
         items = [item.strip() for item in value_str.split(',')]
         return [item for item in items if item]  # Remove empty items
 
-    def _parse_video_links_new(self, song: Dict[str, Any]) -> Dict[str, str]:
+    def _parse_video_links_new(self, song: SheetRow) -> Dict[str, str]:
         """Parse video links with chip link support"""
         links = {}
         
         # Get hyperlinks if available
-        hyperlinks = song.get('_hyperlinks', {})
+        hyperlinks = song.hyperlinks
         
         # YouTube Link
         youtube_text = str(song.get('Youtube', '')).strip()
@@ -628,7 +518,7 @@ class SongSyncManager:
         return links
 
     def _parse_pdfs_new(
-        self, song: Dict[str, Any], existing_song_data: Optional[Dict[str, Any]] = None
+        self, song: SheetRow, existing_song_data: Optional[Dict[str, Any]] = None
     ) -> tuple[Dict[str, str], Dict[str, str], Dict[str, Optional[str]], bool]:
         """Parse PDF information with chip link support and download PDFs locally.
 
@@ -644,8 +534,8 @@ class SongSyncManager:
         downloaded_any = False
         
         # Get hyperlinks if available
-        hyperlinks = song.get('_hyperlinks', {})
-        song_record = song.get('_song_record', None)
+        hyperlinks = song.hyperlinks
+        song_record = song.song_record
         
         # Get song title for filename generation
         song_title = song.get('Song Name', '').strip()
@@ -683,11 +573,12 @@ class SongSyncManager:
                 # Store Google Drive link for reference
                 current_drive_link = f"https://drive.google.com/file/d/{drive_id}/view"
                 pdf_drive_links[pdf_key] = current_drive_link
+                self.drive_file_index[drive_id] = {'slug': song_slug, 'key': pdf_key, 'tv': False}
 
                 try:
                     metadata = song_record.pdfs_full[pdf_key]
-                except Exception as e:
-                    metadata = self.session.get_file_metadata(drive_id)
+                except KeyError:
+                    metadata = self._get_drive_file_metadata(drive_id)
 
                 remote_md5 = metadata.get('md5Checksum') if metadata else None
                 pdf_checksums[pdf_key] = remote_md5
@@ -696,8 +587,13 @@ class SongSyncManager:
                 pdf_filename = f"{song_slug}/{song_slug}-{pdf_key.lower()}.pdf"
                 pdf_path = os.path.join(self.pdf_dir, pdf_filename)
 
-                # Compare remote checksum to local file checksum (if it exists)
-                local_md5 = self._file_md5(pdf_path) if os.path.exists(pdf_path) else None
+                # Compare remote checksum to local file checksum (if it exists). The checksum the PDF was committed
+                # with spares hashing it again after a fresh checkout
+                committed_md5 = None
+                if existing_song_data and existing_song_data.get('pdfs', {}).get(pdf_key) == f"/pdfs/{pdf_filename}":
+                    committed_md5 = existing_song_data.get('pdfChecksums', {}).get(pdf_key)
+                remote_size = metadata.get('size') if metadata and remote_md5 == committed_md5 else None
+                local_md5 = self._file_md5(pdf_path, committed_md5, remote_size) if os.path.exists(pdf_path) else None
 
                 should_download = False
                 if not os.path.exists(pdf_path):
@@ -718,12 +614,13 @@ class SongSyncManager:
                         should_download = True
 
                 if should_download:
-                    if GDriveSession.download_file(drive_id, os.path.join(self.pdf_dir, pdf_filename)):
+                    downloaded_md5 = self._fetch_pdf(drive_id, pdf_path, remote_md5)
+                    if downloaded_md5:
                         pdfs[pdf_key] = f"/pdfs/{pdf_filename}"
                         downloaded_any = True
                         # Update checksum after download if remote md5 unavailable
                         if not remote_md5:
-                            pdf_checksums[pdf_key] = self._file_md5(pdf_path)
+                            pdf_checksums[pdf_key] = downloaded_md5
                     else:
                         logger.warning(f"Download failed for {pdf_key}, keeping existing local file if present")
                         if os.path.exists(pdf_path):
@@ -734,6 +631,8 @@ class SongSyncManager:
                 else:
                     logger.info(f"PDF up to date: {pdf_filename}")
                     pdfs[pdf_key] = f"/pdfs/{pdf_filename}"
+                    if local_md5:
+                        self.blob_store.add(pdf_path, local_md5)
 
         return pdfs, pdf_drive_links, pdf_checksums, downloaded_any
 
@@ -848,49 +747,54 @@ class SongSyncManager:
     def _get_drive_file_metadata(self, file_id: str) -> Dict[str, Any]:
         """Fetch Drive file metadata (md5Checksum, modifiedTime, size) for change detection."""
         try:
-            client = self.sheet.spreadsheet.client
-            credentials = client.auth
-
-            # Local import to avoid hard dependency at module import time
-            import requests
-
-            if hasattr(credentials, 'token') and hasattr(credentials, 'refresh'):
-                try:
-                    credentials.refresh(None)
-                except Exception:
-                    pass
-
-            access_token = getattr(credentials, 'token', None)
-            if not access_token:
-                return {}
-
-            url = f"https://www.googleapis.com/drive/v3/files/{file_id}"
-            params = {'fields': 'md5Checksum,modifiedTime,size'}
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
-
-            r = requests.get(url, params=params, headers=headers, timeout=15)
-            r.raise_for_status()
-            return r.json()
+            return self.session.get_file_metadata(file_id)
         except Exception as e:
             logger.warning(f"Failed to fetch Drive metadata for {file_id}: {e}")
             return {}
 
-    def _file_md5(self, path: str) -> Optional[str]:
-        """Compute md5 checksum of a local file if readable."""
-        try:
-            if not os.path.exists(path):
-                return None
-            hash_md5 = hashlib.md5()
-            with open(path, 'rb') as f:
-                for chunk in iter(lambda: f.read(8192), b''):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
-        except Exception as e:
-            logger.warning(f"Unable to hash file {path}: {e}")
-            return None
+    def _fetch_pdf(self, drive_id: str, pdf_path: str, remote_md5: Optional[str]) -> Optional[str]:
+        """Put the PDF for drive_id at pdf_path, reusing a local copy instead of downloading whenever its checksum is known.
+
+        Returns the md5 of the PDF placed at pdf_path, or None if it couldn't be fetched.
+        """
+        if remote_md5:
+            # A PDF committed under another path (e.g. before a song was renamed) can seed the blob store
+            local_copy = self._known_local_pdfs().get(remote_md5)
+            if not self.blob_store.has(remote_md5) and local_copy and self._file_md5(local_copy) == remote_md5:
+                self.blob_store.add(local_copy, remote_md5)
+
+            if self.blob_store.materialize(remote_md5, pdf_path):
+                logger.info(f"Reused known PDF {remote_md5} for {pdf_path}")
+                self.checksum_index.record(pdf_path, remote_md5)
+                return remote_md5
+
+        downloaded_md5 = self.session.download_file(drive_id, pdf_path, expected_md5=remote_md5)
+        if downloaded_md5:
+            self.blob_store.add(pdf_path, downloaded_md5)
+            self.checksum_index.record(pdf_path, downloaded_md5)
+        return downloaded_md5
+
+    def _known_local_pdfs(self) -> Dict[str, str]:
+        """Map of md5 -> local path for every PDF referenced (with a checksum) by the existing frontend JSON files"""
+        with self._local_pdfs_lock:
+            if self._local_pdfs_by_md5 is None:
+                self._local_pdfs_by_md5 = {}
+                for song_data in self.existing_catalog().values():
+                    for key, md5 in song_data.get('pdfChecksums', {}).items():
+                        pdf_path = song_data.get('pdfs', {}).get(key, '')
+                        if md5 and pdf_path.startswith('/pdfs/'):
+                            self._local_pdfs_by_md5[md5] = os.path.join(self.pdf_dir, pdf_path[len('/pdfs/'):])
+            return self._local_pdfs_by_md5
+
+    def _file_md5(
+        self, path: str, committed_md5: Optional[str] = None, committed_size: Optional[int] = None
+    ) -> Optional[str]:
+        """md5 checksum of a local file if readable, only reading the file if it changed since it was last hashed.
+
+        committed_md5 is the checksum the file was committed with (its pdfChecksums entry), trusted when only the
+        file's mtime or inode changed and its size still matches (see ChecksumIndex.md5()).
+        """
+        return self.checksum_index.md5(path, committed_md5, committed_size)
 
     def cleanup_orphaned_pdfs(self, referenced_pdfs: set) -> None:
         """Remove PDF files that are no longer referenced in any song"""
@@ -938,80 +842,164 @@ class SongSyncManager:
         except Exception as e:
             logger.error(f"Failed to cleanup orphaned PDFs: {e}")
 
-    def group_and_merge_songs(self, songs: List[Dict[str, Any]], tv_size_pdfs: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
-        """Group songs by title - simplified for new structure
-        
+    def process_songs(
+        self, song_slug: str = None, only_slugs: Optional[Set[str]] = None, stage_files: bool = True
+    ) -> Dict[str, CatalogSong]:
+        """Run every selected row of both worksheets through the sync pipeline.
+
+        Main worksheet rows flow through bounded queues, one thread pool per stage:
+            resolve   - find the song's chart folder and PDFs in Drive (_sync_record_fetch_metadata)
+            download  - fetch the song's PDFs (_parse_pdfs_new)
+            normalize - build the CatalogSong, once the song's TV size rows are done (normalize_song_data)
+            serialize - render the song's JSON file into self.staged_song_files (_song_file_content)
+        while the TV size rows go through their own pool (_process_tv_size_rows) at the same time. A song is finished
+        as soon as its own rows are, without waiting for the rest of the sheet. Nothing is written to disk here:
+        update_frontend_files() writes the staged files once the run is known to have succeeded and changed something.
+
+        A song whose rows raised in any stage (or in the TV size pool) is left out of the result and recorded in
+        self.failed_songs; if it has a JSON file, it is carried over unchanged through self.reused_songs so it isn't
+        removed as an orphan. An error reading the rows themselves fails the whole run.
+
         Args:
-            songs: List of song records from main Songs worksheet
-            tv_size_pdfs: Dict mapping song names to their TV size PDFs from TV Size Sheets worksheet
+            song_slug: If specified, only process the song with this slug
+            only_slugs: See select_accepted_rows()
+            stage_files: Serialize each finished song's JSON file (False for --check-only)
+
+        Returns:
+            the finished songs by title (songs reused by an incremental sync are not included)
         """
-        if tv_size_pdfs is None:
-            tv_size_pdfs = {}
+        accepted_rows = self.select_accepted_rows(song_slug, only_slugs)
+        tv_size_rows = self.select_tv_size_rows(song_slug)
 
-        normalization_args = {}
-        for song in songs:
-            title = str(song.get('Song Name', '')).strip()
-            if not title:
-                continue
+        # Main worksheet rows with the same title make one song; like the sheet order, the last row wins
+        rows_by_title = {str(row.get('Song Name', '')).strip(): row for row in accepted_rows.values()}
 
-            # Load existing song data if available
-            existing_song_data = None
-            filename = f"{self.slugify(title)}.json"
-            filepath = os.path.join(self.frontend_data_dir, filename)
-            if os.path.exists(filepath):
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        existing_song_data = json.load(f)
-                except Exception as e:
-                    logger.warning(f"Failed to load existing song data for {title}: {e}")
+        tv_size_pdfs: Dict[str, Dict[str, Any]] = {}
+        tv_size_done = {
+            str(row.get('Song Name', '')).strip(): threading.Event() for rows in tv_size_rows.values() for row in rows
+        }
 
-            # Get TV size metadata for this song if available
-            song_tv_size_data = tv_size_pdfs.get(title, {})
+        def process_tv_size(rows: List[SheetRow]) -> Dict[str, Dict[str, Any]]:
+            try:
+                processed = self._process_tv_size_rows(rows)
+                tv_size_pdfs.update(processed)
+                return processed
+            finally:
+                for row in rows:
+                    tv_size_done[str(row.get('Song Name', '')).strip()].set()
+
+        song_records = None
+
+        def rows() -> Iterator[SheetRow]:
+            nonlocal song_records
+            song_records = self._bulk_song_records(accepted_rows)
+            yield from rows_by_title.values()
+
+        def resolve(row: SheetRow) -> Optional[SheetRow]:
+            song_name = str(row.get('Song Name', '')).strip()
+            sync_record = self._sync_record_fetch_metadata(row.row_index, row, song_records)
+            if sync_record:
+                logger.info(f"Row {row.row_index}: Selected '{song_name}' for sync")
+            else:
+                logger.warning(f"Row {row.row_index}: Ignoring '{song_name}' from sync process")
+            return sync_record
 
-            # Normalize with existing data for comparison
-            normalization_args[title] = (song, existing_song_data, song_tv_size_data)
+        def download(song: SheetRow) -> tuple:
+            existing_song_data = self._load_existing_song_data(str(song.get('Song Name', '')).strip())
+            return song, existing_song_data, self._parse_pdfs_new(song, existing_song_data)
 
-        grouped = {}
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+        def normalize(item: tuple) -> tuple[str, CatalogSong]:
+            song, existing_song_data, parsed_pdfs = item
             title = str(song.get('Song Name', '')).strip()
-            futures = {
-                executor.submit(self.normalize_song_data, *args): title
-                for title, args in normalization_args.items()
-            }
-
-            for future in concurrent.futures.as_completed(futures):
-                title = futures[future]
-                try:
-                    normalized = future.result()
-                except Exception:
-                    logger.exception(f"Song '{title}': failed to autopopulate metadata")
-
-                # Create song entry
-                grouped[title] = {
-                    'title': normalized['title'],
-                    'alternativeNames': normalized['alternativeNames'],
-                    'producer': normalized['producer'],
-                    'additionalProducers': normalized['additionalProducers'],
-                    'singer': normalized['singer'],
-                    'additionalVoices': normalized['additionalVoices'],
-                    'releaseDate': normalized['releaseDate'],
-                    'length': normalized.get('length', ''),
-                    'tvSizeLength': normalized.get('tvSizeLength', ''),
-                    'bpm': normalized.get('bpm'),
-                    'labels': normalized['labels'],
-                    'transcriber': normalized['transcriber'],
-                    'videoLinks': normalized['videoLinks'],
-                    'links': normalized['links'],
-                    'pdfChecksums': normalized.get('pdfChecksums', {}),
-                    'pdfs': normalized['pdfs'],
-                    'pdfsTvSize': normalized.get('pdfsTvSize', {}),
-                    'downloaded': normalized.get('downloaded', False),
-                    'metadata': normalized['metadata'],
-                }
+            if title in tv_size_done:
+                tv_size_done[title].wait()
+            return title, self.normalize_song_data(song, existing_song_data, tv_size_pdfs.get(title, {}), parsed_pdfs)
+
+        def serialize(item: tuple[str, CatalogSong]) -> tuple[str, CatalogSong]:
+            if stage_files:
+                self.staged_song_files[item[0]] = self._song_file_content(*item)
+            return item
+
+        tv_size_pipeline = Pipeline("tv-size").stage("process", process_tv_size, workers=RateLimiter.MAX_WORKERS)
+        songs_pipeline = (
+            Pipeline("songs")
+            .stage("resolve", resolve, workers=RateLimiter.MAX_WORKERS)
+            .stage("download", download, workers=RateLimiter.MAX_WORKERS)
+            .stage("normalize", normalize, workers=SongSyncManager.NORMALIZE_WORKERS)
+            .stage("serialize", serialize, workers=SongSyncManager.WRITE_WORKERS)
+        )
+        tv_size_pipeline.start(tv_size_rows.values())
+        songs_pipeline.start(rows())
 
+        try:
+            grouped = dict(songs_pipeline.join())
+        finally:
+            tv_size_pipeline.join()
+
+        self._carry_over_failed_songs(
+            grouped,
+            {self._pipeline_item_title(failure.item) for failure in songs_pipeline.failures} |
+            {str(row.get('Song Name', '')).strip() for failure in tv_size_pipeline.failures for row in failure.item},
+        )
+
+        logger.info(f"Found {len(grouped)} valid songs (completed + under review)")
+        logger.info(f"Found {len(tv_size_pdfs)} songs with TV size sheets")
         return grouped
 
-    def update_frontend_files(self, grouped_songs: Dict[str, Dict[str, Any]], remove_orphans: bool = True) -> None:
+    @staticmethod
+    def _pipeline_item_title(item: Any) -> str:
+        """Title of the song an item of the songs pipeline belongs to (a row, or a tuple starting with a row or title)"""
+        if isinstance(item, tuple):
+            item = item[0]
+        return item if isinstance(item, str) else str(item.get('Song Name', '')).strip()
+
+    def _carry_over_failed_songs(self, grouped: Dict[str, CatalogSong], failed_titles: Set[str]) -> None:
+        """Drop the songs which failed from this run's results, keeping their existing JSON (if any) as it is"""
+        for title in sorted(failed_titles):
+            grouped.pop(title, None)
+            self.staged_song_files.pop(title, None)
+            self.failed_songs.add(title)
+
+            existing_song_data = self._load_existing_song_data(title)
+            if existing_song_data is None:
+                logger.warning(f"Processing '{title}' failed; it has no existing JSON and is left out of this run")
+                continue
+            try:
+                self.reused_songs[title] = CatalogSong.from_frontend_json(existing_song_data)
+                logger.warning(f"Processing '{title}' failed; keeping its existing JSON")
+            except Exception as e:
+                logger.warning(f"Processing '{title}' failed and its existing JSON can't be carried over: {e}")
+
+    def existing_catalog(self) -> Dict[str, Dict[str, Any]]:
+        """The song JSON files as they were before this run, by filename, read (in parallel) and parsed only once"""
+        with self._existing_catalog_lock:
+            if self._existing_catalog is None:
+                filenames = []
+                if os.path.isdir(self.frontend_data_dir):
+                    filenames = sorted(
+                        f for f in os.listdir(self.frontend_data_dir)
+                        if f.endswith('.json') and f != 'generated-manifest.json'
+                    )
+                contents = self.frontend_files.preload(
+                    [os.path.join(self.frontend_data_dir, f) for f in filenames], workers=SongSyncManager.WRITE_WORKERS
+                )
+
+                self._existing_catalog = {}
+                for filename, content in zip(filenames, contents.values()):
+                    if content is None:
+                        continue
+                    try:
+                        self._existing_catalog[filename] = json.loads(content)
+                    except ValueError as e:
+                        logger.warning(f"Failed to load existing song data {filename}: {e}")
+                logger.info(f"Loaded {len(self._existing_catalog)} existing song files")
+            return self._existing_catalog
+
+    def _load_existing_song_data(self, title: str) -> Optional[Dict[str, Any]]:
+        """A song's existing frontend JSON, or None if it doesn't exist or can't be read"""
+        return self.existing_catalog().get(f"{self.slugify(title)}.json")
+
+    def update_frontend_files(self, grouped_songs: Dict[str, CatalogSong], remove_orphans: bool = True) -> None:
         """Update frontend data files"""
         # Ensure frontend data directory exists
         os.makedirs(self.frontend_data_dir, exist_ok=True)
@@ -1022,17 +1010,17 @@ class SongSyncManager:
         # Track all referenced PDF paths for cleanup
         referenced_pdfs = set()
 
-        # Single run timestamp used when a song is new or changed
-        synced_at_now = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
-        
-        # Update individual JSON files
+        # Write the individual JSON files whose content changed
+        with concurrent.futures.ThreadPoolExecutor(max_workers=SongSyncManager.WRITE_WORKERS) as executor:
+            written = sum(executor.map(lambda item: self._write_song_file(*item), grouped_songs.items()))
+        logger.info(f"Wrote {written} of {len(grouped_songs)} song files")
+
         for title, song_data in grouped_songs.items():
             filename = f"{self.slugify(title)}.json"
-            filepath = os.path.join(self.frontend_data_dir, filename)
             generated_files.append(filename)
             
             # Track referenced PDFs for this song
-            for pdf_path in song_data['pdfs'].values():
+            for pdf_path in song_data.pdfs.values():
                 if pdf_path.startswith('/pdfs/'):
                     # Convert /pdfs/song/file.pdf to song/file.pdf
                     rel_path = pdf_path[6:]  # Remove '/pdfs/' prefix
@@ -1041,108 +1029,20 @@ class SongSyncManager:
                     referenced_pdfs.add(rel_path)
             
             # Track TV size PDFs too
-            for tv_pdf_path in song_data.get('pdfsTvSize', {}).values():
+            for tv_pdf_path in song_data.pdfs_tv_size.values():
                 if tv_pdf_path.startswith('/pdfs/'):
                     rel_path = tv_pdf_path[6:]  # Remove '/pdfs/' prefix
                     rel_path = rel_path.replace('/', os.sep)
                     referenced_pdfs.add(rel_path)
-            
-            # Create frontend-compatible format (simplified structure)
-            frontend_data = {
-                'title': song_data['title'],
-                'alternativeNames': song_data.get('alternativeNames', []),
-                'producer': song_data['producer'],
-                'additionalProducers': song_data.get('additionalProducers', []),
-                'singer': song_data['singer'],
-                'additionalVoices': song_data.get('additionalVoices', []),
-                'releaseDate': song_data['releaseDate'],
-                'length': song_data.get('length', ''),
-                'tvSizeLength': song_data.get('tvSizeLength', ''),
-                'bpm': song_data.get('bpm'),
-                'labels': song_data.get('labels', []),
-                'transcriber': song_data.get('transcriber', ''),
-                'videoLinks': song_data['videoLinks'],
-                'links': song_data.get('links', {}),
-                'pdfChecksums': song_data.get('pdfChecksums', {}),
-                'pdfs': song_data['pdfs'],
-                'pdfsTvSize': song_data.get('pdfsTvSize', {}),
-                'status': song_data.get('metadata', {}).get('status', 'completed'),
-            }
-
-            # Snapshots to tell apart content-bearing changes (status + PDFs) from metadata-only changes
-            content_snapshot = {
-                'status': frontend_data['status'],
-                'pdfs': frontend_data['pdfs'],
-                'pdfsTvSize': frontend_data.get('pdfsTvSize', {}),
-                'pdfChecksums': frontend_data.get('pdfChecksums', {}),
-                'links': frontend_data.get('links', {}),
-            }
-
-            existing_updated_at = None
-            existing_synced_at = None
-            existing_content_snapshot = None
-            existing_json = None
-
-            if os.path.exists(filepath):
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        existing_json = json.load(f)
-                        existing_updated_at = existing_json.get('updatedAt')
-                        existing_synced_at = existing_json.get('syncedAt')
-                        existing_content_snapshot = {
-                            'status': existing_json.get('status', 'completed'),
-                            'pdfs': existing_json.get('pdfs', {}),
-                            'pdfsTvSize': existing_json.get('pdfsTvSize', {}),
-                            'pdfChecksums': existing_json.get('pdfChecksums', {}),
-                            'links': existing_json.get('links', {}),
-                        }
-                except Exception as e:
-                    logger.warning(f"Failed to read existing song file for sync preservation: {filepath} ({e})")
-
-            content_changed = True if existing_content_snapshot is None else existing_content_snapshot != content_snapshot
-            
-            # Check if any field in the song data changed for syncedAt - exclude timestamps from comparison
-            data_changed = True if existing_json is None else (
-                {k: v for k, v in frontend_data.items()} != 
-                {k: v for k, v in existing_json.items() if k not in ['syncedAt', 'updatedAt']}
-            )
-
-            # syncedAt: only update if this song's data actually changed (any field, including metadata)
-            if data_changed:
-                frontend_data['syncedAt'] = synced_at_now
-            elif existing_synced_at:
-                frontend_data['syncedAt'] = existing_synced_at
-            else:
-                frontend_data['syncedAt'] = synced_at_now
-
-            # updatedAt: only bump when real content changed (status or PDFs) for showing recent activity
-            if content_changed:
-                frontend_data['updatedAt'] = synced_at_now
-            elif existing_updated_at:
-                frontend_data['updatedAt'] = existing_updated_at
-            else:
-                frontend_data['updatedAt'] = synced_at_now
-            
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                # Pretty-print with indentation and preserve insertion order so
-                # fields appear in the readable order (title, alternativeNames, producer, ...).
-                json.dump(frontend_data, f, ensure_ascii=False, indent=2)
-            
-            logger.info(f"Updated frontend file: {filepath}")
 
         # Remove per-song JSON files that no longer correspond to sheet rows
         if remove_orphans:
             try:
-                existing_jsons = [
-                    f for f in os.listdir(self.frontend_data_dir)
-                    if f.endswith('.json') and f != 'generated-manifest.json'
-                ]
-                for stale_file in existing_jsons:
+                for stale_file in self.existing_catalog():
                     if stale_file not in generated_files:
                         stale_path = os.path.join(self.frontend_data_dir, stale_file)
                         try:
-                            os.remove(stale_path)
+                            self.frontend_files.delete(stale_path)
                             logger.info(f"Deleted removed-song JSON: {stale_file}")
                         except Exception as e:
                             logger.warning(f"Failed to delete removed-song JSON {stale_file}: {e}")
@@ -1155,6 +1055,89 @@ class SongSyncManager:
             # Update the song manifest for the frontend
             self.update_song_manifest(generated_files)
 
+        # The catalog, search and facet indexes cover every song, including the ones a --song-slug run left alone
+        catalog = self._catalog_after_run(grouped_songs, remove_orphans)
+        self.update_catalog_index(catalog)
+        self.update_search_index(catalog)
+        self.update_facet_index(catalog)
+
+    def _catalog_after_run(
+        self, grouped_songs: Dict[str, CatalogSong], remove_orphans: bool
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        The frontend JSON content of every song once this run is done, by filename.
+
+        Args:
+            grouped_songs: the songs processed by this run
+            remove_orphans: whether songs missing from grouped_songs are being removed (full runs). If not, they are
+                kept as they were before the run.
+        """
+        catalog = {} if remove_orphans else dict(self.existing_catalog())
+        for title, song_data in grouped_songs.items():
+            catalog[f"{self.slugify(title)}.json"] = self._frontend_song_data(title, song_data)
+        return catalog
+
+    def _write_song_file(self, title: str, song_data: CatalogSong) -> bool:
+        """Write a song's frontend JSON file, carrying over its timestamps unless its data changed.
+
+        Returns True if the file was written, False if it already held exactly these bytes.
+        """
+        filepath = os.path.join(self.frontend_data_dir, f"{self.slugify(title)}.json")
+        content = self.staged_song_files.get(title) or self._song_file_content(title, song_data)
+        if not self.frontend_files.write(filepath, content):
+            return False
+
+        logger.info(f"Updated frontend file: {filepath}")
+        return True
+
+    def _song_file_content(self, title: str, song_data: CatalogSong) -> bytes:
+        """The bytes of a song's frontend JSON file"""
+        # Pretty-print with indentation and preserve insertion order so
+        # fields appear in the readable order (title, alternativeNames, producer, ...).
+        return json.dumps(self._frontend_song_data(title, song_data), ensure_ascii=False, indent=2).encode('utf-8')
+
+    def _frontend_song_data(self, title: str, song_data: CatalogSong) -> Dict[str, Any]:
+        """A song's full frontend JSON content, with its syncedAt/updatedAt timestamps"""
+        filename = f"{self.slugify(title)}.json"
+        synced_at_now = self.synced_at_now
+
+        frontend_data = song_data.to_frontend_dict()
+
+        # Timestamps are carried over from the file as it was before this run
+        existing_json = self.existing_catalog().get(filename)
+        existing_updated_at = existing_json.get('updatedAt') if existing_json is not None else None
+        existing_synced_at = existing_json.get('syncedAt') if existing_json is not None else None
+
+        # Tell apart content-bearing changes (status + PDFs) from metadata-only changes
+        content_changed = True if existing_json is None else (
+            CatalogSong.content_snapshot_of(existing_json) != song_data.content_snapshot()
+        )
+
+        # Check if any field in the song data changed for syncedAt - exclude timestamps from comparison
+        data_changed = True if existing_json is None else (
+            CatalogSong.canonical_bytes(
+                {k: v for k, v in existing_json.items() if k not in CatalogSong.TIMESTAMP_KEYS}
+            ) != song_data.canonical
+        )
+
+        # syncedAt: only update if this song's data actually changed (any field, including metadata)
+        if data_changed:
+            frontend_data['syncedAt'] = synced_at_now
+        elif existing_synced_at:
+            frontend_data['syncedAt'] = existing_synced_at
+        else:
+            frontend_data['syncedAt'] = synced_at_now
+
+        # updatedAt: only bump when real content changed (status or PDFs) for showing recent activity
+        if content_changed:
+            frontend_data['updatedAt'] = synced_at_now
+        elif existing_updated_at:
+            frontend_data['updatedAt'] = existing_updated_at
+        else:
+            frontend_data['updatedAt'] = synced_at_now
+
+        return frontend_data
+
     def update_song_manifest(self, filenames: List[str]) -> None:
         """Update the TypeScript manifest file with available song files"""
         try:
@@ -1172,52 +1155,111 @@ export const SONG_MANIFEST = [
 
 export type SongFilename = typeof SONG_MANIFEST[number]
 """ % (chr(10).join(f'  {repr(filename)},' for filename in sorted_filenames))
-            
-            with open(manifest_path, 'w', encoding='utf-8') as f:
-                f.write(manifest_content)
-            
-            logger.info(f"Updated song manifest with {len(filenames)} files: {manifest_path}")
+
+            if self.frontend_files.write(manifest_path, manifest_content.encode('utf-8')):
+                logger.info(f"Updated song manifest with {len(filenames)} files: {manifest_path}")
             
         except Exception as e:
             logger.warning(f"Failed to update song manifest: {e}")
 
-        # Also update a small generated-manifest.json that contains the current content hash
+        # Also update a small generated-manifest.json that contains the current content hash and song digests
         # This file is committed and used by the workflow to detect meaningful changes.
         try:
             generated_manifest = {
                 'songs': sorted(filenames),
+                'contentHash': CatalogSong.root_digest(self.song_digests),
+                'songDigests': self.song_digests,
             }
             # Write deterministic JSON
-            os.makedirs(os.path.dirname(self.generated_manifest_path), exist_ok=True)
-            with open(self.generated_manifest_path, 'w', encoding='utf-8') as f:
-                json.dump(generated_manifest, f, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
-            logger.info(f"Wrote generated manifest: {self.generated_manifest_path}")
+            content = json.dumps(generated_manifest, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+            if self.frontend_files.write(self.generated_manifest_path, content.encode('utf-8')):
+                logger.info(f"Wrote generated manifest: {self.generated_manifest_path}")
         except Exception as e:
             logger.warning(f"Failed to write generated manifest: {e}")
 
 
+    def update_catalog_index(self, catalog: Dict[str, Dict[str, Any]]) -> None:
+        """Write the paged summary index of the catalog (see CatalogIndex), removing pages it no longer has
+
+        Args:
+            catalog: the frontend JSON content of every song, by filename (see _catalog_after_run())
+        """
+        try:
+            catalog_index = CatalogIndex()
+            for filename, frontend_data in catalog.items():
+                catalog_index.add(filename, frontend_data)
+            index_files = catalog_index.files()
+
+            written = sum(
+                self.frontend_files.write(os.path.join(self.catalog_index_dir, filename), content)
+                for filename, content in index_files.items()
+            )
+            for filename in os.listdir(self.catalog_index_dir):
+                if CatalogIndex.is_page(filename) and filename not in index_files:
+                    self.frontend_files.delete(os.path.join(self.catalog_index_dir, filename))
+                    logger.info(f"Deleted stale catalog index page: {filename}")
+            logger.info(f"Wrote catalog index: {len(index_files) - 1} pages, {written} changed")
+        except Exception as e:
+            logger.warning(f"Failed to write catalog index: {e}")
+
+    def update_search_index(self, catalog: Dict[str, Dict[str, Any]]) -> None:
+        """Write the search index of the catalog's names (see SearchIndex) next to the catalog index
+
+        Args:
+            catalog: the frontend JSON content of every song, by filename (see _catalog_after_run())
+        """
+        try:
+            search_index = SearchIndex()
+            for filename, frontend_data in catalog.items():
+                search_index.add(filename, frontend_data)
+            search_index_path = os.path.join(self.catalog_index_dir, SearchIndex.FILENAME)
+            if self.frontend_files.write(search_index_path, search_index.to_bytes()):
+                logger.info(f"Wrote search index: {search_index_path}")
+        except Exception as e:
+            logger.warning(f"Failed to write search index: {e}")
+
+    def update_facet_index(self, catalog: Dict[str, Dict[str, Any]]) -> None:
+        """Write the facet counts and song bitsets of the catalog (see FacetIndex) next to the catalog index
+
+        Args:
+            catalog: the frontend JSON content of every song, by filename (see _catalog_after_run())
+        """
+        try:
+            facet_index = FacetIndex()
+            for filename, frontend_data in catalog.items():
+                facet_index.add(filename, frontend_data)
+            facet_index_path = os.path.join(self.catalog_index_dir, FacetIndex.FILENAME)
+            if self.frontend_files.write(facet_index_path, facet_index.to_bytes()):
+                logger.info(f"Wrote facet index: {facet_index_path}")
+        except Exception as e:
+            logger.warning(f"Failed to write facet index: {e}")
+
+    def setup_drive_index(self) -> None:
+        """
+        Brings the local mirror of the chart folders up to date (building it on the first run or when forced) so song
+        lookups are answered locally. If that fails, lookups simply keep going to Drive.
+        """
+        if not self.use_drive_index:
+            return
+        try:
+            drive_index = DriveIndex()
+            if self.force_sync:
+                drive_index.build(self.session, pathlib.Path(SongDataAccess.CHART_BASE_DIR))
+            else:
+                drive_index.build_or_refresh(self.session, pathlib.Path(SongDataAccess.CHART_BASE_DIR))
+            self.session.set_drive_index(drive_index)
+        except Exception as e:
+            logger.warning(f"Drive index unavailable, querying Drive directly: {e}")
+
     def get_remote_sheet_modified_time(self) -> Optional[str]:
         """Fetch the remote spreadsheet's modifiedTime from the Drive API."""
+        if not self.spreadsheet_id:
+            return None
         try:
-            # Use the gspread client's credentials to get an access token
-            client = self.sheet.spreadsheet.client
-            credentials = client.auth
-
-            # Ensure token is fresh
-            import requests as _req
-            if hasattr(credentials, 'token') and hasattr(credentials, 'refresh'):
-                if getattr(credentials, 'expired', False):
-                    credentials.refresh(_req.Request())
-
-            access_token = getattr(credentials, 'token', None)
-            if not access_token:
-                return None
-
             drive_url = f"https://www.googleapis.com/drive/v3/files/{self.spreadsheet_id}"
             params = {'fields': 'modifiedTime'}
-            headers = {'Authorization': f'Bearer {access_token}'}
 
-            r = _req.get(drive_url, params=params, headers=headers, timeout=10)
+            r = self.http.get(drive_url, params=params, timeout=10)
             r.raise_for_status()
             data = r.json()
             return data.get('modifiedTime')
@@ -1225,6 +1267,52 @@ export type SongFilename = typeof SONG_MANIFEST[number]
             logger.warning(f"Unable to fetch remote sheet modified time: {e}")
             return None
 
+    def get_newest_drive_modified_time(self, last_state: Dict[str, Any]) -> Optional[str]:
+        """Fetch the newest modifiedTime of anything in the chart folders (as of the last run) or directly in Lead Sheets."""
+        try:
+            folder_ids = [self.session.find_drive_id_by_dir(pathlib.Path(SongDataAccess.CHART_BASE_DIR))]
+            folder_ids.extend(last_state.get('driveFolderIndex', {}).keys())
+            return self.session.newest_modified_time(folder_ids)
+        except Exception as e:
+            logger.warning(f"Unable to fetch newest chart folder modified time: {e}")
+            return None
+
+    def list_drive_changes_since(self, last_state: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Fetch the Drive changes since the last run's changes token, taking this run's token from the same listing.
+
+        Returns None if there's no saved token or the changes could not be listed.
+        """
+        page_token = last_state.get('changesPageToken')
+        if not page_token:
+            return None
+        try:
+            changes, self.changes_page_token = self.session.list_changes(page_token)
+            return changes
+        except Exception as e:
+            logger.warning(f"Unable to list Drive changes since the last sync: {e}")
+            return None
+
+    def _songs_touched_by_changes(self, last_state: Dict[str, Any]) -> Dict[str, Set[str]]:
+        """Slugs of the songs (and the keys of them) which self.drive_changes touch, going by last run's Drive IDs"""
+        return map_changes_to_songs(
+            self.drive_changes or [],
+            last_state.get('driveFileIndex', {}),
+            last_state.get('driveFolderIndex', {}),
+            last_state.get('songBasenames', {}),
+        )
+
+    def _unchanged_since(self, last_state: Dict[str, Any]) -> bool:
+        """Whether neither the spreadsheet nor any song's charts were modified since the last run.
+
+        The chart folders' newest modifiedTime misses charts linked from outside of them and files moved or copied into
+        them (which keep their modifiedTime), so the Drive changes since the last run must not touch any song either.
+        """
+        if not self.sheet_modified_time or self.sheet_modified_time != last_state.get('sheetModifiedTime'):
+            return False
+        if not self.drive_modified_time or self.drive_modified_time != last_state.get('driveModifiedTime'):
+            return False
+        return self.drive_changes is not None and not self._songs_touched_by_changes(last_state)
+
     def read_generated_manifest(self) -> Dict[str, Any]:
         """Read the persisted generated-manifest.json (if present) to obtain previous songs listing/hash."""
         try:
@@ -1235,7 +1323,7 @@ export type SongFilename = typeof SONG_MANIFEST[number]
             logger.warning(f"Failed to read generated manifest: {e}")
         return {}
 
-    def save_sync_state(self, content_hash: str = '', total_songs: int = 0, forced: bool = False, changes_written: bool = False) -> None:
+    def save_sync_state(self, content_hash: str = '', total_songs: int = 0, forced: bool = False, changes_written: bool = False, song_slug: str = None) -> None:
         """Save current sync state to .sync_state.json (not committed)."""
         existing_state = self.get_sync_state()
 
@@ -1243,14 +1331,130 @@ export type SongFilename = typeof SONG_MANIFEST[number]
             'lastCheck': datetime.now().isoformat(),
             'lastSync': datetime.now().isoformat() if changes_written else existing_state.get('lastSync', datetime.now().isoformat()),
             'contentHash': content_hash,
+            'songDigests': self.song_digests,
             'totalSongs': total_songs,
             'forcedSync': forced
         }
+        state.update(self._drive_tracking_state(existing_state, song_slug))
 
         with open(self.sync_state_file, 'w') as f:
             json.dump(state, f, indent=2)
         logger.info(f"Updated sync state: content_hash={content_hash[:8]}...")
 
+    def _drive_tracking_state(self, existing_state: Dict[str, Any], song_slug: str = None) -> Dict[str, Any]:
+        """Build the Drive change tracking part of the sync state.
+
+        Index entries are only carried over from the previous state for songs which weren't processed this run (the
+        other songs of a --song-slug run, or the reused songs of an incremental run). A --song-slug run also keeps the
+        previous changes token, sheet and chart folder modifiedTimes and row hashes of the other songs, since changes to them haven't been
+        picked up yet. A run in which songs failed keeps the previous changes token too, but saves no modifiedTimes
+        and forgets the failed songs' row hashes, so the next run can't be skipped and processes them again.
+        """
+        if song_slug is not None:
+            keep_slugs = lambda slug: slug != song_slug
+            page_token = existing_state.get('changesPageToken')
+            sheet_modified_time = existing_state.get('sheetModifiedTime')
+            drive_modified_time = existing_state.get('driveModifiedTime')
+            row_hashes = {
+                key: {
+                    **{k: v for k, v in existing_state.get('rowHashes', {}).get(key, {}).items() if k != song_slug},
+                    **{k: v for k, v in self.row_hashes.get(key, {}).items() if k == song_slug},
+                }
+                for key in ('songs', 'tvSize')
+            }
+        else:
+            reused_slugs = {self.slugify(title) for title in self.reused_songs}
+            keep_slugs = lambda slug: slug in reused_slugs
+            page_token = self.changes_page_token
+            sheet_modified_time = self.sheet_modified_time
+            drive_modified_time = self.drive_modified_time
+            row_hashes = self.row_hashes
+            if self.failed_songs:
+                failed_slugs = {self.slugify(title) for title in self.failed_songs}
+                page_token = existing_state.get('changesPageToken')
+                # Without modifiedTimes the next run's preflight can't skip it
+                sheet_modified_time = None
+                drive_modified_time = None
+                row_hashes = {
+                    key: {slug: digest for slug, digest in hashes.items() if slug not in failed_slugs}
+                    for key, hashes in self.row_hashes.items()
+                }
+
+        file_index = {k: v for k, v in existing_state.get('driveFileIndex', {}).items() if keep_slugs(v['slug'])}
+        file_index.update(self.drive_file_index)
+        folder_index = {k: v for k, v in existing_state.get('driveFolderIndex', {}).items() if keep_slugs(v)}
+        folder_index.update(self.drive_folder_index)
+        basenames = {k: v for k, v in existing_state.get('songBasenames', {}).items() if keep_slugs(v)}
+        basenames.update(self.song_basenames)
+
+        return {
+            'changesPageToken': page_token,
+            'sheetModifiedTime': sheet_modified_time,
+            'driveModifiedTime': drive_modified_time,
+            'driveFileIndex': file_index,
+            'driveFolderIndex': folder_index,
+            'songBasenames': basenames,
+            'rowHashes': row_hashes,
+        }
+
+    def _affected_songs_since(self, last_state: Dict[str, Any]) -> Optional[Set[str]]:
+        """Work out which songs were touched by Drive changes or sheet edits since the last run.
+
+        Sheet edits are found by comparing each song's row hashes with the ones saved last run, so editing one row only
+        reprocesses that song.
+
+        Returns the set of affected song slugs, or None if a full sync is needed instead (no saved changes token, the
+        spreadsheet changed but there are no saved row hashes to compare against, or the changes could not be listed).
+        """
+        if not last_state.get('changesPageToken'):
+            logger.info("No Drive changes token saved yet, running a full sync")
+            return None
+
+        sheet_changed = not self.sheet_modified_time or self.sheet_modified_time != last_state.get('sheetModifiedTime')
+        if sheet_changed and 'rowHashes' not in last_state:
+            logger.info("Spreadsheet changed since the last run and no row hashes are saved yet, running a full sync")
+            return None
+
+        if self.drive_changes is None:
+            logger.warning("Drive changes could not be listed, running a full sync")
+            return None
+
+        affected = self._songs_touched_by_changes(last_state)
+        for slug, keys in sorted(affected.items()):
+            logger.info(f"Drive changes affect '{slug}': {', '.join(sorted(keys))}")
+        logger.info(f"Incremental sync: {len(self.drive_changes)} Drive change(s) affect {len(affected)} song(s)")
+
+        edited = self._changed_rows_since(last_state) if sheet_changed else set()
+        for slug in sorted(edited):
+            logger.info(f"Sheet rows changed for '{slug}'")
+        logger.info(f"Incremental sync: {len(edited)} song(s) have edited sheet rows")
+        return set(affected) | edited
+
+    def _compute_row_hashes(self) -> Dict[str, Dict[str, str]]:
+        """Hash every song's rows in the main and TV size worksheets (songs spanning several rows get one hash)"""
+        row_hashes = {}
+        for key, title in (('songs', self.worksheet_title), ('tvSize', SongSyncManager.TV_SIZE_WORKSHEET)):
+            rows_by_slug: Dict[str, List[str]] = {}
+            for row in self.worksheet_rows.get(title, []):
+                song_name = str(row.get('Song Name', '')).strip()
+                if song_name:
+                    rows_by_slug.setdefault(self.slugify(song_name), []).append(row.content_hash())
+            row_hashes[key] = {
+                slug: hashlib.sha256(''.join(hashes).encode()).hexdigest() for slug, hashes in rows_by_slug.items()
+            }
+        return row_hashes
+
+    def _changed_rows_since(self, last_state: Dict[str, Any]) -> Set[str]:
+        """Slugs of the songs whose main or TV size sheet rows were added, edited or removed since the last run"""
+        previous = last_state.get('rowHashes', {})
+        changed = set()
+        for key, hashes in self.row_hashes.items():
+            previous_hashes = previous.get(key, {})
+            changed.update(
+                slug for slug in hashes.keys() | previous_hashes.keys() if hashes.get(slug) != previous_hashes.get(slug)
+            )
+        return changed
+
     def get_sync_state(self) -> Dict[str, Any]:
         """Get last sync state"""
         if os.path.exists(self.sync_state_file):
@@ -1263,102 +1467,124 @@ export type SongFilename = typeof SONG_MANIFEST[number]
         songs_str = json.dumps(songs, sort_keys=True)
         return hashlib.md5(songs_str.encode()).hexdigest()
 
-    def calculate_content_hash(self, grouped_songs: Dict[str, Dict[str, Any]]) -> str:
-        """Calculate deterministic hash of the content that would be written to disk"""
-        # Create a deterministic representation of all files that would be written
-        content_dict = {}
-        for title, song_data in sorted(grouped_songs.items()):
-            filename = f"{self.slugify(title)}.json"
-            frontend_data = {
-                'title': song_data['title'],
-                'alternativeNames': song_data.get('alternativeNames', []),
-                'producer': song_data['producer'],
-                'additionalProducers': song_data.get('additionalProducers', []),
-                'singer': song_data['singer'],
-                'additionalVoices': song_data.get('additionalVoices', []),
-                'releaseDate': song_data['releaseDate'],
-                'length': song_data.get('length', ''),
-                'tvSizeLength': song_data.get('tvSizeLength', ''),
-                'bpm': song_data.get('bpm'),
-                'labels': song_data.get('labels', []),
-                'transcriber': song_data.get('transcriber', ''),
-                'videoLinks': song_data['videoLinks'],
-                'links': song_data.get('links', {}),
-                'pdfChecksums': song_data.get('pdfChecksums', {}),
-                'pdfs': song_data['pdfs'],
-                'pdfsTvSize': song_data.get('pdfsTvSize', {}),
-                'status': song_data.get('metadata', {}).get('status', 'completed')
-            }
-            content_dict[filename] = frontend_data
-        
-        # Generate deterministic JSON and hash it
-        content_json = json.dumps(content_dict, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
-        return hashlib.sha256(content_json.encode()).hexdigest()
+    def calculate_song_digests(
+        self, grouped_songs: Dict[str, CatalogSong], previous_digests: Dict[str, str], song_slug: str = None
+    ) -> Dict[str, str]:
+        """Digest of every song's content by filename, as it would be written to disk.
 
-    def calculate_hash_from_existing_files(self) -> Optional[str]:
-        """Calculate hash from files already committed to the repo (for bootstrap)"""
-        try:
-            if not os.path.exists(self.frontend_data_dir):
-                return None
-            
-            # Read all existing JSON files
-            content_dict = {}
-            json_files = [f for f in os.listdir(self.frontend_data_dir) if f.endswith('.json') and f != 'generated-manifest.json']
-            
-            if not json_files:
-                return None
-            
-            for filename in sorted(json_files):
-                filepath = os.path.join(self.frontend_data_dir, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        content_dict[filename] = json.load(f)
-                except Exception as e:
-                    logger.warning(f"Failed to read {filename} for hash: {e}")
-                    return None
-            
-            # Generate same deterministic hash as calculate_content_hash
-            content_json = json.dumps(content_dict, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
-            return hashlib.sha256(content_json.encode()).hexdigest()
-            
-        except Exception as e:
-            logger.warning(f"Failed to calculate hash from existing files: {e}")
-            return None
+        A --song-slug run only processes one song, so the digests of the other songs are carried over from the last
+        sync and the content hash still covers the whole catalog.
+        """
+        song_digests = dict(previous_digests) if song_slug is not None else {}
+        song_digests.update({f"{self.slugify(title)}.json": song.digest for title, song in grouped_songs.items()})
+        return song_digests
+
+    def calculate_content_hash(self, song_digests: Dict[str, str]) -> str:
+        """Calculate deterministic hash of the content that would be written to disk, from the song digests alone"""
+        return CatalogSong.root_digest(song_digests)
+
+    def get_previous_song_digests(self, last_state: Dict[str, Any]) -> tuple[str, Dict[str, str]]:
+        """Content hash and song digests of the last sync.
+
+        They're saved in the sync state, and in the committed generated-manifest.json as of the last full sync, which
+        stands in for the sync state when the Actions cache misses it, so the existing files are never re-read to hash
+        them.
+        """
+        if 'songDigests' in last_state:
+            return last_state.get('contentHash', ''), last_state['songDigests']
+        generated_manifest = self.read_generated_manifest()
+        if 'songDigests' in generated_manifest:
+            logger.info("No song digests in the sync state, using the ones from the generated manifest")
+            return generated_manifest.get('contentHash', ''), generated_manifest['songDigests']
+        return last_state.get('contentHash', ''), {}
+
+    @staticmethod
+    def _changed_songs(previous_digests: Dict[str, str], song_digests: Dict[str, str]) -> Dict[str, List[str]]:
+        """Filenames of the songs added, updated and removed since the last sync, going by their digests"""
+        return {
+            'added': sorted(f for f in song_digests if f not in previous_digests),
+            'updated': sorted(
+                f for f in song_digests if f in previous_digests and previous_digests[f] != song_digests[f]
+            ),
+            'removed': sorted(f for f in previous_digests if f not in song_digests),
+        }
 
     def sync(self, song_slug: str = None, check_only: bool = False) -> bool:
         """Main sync function. Returns True if content changed (commit needed), False if no changes."""
         try:
             logger.info("Starting Google Sheet sync...")
 
+            last_state = self.get_sync_state()
+            old_content_hash, old_song_digests = self.get_previous_song_digests(last_state)
+
+            # Preflight: note when the sheet and chart folders last changed and list the Drive changes since the last sync
+            # before reading anything (so changes made during this run show up next run), and stop right here if none of
+            # them touch any song
+            if song_slug is None:
+                self.spreadsheet_id = os.environ.get('GOOGLE_SHEET_ID')
+                self.sheet_modified_time = self.get_remote_sheet_modified_time()
+                self.drive_modified_time = self.get_newest_drive_modified_time(last_state)
+                self.drive_changes = self.list_drive_changes_since(last_state)
+                if not (self.force_sync or self.rehash or check_only) and self._unchanged_since(last_state):
+                    logger.info("Sheet and chart folders unchanged since the last sync. Nothing to do.")
+                    return False
+
             # Set up connection
             self.setup_google_sheets()
             self.downloads_performed = False
+            self.setup_drive_index()
+            self.row_hashes = self._compute_row_hashes()
 
-            last_state = self.get_sync_state()
-            old_content_hash = last_state.get('contentHash', '')
-
-            # Fetch and process data (always compute full state, including Drive md5 checksums)
-            songs = self.fetch_accepted_songs(song_slug)
-            tv_size_pdfs = self.fetch_tv_size_sheets(song_slug)
-            if not songs:
+            # Take the changes token before reading from Drive, so changes made during this run show up next run (unless
+            # the preflight's listing of the changes already took it)
+            if song_slug is None and self.changes_page_token is None:
+                try:
+                    self.changes_page_token = self.session.get_changes_start_page_token()
+                except Exception as e:
+                    logger.warning(f"Failed to fetch Drive changes token, next run will be a full sync: {e}")
+
+            only_slugs = None
+            # Re-hashing every PDF means looking at every song, as does a forced sync
+            if self.incremental and song_slug is None and not (self.force_sync or self.rehash):
+                only_slugs = self._affected_songs_since(last_state)
+
+            # Fetch and process data (computes full state for every song not reused by an incremental sync), writing each
+            # song's JSON as soon as it is finished
+            grouped_songs = self.process_songs(song_slug, only_slugs, stage_files=not check_only)
+            if self.failed_songs:
+                logger.warning(
+                    f"{len(self.failed_songs)} song(s) failed and will be processed again next run: "
+                    f"{', '.join(sorted(self.failed_songs))}"
+                )
+            if not grouped_songs and not self.reused_songs:
                 logger.warning("No songs detected. Giving up on sync!")
                 return False
 
-            grouped_songs = self.group_and_merge_songs(songs, tv_size_pdfs)
-            new_content_hash = self.calculate_content_hash(grouped_songs)
+            grouped_songs.update(self.reused_songs)
+            self.song_digests = self.calculate_song_digests(grouped_songs, old_song_digests, song_slug)
+            new_content_hash = self.calculate_content_hash(self.song_digests)
+            changed_songs = self._changed_songs(old_song_digests, self.song_digests)
+            for change, filenames in changed_songs.items():
+                if filenames:
+                    logger.info(f"Songs {change}: {', '.join(filenames)}")
 
             if check_only:
-                result = {'previousHash': old_cotent_hash, 'currentHash': new_cotent_hash, 'status': status}
+                status = 'unchanged' if new_content_hash == old_content_hash else 'changed'
+                result = {
+                    'previousHash': old_content_hash, 'currentHash': new_content_hash, 'status': status,
+                    'changedSongs': changed_songs,
+                }
                 print(json.dumps(result, ensure_ascii=False))
-                return
+                return status == 'changed'
 
             if not self.force_sync and new_content_hash == old_content_hash and not self.downloads_performed:
                 logger.info("Content (including PDF md5) unchanged. Skipping writes.")
                 self.save_sync_state(
                     content_hash=new_content_hash,
-                    total_songs=len(songs),
+                    total_songs=len(grouped_songs),
                     forced=False,
-                    changes_written=False
+                    changes_written=False,
+                    song_slug=song_slug
                 )
                 return False
 
@@ -1372,9 +1598,10 @@ export type SongFilename = typeof SONG_MANIFEST[number]
             self.update_frontend_files(grouped_songs, remove_orphans=(song_slug is None))
             self.save_sync_state(
                 content_hash=new_content_hash,
-                total_songs=len(songs),
+                total_songs=len(grouped_songs),
                 forced=self.force_sync,
-                changes_written=True
+                changes_written=True,
+                song_slug=song_slug
             )
             
             logger.info(f"✅ Sync completed! {len(grouped_songs)} songs written. Commit required.")
@@ -1383,6 +1610,8 @@ export type SongFilename = typeof SONG_MANIFEST[number]
         except Exception as e:
             logger.error(f"Sync failed: {e}")
             raise
+        finally:
+            self.checksum_index.save()
 
 def main():
     """Main entry point"""
@@ -1399,15 +1628,47 @@ def main():
         default=None,
         help='If specified, only synchronizes a song which matches the corresponding song slug'
     )
+    parser.add_argument(
+        '--incremental', '-i',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='Only reprocess songs touched by Drive changes or sheet edits since the last run (the default; falls back '
+             'to a full sync when needed, and --force or --no-incremental always reprocess every song)'
+    )
     parser.add_argument(
         '--check-only',
         action='store_true',
         help='Compute current content hash (including PDF md5) and exit without writing files'
     )
+    parser.add_argument(
+        '--http-report',
+        default=None,
+        help='Where to write the JSON report of HTTP calls made during the run (default: http_report.json in the cache dir)'
+    )
+    parser.add_argument(
+        '--rehash',
+        action='store_true',
+        help='Re-read and re-hash every local PDF instead of trusting the checksum index'
+    )
+    parser.add_argument(
+        '--no-drive-index',
+        action='store_true',
+        help='Query Drive directly instead of through the local mirror of the chart folders'
+    )
 
     args = parser.parse_args()
-    sync_manager = SongSyncManager(force_sync=args.force)
-    has_changes = sync_manager.sync(args.song_slug, args.check_only)
+    try:
+        sync_manager = SongSyncManager(
+            force_sync=args.force, incremental=args.incremental, use_drive_index=not args.no_drive_index,
+            rehash=args.rehash
+        )
+        has_changes = sync_manager.sync(args.song_slug, args.check_only)
+    finally:
+        # A report that can't be written must not mask whatever ended the run
+        try:
+            get_http_metrics().write_report(args.http_report or env_config.get_cache_dir() / 'http_report.json')
+        except Exception as e:
+            logger.warning(f"Unable to write the HTTP report: {e}")
 
     # Output result for GitHub Actions to capture
     if args.check_only:
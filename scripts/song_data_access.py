@@ -1,12 +1,25 @@
 from gdrive_session import GDriveSession
 
 import os
+import re
 import enum
 import pathlib
+import collections
+import unicodedata
+
+from typing import Iterable
+
+def normalize_name(text: str) -> str:
+    """
+    Normalizes a song, producer or file name for matching: NFKC (so full-width and compatibility characters match their
+    plain forms), casefolded, with runs of whitespace collapsed to single spaces.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
 
 class SongRecord:
     def __init__(self, name: str):
         self.name = name
+        self.folder_id = None
         self.pdfs_full = {}
         self.pdfs_tv = {}
 
@@ -26,6 +39,14 @@ class SongDataAccess:
     CHART_BASE_DIR = "Lead Sheets"
     TRANSCRIPTIONS = ['Vocals', 'Bb', 'C', 'Eb', 'F', 'G', 'Alto', 'Bass']
 
+    # Matches a normalized "{producer} - {song name}-{key}.pdf" or "{producer} - {song name} - TV-{key}.pdf", tolerating
+    # whitespace around the separators
+    NORMALIZED_CHART_PATTERN = re.compile(
+        r"^(?P<basename>.+?)(?P<tv> ?- ?tv)? ?- ?(?P<key>"
+        + "|".join(re.escape(normalize_name(key)) for key in TRANSCRIPTIONS)
+        + r") ?\.pdf$"
+    )
+
     def __init__(self, session: GDriveSession):
         self._session = session
 
@@ -34,17 +55,113 @@ class SongDataAccess:
         song_file_basename = f"{song_producer} - {song_name}"
         full_chart_dir = os.path.join(self.CHART_BASE_DIR, song_file_basename)
 
-        file_drive_ids = self._session.find_files_in_dir(pathlib.Path(full_chart_dir))
-        filename_to_meta = {song["name"] : song for song in file_drive_ids}
+        try:
+            file_drive_ids = self._session.find_files_in_dir(pathlib.Path(full_chart_dir))
+        except ValueError:
+            # The folder name may only differ from the sheet in case, whitespace or Unicode form
+            base_dir_id = self._session.find_drive_id_by_dir(pathlib.Path(self.CHART_BASE_DIR))
+            song_folders = self._session.find_all_files_in(base_dir_id, GDriveSession.MIME_TYPE_DRIVE_FOLDER)
+            folder_id = SongDataAccess.index_by_normalized_name(song_folders).get(normalize_name(song_file_basename))
+            if folder_id is None:
+                raise
+            file_drive_ids = self._session.find_all_files_in(folder_id)
+        return self._build_record(song_name, song_producer, file_drive_ids)
+
+    @staticmethod
+    def index_by_normalized_name(files: list[dict]) -> dict[str, str]:
+        """Maps the normalized name of each file to its Drive ID (the first one, if several normalize the same)"""
+        index = {}
+        for file in files:
+            index.setdefault(normalize_name(file["name"]), file["id"])
+        return index
+
+    @staticmethod
+    def parse_chart_filename(filename: str) -> tuple[str, str, bool] | None:
+        """
+        Splits a chart PDF filename into its parts, tolerating case, whitespace and Unicode form differences.
+
+        Returns:
+            a tuple of (normalized "{producer} - {song name}", key as spelled in TRANSCRIPTIONS, is_tv_size), or None if
+            the filename isn't a chart
+        """
+        match = SongDataAccess.NORMALIZED_CHART_PATTERN.match(normalize_name(filename))
+        if not match:
+            return None
+        key = next(key for key in SongDataAccess.TRANSCRIPTIONS if normalize_name(key) == match["key"])
+        return match["basename"], key, bool(match["tv"])
+
+    def get_records_bulk(self, songs: Iterable[tuple[str, str]]) -> dict[tuple[str, str], SongRecord]:
+        """
+        Resolves the song records for many songs at once. Rather than walking to and listing each song's folder
+        separately, this lists the song folders under CHART_BASE_DIR once and then lists the PDFs of all of them with
+        a handful of multi-folder queries.
+
+        Args:
+            songs: (song name, song producer) pairs to resolve
+
+        Returns:
+            a dictionary mapping each (song name, song producer) pair to its SongRecord. Songs without a chart folder in
+            the drive are left out, the same way get_record_by_attrs() raises ValueError for them.
+        """
+        songs = list(dict.fromkeys(songs))
+
+        base_dir_id = self._session.find_drive_id_by_dir(pathlib.Path(self.CHART_BASE_DIR))
+        song_folders = self._session.find_all_files_in(base_dir_id, GDriveSession.MIME_TYPE_DRIVE_FOLDER)
+        folder_name_to_id = {folder["name"]: folder["id"] for folder in song_folders}
+        normalized_folder_name_to_id = SongDataAccess.index_by_normalized_name(song_folders)
+
+        song_folder_ids = {}
+        for song_name, song_producer in songs:
+            basename = f"{song_producer} - {song_name}"
+            folder_id = folder_name_to_id.get(basename) or normalized_folder_name_to_id.get(normalize_name(basename))
+            if folder_id:
+                song_folder_ids[(song_name, song_producer)] = folder_id
+
+        pdfs_by_folder = collections.defaultdict(list)
+        for pdf in self._session.find_all_files_in_many(song_folder_ids.values(), GDriveSession.MIME_TYPE_PDF):
+            for parent_id in pdf.get("parents", []):
+                pdfs_by_folder[parent_id].append(pdf)
+
+        return {
+            (song_name, song_producer): self._build_record(
+                song_name, song_producer, pdfs_by_folder[folder_id], folder_id
+            )
+            for (song_name, song_producer), folder_id in song_folder_ids.items()
+        }
+
+    def _build_record(
+        self, song_name: str, song_producer: str, files: list[dict], folder_id: str | None = None
+    ) -> SongRecord:
+        """
+        Builds a SongRecord out of the GDrive metadata of the files in a song's chart folder.
+
+        Charts are matched on their exact filename first, then on their normalized filename, so charts whose names
+        differ from the sheet only in case, whitespace or Unicode form are still found.
+        """
+        song_file_basename = f"{song_producer} - {song_name}"
+        filename_to_meta = {song["name"] : song for song in files}
+
+        normalized_basename = normalize_name(song_file_basename)
+        normalized_charts = {}
+        for meta in files:
+            parsed = SongDataAccess.parse_chart_filename(meta["name"])
+            if parsed and parsed[0] == normalized_basename:
+                normalized_charts.setdefault((parsed[1], parsed[2]), meta)
+
         record = SongRecord(song_name)
+        record.folder_id = folder_id
         for transcription in self.TRANSCRIPTIONS:
             song_filename = f"{song_file_basename}-{transcription}.pdf"
             if song_filename in filename_to_meta.keys():
                 record.pdfs_full[transcription] = filename_to_meta[song_filename]
+            elif (transcription, False) in normalized_charts:
+                record.pdfs_full[transcription] = normalized_charts[(transcription, False)]
 
             song_filename = f"{song_file_basename} - TV-{transcription}.pdf"
             if song_filename in filename_to_meta.keys():
                 record.pdfs_tv[transcription] = filename_to_meta[song_filename]
+            elif (transcription, True) in normalized_charts:
+                record.pdfs_tv[transcription] = normalized_charts[(transcription, True)]
 
         record.pdfs_full = {k: v for k, v in record.pdfs_full.items() if v}
         record.pdfs_tv = {k: v for k, v in record.pdfs_tv.items() if v}
@@ -56,10 +173,18 @@ def main():
     parser = argparse.ArgumentParser("SongDataAccess direct query tool")
     parser.add_argument("-n", "--name", help="Song Name", required=True)
     parser.add_argument("-p", "--producer", help="Song Producer", required=True)
+    parser.add_argument(
+        "--local", action="store_true", help="Answer from the local Drive index (refreshing it first) instead of live"
+    )
 
     args = vars(parser.parse_args())
 
     session = GDriveSession()
+    if args["local"]:
+        from drive_index import DriveIndex
+        drive_index = DriveIndex()
+        drive_index.build_or_refresh(session, pathlib.Path(SongDataAccess.CHART_BASE_DIR))
+        session.set_drive_index(drive_index)
     data_access = SongDataAccess(session)
     record = data_access.get_record_by_attrs(args["name"], args["producer"])
 
@@ -0,0 +1,36 @@
+import pytest
+import requests
+import google.auth.credentials
+
+import env_config
+import http_metrics as http_metrics_module
+from fake_google import FakeGoogleApi
+
+@pytest.fixture(autouse=True)
+def isolated_env(tmp_path, monkeypatch):
+    """Keeps every test's caches in its own directory, and out of the real Google credentials"""
+    monkeypatch.setenv("PVLS_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("GOOGLE_DRIVE_ID", "drive-root")
+    monkeypatch.setattr(env_config, "get_shared_credentials", google.auth.credentials.AnonymousCredentials)
+
+@pytest.fixture
+def fake_api() -> FakeGoogleApi:
+    return FakeGoogleApi()
+
+@pytest.fixture
+def http_metrics(monkeypatch) -> http_metrics_module.HttpMetrics:
+    """A fresh run-wide HttpMetrics for the test"""
+    metrics = http_metrics_module.HttpMetrics()
+    monkeypatch.setattr(http_metrics_module, "_http_metrics", metrics)
+    return metrics
+
+@pytest.fixture
+def google_api(fake_api, monkeypatch) -> FakeGoogleApi:
+    """
+    fake_api plugged in underneath every requests transport, so sessions keep their own adapters (rate limiting,
+    metrics) and only the network is faked
+    """
+    monkeypatch.setattr(
+        requests.adapters.HTTPAdapter, "send", lambda adapter, request, **kwargs: fake_api.send(request, **kwargs)
+    )
+    return fake_api
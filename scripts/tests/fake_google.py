@@ -0,0 +1,143 @@
+import io
+import json
+import re
+import requests
+import urllib.parse
+
+from typing import Any, Callable
+
+class FakeGoogleApi(requests.adapters.BaseAdapter):
+    """
+    Stand-in for Google's HTTP APIs: a requests transport adapter which answers requests from registered handlers
+    instead of the network. Mount it on a session (session.mount("https://", fake)) and register a handler per path.
+
+    Every request is kept in `requests`, so tests can check what was sent.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.requests: list[requests.PreparedRequest] = []
+        self._handlers: dict[tuple[str, str], Callable[[requests.PreparedRequest, dict[str, str]], Any]] = {}
+
+    def route(self, method: str, path: str, handler: Callable[[requests.PreparedRequest, dict[str, str]], Any]) -> None:
+        """
+        Registers handler for requests to path (on any host). The handler gets the request and its query parameters
+        and returns either a JSON-serializable payload (sent with a 200), a (status, payload) tuple, or a (status,
+        payload, headers) tuple. Payloads given as bytes are sent as they are.
+        """
+        self._handlers[(method.upper(), path)] = handler
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        self.requests.append(request)
+        parsed = urllib.parse.urlsplit(request.url)
+        params = {key: values[-1] for key, values in urllib.parse.parse_qs(parsed.query).items()}
+
+        handler = self._handlers.get((request.method, parsed.path))
+        headers = {}
+        if handler is None:
+            status, payload = 404, {"error": {"code": 404, "message": f"No fake for {request.method} {parsed.path}"}}
+        else:
+            result = handler(request, params)
+            if not isinstance(result, tuple):
+                status, payload = 200, result
+            elif len(result) == 3:
+                status, payload, headers = result
+            else:
+                status, payload = result
+
+        response = requests.Response()
+        response.status_code = status
+        response._content = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        response.raw = io.BytesIO(response._content)
+        response.headers["Content-Type"] = "application/json"
+        response.headers["Content-Length"] = str(len(response._content))
+        response.headers.update(headers)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+class FakeDriveChanges:
+    """
+    In-memory Drive changes log served like the real changes endpoint: changes/startPageToken returns a token for
+    "now", and changes.list returns what was logged since a token, page_size changes at a time, with a nextPageToken
+    on every page but the last one, which carries the newStartPageToken instead.
+    """
+    CHANGES_PATH = "/drive/v3/changes"
+
+    def __init__(self, api: FakeGoogleApi, page_size: int = 2):
+        self.changes: list[dict] = []
+        self.page_size = page_size
+        api.route("GET", f"{FakeDriveChanges.CHANGES_PATH}/startPageToken", self._start_page_token)
+        api.route("GET", FakeDriveChanges.CHANGES_PATH, self._list)
+
+    def log(self, file_id: str, removed: bool = False, **file_meta) -> None:
+        """Logs a change to file_id, whose metadata (if it wasn't removed) is file_meta"""
+        change = {"fileId": file_id, "removed": removed}
+        if not removed:
+            change["file"] = {"id": file_id, **file_meta}
+        self.changes.append(change)
+
+    def _start_page_token(self, request, params) -> dict:
+        return {"startPageToken": str(len(self.changes))}
+
+    def _list(self, request, params):
+        if "pageToken" not in params or not params["pageToken"].isdigit():
+            return 400, {"error": {"code": 400, "message": "Invalid pageToken"}}
+
+        start = int(params["pageToken"])
+        page = self.changes[start:start + self.page_size]
+        end = start + len(page)
+        if end < len(self.changes):
+            return {"changes": page, "nextPageToken": str(end)}
+        return {"changes": page, "newStartPageToken": str(end)}
+
+class FakeDriveFiles:
+    """
+    In-memory Drive tree served like the real files.list endpoint, for the queries the sync makes: "'<id>' in parents"
+    clauses (OR'ed together), optionally narrowed by name and mimeType, and optionally ordered by newest modifiedTime.
+    Results come pageSize files at a time (or page_size, if smaller) with a nextPageToken on every page but the last.
+    Like the real API, each file only carries the fields asked for in the files(...) part of the fields parameter.
+    """
+    FILES_PATH = "/drive/v3/files"
+
+    _PARENT_CLAUSE = re.compile(r"'((?:[^'\\]|\\.)*)' in parents")
+    _EQUALS_CLAUSE = re.compile(r"\b(name|mimeType)\s*=\s*'((?:[^'\\]|\\.)*)'")
+    _FILE_FIELDS = re.compile(r"files\(([^)]*)\)")
+
+    def __init__(self, api: FakeGoogleApi, page_size: int | None = None):
+        self.files: dict[str, dict] = {}
+        self.page_size = page_size
+        api.route("GET", FakeDriveFiles.FILES_PATH, self._list)
+
+    def add(self, file_id: str, name: str, parent: str, **file_meta) -> dict:
+        """Adds a file (or folder, given mimeType) named name inside parent, with the rest of its metadata"""
+        self.files[file_id] = {"id": file_id, "name": name, "parents": [parent], **file_meta}
+        return self.files[file_id]
+
+    @staticmethod
+    def _unescape(value: str) -> str:
+        return re.sub(r"\\(.)", r"\1", value)
+
+    def _list(self, request, params) -> dict:
+        query = params.get("q", "")
+        parents = {self._unescape(parent) for parent in FakeDriveFiles._PARENT_CLAUSE.findall(query)}
+        equals = {field: self._unescape(value) for field, value in FakeDriveFiles._EQUALS_CLAUSE.findall(query)}
+        fields_match = FakeDriveFiles._FILE_FIELDS.search(params.get("fields", ""))
+        fields = fields_match.group(1).split(",") if fields_match else ["id", "name", "mimeType"]
+
+        matches = [
+            file for file in self.files.values()
+            if parents & set(file["parents"]) and all(file.get(field) == value for field, value in equals.items())
+        ]
+        if params.get("orderBy") == "modifiedTime desc":
+            matches.sort(key=lambda file: file.get("modifiedTime", ""), reverse=True)
+        page_size = min(int(params.get("pageSize", 100)), self.page_size or 1000)
+        start = int(params.get("pageToken") or 0)
+        page = matches[start:start + page_size]
+        payload = {"files": [{field: file[field] for field in fields if field in file} for file in page]}
+        if start + page_size < len(matches):
+            payload["nextPageToken"] = str(start + page_size)
+        return payload
@@ -0,0 +1,225 @@
+import re
+import asyncio
+import hashlib
+import pathlib
+
+import pytest
+
+from typing import Any
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import async_gdrive_session
+from async_gdrive_session import AsyncGDriveSession
+from gdrive_session import GDriveSession
+
+FOLDER = GDriveSession.MIME_TYPE_DRIVE_FOLDER
+PDF = GDriveSession.MIME_TYPE_PDF
+
+class FakeDriveServer:
+    """
+    Minimal Drive v3 files endpoint served by a local aiohttp server: files.list (answering "'<id>' in parents" queries
+    with optional name and mimeType filters, page_size files per page), files.get for metadata, and alt=media downloads
+    honoring Range headers.
+    """
+
+    def __init__(self, page_size: int = 2):
+        self.files: dict[str, dict] = {}
+        self.contents: dict[str, bytes] = {}
+        self.page_size = page_size
+        self.requests: list[web.Request] = []
+
+    def make_app(self) -> web.Application:
+        """A new application serving the drive (an application can only be run on one event loop)"""
+        app = web.Application()
+        app.router.add_get("/drive/v3/files", self._list)
+        app.router.add_get("/drive/v3/files/{file_id}", self._get)
+        return app
+
+    def add_folder(self, file_id: str, name: str, parent: str) -> None:
+        self.files[file_id] = {"id": file_id, "name": name, "mimeType": FOLDER, "parents": [parent]}
+
+    def add_pdf(self, file_id: str, name: str, parent: str, content: bytes) -> None:
+        self.contents[file_id] = content
+        self.files[file_id] = {
+            "id": file_id, "name": name, "mimeType": PDF, "parents": [parent],
+            "md5Checksum": hashlib.md5(content).hexdigest(), "modifiedTime": "2026-01-01T00:00:00.000Z",
+            "size": str(len(content)),
+        }
+
+    @staticmethod
+    def _public(file: dict) -> dict:
+        return {key: value for key, value in file.items() if key != "parents"}
+
+    async def _list(self, request: web.Request) -> web.Response:
+        self.requests.append(request)
+        query = request.query["q"]
+        parent = re.search(r"'([^']*)' in parents", query)[1]
+        name = re.search(r"name='((?:[^'\\]|\\.)*)'", query)
+        mime_type = re.search(r"mimeType='([^']*)'", query)
+
+        matches = [
+            FakeDriveServer._public(file) for file in self.files.values()
+            if parent in file["parents"]
+            and (not name or file["name"] == re.sub(r"\\(.)", r"\1", name[1]))
+            and (not mime_type or file["mimeType"] == mime_type[1])
+        ]
+        start = int(request.query.get("pageToken", 0))
+        payload = {"files": matches[start:start + self.page_size]}
+        if start + self.page_size < len(matches):
+            payload["nextPageToken"] = str(start + self.page_size)
+        return web.json_response(payload)
+
+    async def _get(self, request: web.Request) -> web.StreamResponse:
+        self.requests.append(request)
+        file = self.files.get(request.match_info["file_id"])
+        if file is None:
+            return web.json_response({"error": {"code": 404}}, status=404)
+        if request.query.get("alt") != "media":
+            return web.json_response(FakeDriveServer._public(file))
+
+        content = self.contents[file["id"]]
+        if request.http_range.start:
+            if request.http_range.start >= len(content):
+                return web.Response(status=416)
+            return web.Response(body=content[request.http_range.start:], status=206, content_type=PDF)
+        return web.Response(body=content, content_type=PDF)
+
+@pytest.fixture
+def drive() -> FakeDriveServer:
+    drive = FakeDriveServer()
+    drive.add_folder("lead-sheets", "Lead Sheets", "drive-root")
+    drive.add_folder("melt", "ryo - Melt", "lead-sheets")
+    drive.add_folder("rolling-girl", "wowaka - Rolling Girl's", "lead-sheets")
+    for i, key in enumerate(["C", "Bb", "Eb", "F", "Vocals"]):
+        drive.add_pdf(f"melt-{key}", f"ryo - Melt-{key}.pdf", "melt", f"%PDF-1.7 melt {key}".encode() * (i + 1))
+    drive.add_pdf("rolling-girl-C", "wowaka - Rolling Girl's-C.pdf", "rolling-girl", b"%PDF-1.7 rolling girl")
+    return drive
+
+def run_with_session(drive: FakeDriveServer, monkeypatch, test) -> Any:
+    """Serves drive locally, points AsyncGDriveSession at it and runs `await test(session)`"""
+    async def run():
+        async with TestServer(drive.make_app()) as server:
+            monkeypatch.setattr(GDriveSession, "DRIVE_FILES_URL", str(server.make_url("/drive/v3/files")))
+            async with AsyncGDriveSession() as session:
+                return await test(session)
+    return asyncio.run(run())
+
+def test_find_all_files_in_follows_every_page(drive, monkeypatch):
+    files = run_with_session(drive, monkeypatch, lambda session: session.find_all_files_in("melt"))
+
+    assert [file["id"] for file in files] == ["melt-C", "melt-Bb", "melt-Eb", "melt-F", "melt-Vocals"]
+    assert len(drive.requests) == 3
+
+def test_find_all_files_in_filters_by_mime_type(drive, monkeypatch):
+    folders = run_with_session(drive, monkeypatch, lambda session: session.find_all_files_in("lead-sheets", FOLDER))
+
+    assert {folder["name"] for folder in folders} == {"ryo - Melt", "wowaka - Rolling Girl's"}
+
+def test_find_files_in_dir_walks_the_path_once(drive, monkeypatch):
+    async def test(session):
+        return await asyncio.gather(
+            session.find_files_in_dir(pathlib.Path("Lead Sheets/ryo - Melt")),
+            session.find_files_in_dir(pathlib.Path("Lead Sheets/wowaka - Rolling Girl's")),
+        )
+
+    melt, rolling_girl = run_with_session(drive, monkeypatch, test)
+
+    assert len(melt) == 5
+    assert [file["id"] for file in rolling_girl] == ["rolling-girl-C"]
+    # "Lead Sheets" is looked up once for both songs
+    lookups = [request.query["q"] for request in drive.requests if "name=" in request.query["q"]]
+    assert sum("name='Lead Sheets'" in query for query in lookups) == 1
+
+def test_find_files_in_dir_uses_the_path_cache(drive, monkeypatch):
+    path = pathlib.Path("Lead Sheets/ryo - Melt")
+    run_with_session(drive, monkeypatch, lambda session: session.find_files_in_dir(path))
+    drive.requests.clear()
+
+    files = run_with_session(drive, monkeypatch, lambda session: session.find_files_in_dir(path))
+
+    assert len(files) == 5
+    assert all("name=" not in request.query["q"] for request in drive.requests)
+
+def test_find_files_in_dir_reports_missing_folders(drive, monkeypatch):
+    with pytest.raises(ValueError, match="could not find 'nobody - Nothing'"):
+        run_with_session(
+            drive, monkeypatch, lambda session: session.find_files_in_dir(pathlib.Path("Lead Sheets/nobody - Nothing"))
+        )
+
+def test_get_file_metadata(drive, monkeypatch):
+    metadata = run_with_session(drive, monkeypatch, lambda session: session.get_file_metadata("melt-Eb"))
+
+    assert metadata["name"] == "ryo - Melt-Eb.pdf"
+    assert metadata["md5Checksum"] == drive.files["melt-Eb"]["md5Checksum"]
+
+def test_get_file_metadata_raises_for_unknown_files(drive, monkeypatch):
+    with pytest.raises(aiohttp.ClientResponseError):
+        run_with_session(drive, monkeypatch, lambda session: session.get_file_metadata("nothing"))
+
+def test_download_file(drive, monkeypatch, tmp_path):
+    output = tmp_path / "charts" / "melt-F.pdf"
+    expected_md5 = drive.files["melt-F"]["md5Checksum"]
+
+    md5 = run_with_session(
+        drive, monkeypatch, lambda session: session.download_file("melt-F", str(output), expected_md5)
+    )
+
+    assert md5 == expected_md5
+    assert output.read_bytes() == drive.contents["melt-F"]
+    assert not output.with_name("melt-F.pdf.part").exists()
+
+def test_download_file_resumes_partial_download(drive, monkeypatch, tmp_path):
+    output = tmp_path / "melt-Vocals.pdf"
+    content = drive.contents["melt-Vocals"]
+    expected_md5 = drive.files["melt-Vocals"]["md5Checksum"]
+    pathlib.Path(f"{output}.part").write_bytes(content[:10])
+    pathlib.Path(f"{output}.part.md5").write_text(expected_md5)
+
+    md5 = run_with_session(
+        drive, monkeypatch, lambda session: session.download_file("melt-Vocals", str(output), expected_md5)
+    )
+
+    assert md5 == expected_md5
+    assert output.read_bytes() == content
+    assert drive.requests[-1].headers["Range"] == "bytes=10-"
+    assert not pathlib.Path(f"{output}.part.md5").exists()
+
+def test_download_file_does_not_resume_another_version(drive, monkeypatch, tmp_path):
+    output = tmp_path / "melt-Vocals.pdf"
+    content = drive.contents["melt-Vocals"]
+    pathlib.Path(f"{output}.part").write_bytes(b"%PDF-1.7 an older version")
+    pathlib.Path(f"{output}.part.md5").write_text("0" * 32)
+
+    md5 = run_with_session(
+        drive, monkeypatch,
+        lambda session: session.download_file("melt-Vocals", str(output), drive.files["melt-Vocals"]["md5Checksum"]),
+    )
+
+    assert md5 == hashlib.md5(content).hexdigest()
+    assert output.read_bytes() == content
+    assert "Range" not in drive.requests[-1].headers
+
+def test_download_file_rejects_md5_mismatch(drive, monkeypatch, tmp_path):
+    output = tmp_path / "melt-C.pdf"
+
+    md5 = run_with_session(drive, monkeypatch, lambda session: session.download_file("melt-C", str(output), "0" * 32))
+
+    assert md5 is None
+    assert not output.exists()
+    assert not pathlib.Path(f"{output}.part").exists()
+
+def test_download_file_rejects_html(drive, monkeypatch, tmp_path):
+    drive.contents["melt-C"] = b"<!DOCTYPE html><html>Quota exceeded</html>"
+    output = tmp_path / "melt-C.pdf"
+
+    assert run_with_session(drive, monkeypatch, lambda session: session.download_file("melt-C", str(output))) is None
+    assert not output.exists()
+
+def test_requires_aiohttp(monkeypatch):
+    monkeypatch.setattr(async_gdrive_session, "aiohttp", None)
+
+    with pytest.raises(ImportError, match="aiohttp"):
+        AsyncGDriveSession()
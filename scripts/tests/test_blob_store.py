@@ -0,0 +1,76 @@
+import errno
+import hashlib
+import os
+
+import pytest
+
+import blob_store
+from blob_store import BlobStore
+
+CONTENT = b"%PDF-1.7 ryo - Melt-C"
+MD5 = hashlib.md5(CONTENT).hexdigest()
+
+@pytest.fixture
+def store(tmp_path) -> BlobStore:
+    source = tmp_path / "download.pdf"
+    source.write_bytes(CONTENT)
+    store = BlobStore(tmp_path / "blobs")
+    store.add(source, MD5)
+    return store
+
+def test_blobs_are_stored_under_their_md5(store, tmp_path):
+    assert store.has(MD5)
+    assert store.path_for(MD5) == tmp_path / "blobs" / MD5[:2] / MD5
+    assert store.path_for(MD5).read_bytes() == CONTENT
+    assert not store.has("0" * 32)
+
+def test_materialized_files_are_hardlinks_of_the_blob(store, tmp_path):
+    dest = tmp_path / "pdfs" / "melt" / "melt-C.pdf"
+
+    assert store.materialize(MD5, dest)
+
+    assert dest.read_bytes() == CONTENT
+    assert os.path.samefile(store.path_for(MD5), dest)
+
+def test_materializing_replaces_what_is_there(store, tmp_path):
+    dest = tmp_path / "melt-C.pdf"
+    dest.write_bytes(b"%PDF-1.7 an older chart")
+
+    assert store.materialize(MD5, dest)
+    assert dest.read_bytes() == CONTENT
+    # Materializing again over the same blob is a no-op
+    assert store.materialize(MD5, dest)
+    assert sorted(os.listdir(tmp_path)) == ["blobs", "download.pdf", "melt-C.pdf"]
+
+@pytest.mark.parametrize("error", [errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP])
+def test_files_are_copied_when_they_cannot_be_linked(store, tmp_path, monkeypatch, error):
+    def link(src, dst):
+        raise OSError(error, os.strerror(error))
+    monkeypatch.setattr(blob_store.os, "link", link)
+    dest = tmp_path / "melt-tv" / "melt-tv-C.pdf"
+
+    assert store.materialize(MD5, dest)
+
+    assert dest.read_bytes() == CONTENT
+    assert not os.path.samefile(store.path_for(MD5), dest)
+
+def test_other_link_errors_fail_without_leaving_files_behind(store, tmp_path, monkeypatch):
+    def link(src, dst):
+        raise OSError(errno.EACCES, os.strerror(errno.EACCES))
+    monkeypatch.setattr(blob_store.os, "link", link)
+    dest_dir = tmp_path / "pdfs"
+
+    assert not store.materialize(MD5, dest_dir / "melt-C.pdf")
+    assert os.listdir(dest_dir) == []
+
+def test_missing_blobs_are_not_materialized(store, tmp_path):
+    assert not store.materialize("0" * 32, tmp_path / "missing.pdf")
+    assert not (tmp_path / "missing.pdf").exists()
+
+def test_adding_a_stored_md5_keeps_the_first_blob(store, tmp_path):
+    other = tmp_path / "other.pdf"
+    other.write_bytes(b"%PDF-1.7 something else")
+
+    store.add(other, MD5)
+
+    assert store.path_for(MD5).read_bytes() == CONTENT
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+
+import sheet_sync
+from catalog_index import CatalogIndex
+
+MELT = {
+    "title": "Melt",
+    "producer": "ryo",
+    "bpm": 95,
+    "status": "completed",
+    "links": {"C": "https://drive.google.com/file/d/melt-c/view"},
+    "pdfChecksums": {"C": "md5-c"},
+    "pdfs": {"C": "melt/melt-C.pdf", "Bb": "", "Eb": "melt/melt-Eb.pdf"},
+    "pdfsTvSize": {"C": "melt-tv/melt-tv-C.pdf"},
+    "updatedAt": "2024-03-01T00:00:00Z",
+}
+
+def files(songs: dict[str, dict], page_size: int = 2) -> dict[str, dict]:
+    index = CatalogIndex(page_size)
+    for filename, frontend_data in songs.items():
+        index.add(filename, frontend_data)
+    return {filename: json.loads(content) for filename, content in index.files().items()}
+
+def catalog(size: int) -> dict[str, dict]:
+    return {f"song-{i}.json": {"title": f"Song {i}", "producer": "ryo"} for i in range(size)}
+
+def test_summaries_only_hold_what_the_song_list_needs():
+    assert CatalogIndex.summarize("melt.json", MELT) == {
+        "file": "melt.json",
+        "title": "Melt",
+        "producer": "ryo",
+        "bpm": 95,
+        "status": "completed",
+        "updatedAt": "2024-03-01T00:00:00Z",
+        "keys": ["C", "Eb"],
+        "tvSizeKeys": ["C"],
+    }
+
+def test_songs_are_paged_in_filename_order():
+    index_files = files(catalog(5))
+
+    assert list(index_files) == ["index.json", "songs-0000.json", "songs-0001.json", "songs-0002.json"]
+    assert [[song["file"] for song in index_files[f"songs-000{i}.json"]["songs"]] for i in range(3)] == [
+        ["song-0.json", "song-1.json"], ["song-2.json", "song-3.json"], ["song-4.json"],
+    ]
+    root = index_files["index.json"]
+    assert (root["version"], root["pageSize"], root["totalSongs"]) == (CatalogIndex.INDEX_VERSION, 2, 5)
+    assert [(page["file"], page["count"], page["first"], page["last"]) for page in root["pages"]] == [
+        ("songs-0000.json", 2, "song-0.json", "song-1.json"),
+        ("songs-0001.json", 2, "song-2.json", "song-3.json"),
+        ("songs-0002.json", 1, "song-4.json", "song-4.json"),
+    ]
+
+def test_page_digests_match_the_page_bytes():
+    index = CatalogIndex(2)
+    for filename, frontend_data in catalog(3).items():
+        index.add(filename, frontend_data)
+    content = index.files()
+
+    for page in json.loads(content["index.json"])["pages"]:
+        assert page["digest"] == hashlib.sha256(content[page["file"]]).hexdigest()[:16]
+
+def test_pages_only_change_with_their_songs():
+    songs = catalog(5)
+    before = files(songs)
+
+    songs["song-3.json"] = {**songs["song-3.json"], "bpm": 120}
+    after = files(songs)
+
+    assert [after[f"songs-000{i}.json"] == before[f"songs-000{i}.json"] for i in range(3)] == [True, False, True]
+    digests = [[page["digest"] for page in index_files["index.json"]["pages"]] for index_files in (before, after)]
+    assert [old == new for old, new in zip(*digests)] == [True, False, True]
+
+def test_empty_catalogs_have_no_pages():
+    assert files({}) == {
+        "index.json": {"version": CatalogIndex.INDEX_VERSION, "pageSize": 2, "totalSongs": 0, "pages": []}
+    }
+
+def test_pages_are_told_apart_from_other_files():
+    assert CatalogIndex.is_page("songs-0000.json")
+    assert not CatalogIndex.is_page("index.json")
+    assert not CatalogIndex.is_page("songs-0000.json.tmp")
+
+def test_sync_removes_pages_the_index_no_longer_has(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = sheet_sync.SongSyncManager(use_drive_index=False)
+    os.makedirs(manager.catalog_index_dir)
+    for filename in ("songs-0000.json", "songs-0001.json", "songs-0002.json", "notes.txt"):
+        with open(os.path.join(manager.catalog_index_dir, filename), "w", encoding="utf-8") as f:
+            f.write("{}")
+
+    manager.update_catalog_index(catalog(CatalogIndex.PAGE_SIZE + 1))
+
+    assert sorted(os.listdir(manager.catalog_index_dir)) == [
+        "index.json", "notes.txt", "songs-0000.json", "songs-0001.json",
+    ]
+    with open(os.path.join(manager.catalog_index_dir, "index.json"), encoding="utf-8") as f:
+        assert json.load(f)["totalSongs"] == CatalogIndex.PAGE_SIZE + 1
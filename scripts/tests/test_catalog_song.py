@@ -0,0 +1,103 @@
+import dataclasses
+
+import pytest
+
+import sheet_sync
+from catalog_song import CatalogSong, SheetRow
+
+MELT_JSON = {
+    "title": "Melt",
+    "alternativeNames": ["メルト"],
+    "producer": "ryo",
+    "additionalProducers": [],
+    "singer": "Hatsune Miku",
+    "additionalVoices": [],
+    "releaseDate": "20071207",
+    "length": "4:19",
+    "tvSizeLength": "",
+    "bpm": 95,
+    "labels": ["supercell"],
+    "transcriber": "someone",
+    "videoLinks": {"YouTube": "https://www.youtube.com/watch?v=o1jAMSQyVPc"},
+    "links": {"C": "https://drive.google.com/file/d/melt-c/view"},
+    "pdfChecksums": {"C": "md5-c"},
+    "pdfs": {"C": "melt/melt-C.pdf"},
+    "pdfsTvSize": {},
+    "status": "completed",
+}
+
+def test_sheet_rows_read_like_record_dicts():
+    row = SheetRow(2, {"Song Name": "Melt", "BPM": 95})
+
+    assert row.get("Song Name") == "Melt"
+    assert row.get("Producer", "") == ""
+    assert row.hyperlinks == {} and row.song_record is None
+    with pytest.raises(AttributeError):
+        row.extra = "rows are slotted"
+
+def test_sheet_row_hashes_cover_values_and_chip_links():
+    row = SheetRow(2, {"Song Name": "Melt", "BPM": 95}, hyperlinks={"C": "https://drive.google.com/a"})
+
+    reordered = SheetRow(9, {"BPM": 95, "Song Name": "Melt"}, None, {"C": "https://drive.google.com/a"})
+    assert row.content_hash() == reordered.content_hash()
+    assert row.content_hash() != SheetRow(2, {"Song Name": "Melt", "BPM": 96}, None, row.hyperlinks).content_hash()
+    assert row.content_hash() != SheetRow(2, row.values, None, {"C": "https://drive.google.com/b"}).content_hash()
+
+def test_songs_round_trip_through_their_frontend_json():
+    song = CatalogSong.from_frontend_json({**MELT_JSON, "syncedAt": "2024-01-01T00:00:00Z"})
+
+    assert song.to_frontend_dict() == MELT_JSON
+    assert list(song.to_frontend_dict()) == list(CatalogSong.FRONTEND_KEYS.values())
+    assert song.canonical == CatalogSong.canonical_bytes(MELT_JSON)
+
+def test_missing_frontend_fields_get_defaults():
+    song = CatalogSong.from_frontend_json({"title": "Melt", "producer": "ryo", "singer": "Hatsune Miku"})
+
+    assert (song.alternative_names, song.bpm, song.pdfs, song.status) == ([], None, {}, "completed")
+    assert song.release_date == ""
+
+def test_songs_are_frozen_and_compared_on_content_only():
+    song = CatalogSong.from_frontend_json(MELT_JSON)
+    downloaded = dataclasses.replace(song, downloaded=True)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        song.title = "Melt (2024)"
+    assert downloaded == song and downloaded.digest == song.digest
+    assert dataclasses.replace(song, bpm=96).digest != song.digest
+
+def test_content_snapshots_leave_out_metadata():
+    song = CatalogSong.from_frontend_json(MELT_JSON)
+
+    assert dataclasses.replace(song, bpm=96, labels=[]).content_snapshot() == song.content_snapshot()
+    assert dataclasses.replace(song, status="under review").content_snapshot() != song.content_snapshot()
+    assert CatalogSong.content_snapshot_of({}) == {
+        "status": "completed", "pdfs": {}, "pdfsTvSize": {}, "pdfChecksums": {}, "links": {},
+    }
+
+def test_sheet_rows_are_normalized_into_songs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = sheet_sync.SongSyncManager(use_drive_index=False)
+    row = SheetRow(2, {
+        "Song Name": " Melt ",
+        "Alternative Names": "メルト",
+        "Producer": "ryo",
+        "Original Voice": "Hatsune Miku",
+        "Additional Voices (comma sep)": "Kagamine Rin, Kagamine Len",
+        "BPM": "95",
+        "Labels (comma sep)": "supercell",
+        "Status": "In Progress",
+    })
+    parsed_pdfs = ({"C": "melt/melt-C.pdf"}, {"C": "https://drive.google.com/file/d/melt-c/view"}, {"C": "md5-c"}, True)
+
+    song = manager.normalize_song_data(
+        row, tv_size_data={"pdfs": {"C": "melt-tv/melt-tv-C.pdf"}, "tvSizeLength": "1:30"}, parsed_pdfs=parsed_pdfs
+    )
+
+    assert (song.title, song.alternative_names, song.bpm) == ("Melt", ["メルト"], 95)
+    assert song.additional_voices == ["Kagamine Rin", "Kagamine Len"]
+    assert song.status == "under review"
+    assert (song.pdfs, song.pdf_checksums, song.pdfs_tv_size) == (
+        {"C": "melt/melt-C.pdf"}, {"C": "md5-c"}, {"C": "melt-tv/melt-tv-C.pdf"}
+    )
+    assert song.tv_size_length == "1:30"
+    assert song.downloaded and manager.downloads_performed
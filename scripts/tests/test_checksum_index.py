@@ -0,0 +1,103 @@
+import os
+import hashlib
+
+import pytest
+
+from checksum_index import ChecksumIndex
+
+def md5_of(content: bytes) -> str:
+    return hashlib.md5(content).hexdigest()
+
+def checkout(path, content: bytes) -> None:
+    """Replaces the file at path like a fresh checkout does: same path, new inode and mtime"""
+    os.remove(path)
+    path.write_bytes(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+@pytest.fixture
+def index_file(tmp_path):
+    return tmp_path / "cache" / "pdf_checksums.json"
+
+@pytest.fixture
+def pdf(tmp_path):
+    path = tmp_path / "melt-c.pdf"
+    path.write_bytes(b"%PDF melt C")
+    return path
+
+def test_hashes_new_files(pdf):
+    assert ChecksumIndex().md5(pdf) == md5_of(b"%PDF melt C")
+
+def test_missing_file(tmp_path):
+    assert ChecksumIndex().md5(tmp_path / "missing.pdf") is None
+
+def test_unchanged_files_are_not_read_again(pdf):
+    index = ChecksumIndex()
+    index.md5(pdf)
+    stat = os.stat(pdf)
+    # Same size, inode and mtime, so the index can't tell the content changed
+    with open(pdf, "r+b") as f:
+        f.write(b"%PDF MELT C")
+    os.utime(pdf, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert index.md5(pdf) == md5_of(b"%PDF melt C")
+
+def test_changed_files_are_hashed_again(pdf):
+    index = ChecksumIndex()
+    index.md5(pdf)
+    checkout(pdf, b"%PDF melt C, edited")
+
+    assert index.md5(pdf) == md5_of(b"%PDF melt C, edited")
+
+def test_recorded_checksums_are_trusted(pdf):
+    index = ChecksumIndex()
+    index.record(pdf, "0" * 32)
+
+    assert index.md5(pdf) == "0" * 32
+
+def test_entries_persist(pdf, index_file):
+    index = ChecksumIndex(index_file)
+    index.record(pdf, "0" * 32)
+    index.save()
+
+    assert ChecksumIndex(index_file).md5(pdf) == "0" * 32
+    assert ChecksumIndex(index_file, rebuild=True).md5(pdf) == md5_of(b"%PDF melt C")
+
+def test_committed_checksum_survives_a_checkout(pdf, index_file):
+    index = ChecksumIndex(index_file)
+    committed_md5 = index.md5(pdf)
+    index.save()
+    # Same size, different bytes: only a file that was actually read would tell
+    checkout(pdf, b"%PDF MELT C")
+
+    index = ChecksumIndex(index_file)
+    assert index.md5(pdf, expected_md5=committed_md5) == committed_md5
+    # and the new stat is remembered, so the next run doesn't need the committed checksum
+    assert index.md5(pdf) == committed_md5
+
+def test_committed_checksum_needs_a_size_match(pdf):
+    index = ChecksumIndex()
+    committed_md5 = index.md5(pdf)
+    checkout(pdf, b"%PDF melt C, edited")
+
+    assert index.md5(pdf, expected_md5=committed_md5) == md5_of(b"%PDF melt C, edited")
+
+def test_committed_checksum_must_match_the_entry(pdf):
+    index = ChecksumIndex()
+    index.md5(pdf)
+    checkout(pdf, b"%PDF MELT C")
+
+    # The entry's size belongs to another checksum, so it says nothing about this one
+    assert index.md5(pdf, expected_md5="0" * 32) == md5_of(b"%PDF MELT C")
+
+def test_committed_checksum_with_expected_size(pdf):
+    size = os.path.getsize(pdf)
+
+    assert ChecksumIndex().md5(pdf, expected_md5="0" * 32, expected_size=str(size)) == "0" * 32
+    assert ChecksumIndex().md5(pdf, expected_md5="0" * 32, expected_size=size + 1) == md5_of(b"%PDF melt C")
+    assert ChecksumIndex().md5(pdf, expected_md5="0" * 32) == md5_of(b"%PDF melt C")
+
+def test_rebuild_ignores_committed_checksums(pdf):
+    size = os.path.getsize(pdf)
+
+    assert ChecksumIndex(rebuild=True).md5(pdf, expected_md5="0" * 32, expected_size=size) == md5_of(b"%PDF melt C")
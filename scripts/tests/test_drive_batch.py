@@ -0,0 +1,167 @@
+import json
+import re
+import threading
+import time
+
+import pytest
+import requests
+
+import rate_limit
+from drive_batch import DriveMetadataBatcher
+from rate_limit import RateLimiter
+
+BATCH_PATH = "/batch/drive/v3"
+RATE_LIMITED = {"error": {"code": 403, "errors": [{"reason": "userRateLimitExceeded"}]}}
+
+def multipart(*parts: tuple[str | None, int, str], boundary: str = "batch_test") -> tuple[str, bytes]:
+    """
+    A Drive batch response made of (Content-ID, status, body) parts, in the format Drive answers with
+
+    Returns:
+        the Content-Type header and the body
+    """
+    text = ""
+    for content_id, status, body in parts:
+        text += f"--{boundary}\r\nContent-Type: application/http\r\n"
+        if content_id is not None:
+            text += f"Content-ID: <{content_id}>\r\n"
+        text += f"\r\nHTTP/1.1 {status} STATUS\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n{body}\r\n"
+    text += f"--{boundary}--\r\n"
+    return f"multipart/mixed; boundary={boundary}", text.encode("utf-8")
+
+def test_parse_batch_response_with_mixed_statuses():
+    content_type, content = multipart(
+        ("response-item0", 200, json.dumps({"id": "a", "name": "a.pdf"})),
+        ("response-item1", 403, json.dumps(RATE_LIMITED)),
+        ("response-item2", 429, json.dumps({"error": {"code": 429}})),
+        ("response-item3", 404, json.dumps({"error": {"code": 404}})),
+    )
+
+    responses = DriveMetadataBatcher.parse_batch_response(content_type, content, ["a", "b", "c", "d"])
+
+    assert {index: response.status_code for index, response in responses.items()} == {0: 200, 1: 403, 2: 429, 3: 404}
+    assert responses[0].json() == {"id": "a", "name": "a.pdf"}
+    assert responses[0].url.endswith("/drive/v3/files/a")
+    assert [RateLimiter.is_throttled(responses[i]) for i in range(4)] == [False, True, True, False]
+    with pytest.raises(requests.HTTPError):
+        responses[3].raise_for_status()
+
+def test_parse_batch_response_skips_parts_without_a_content_id():
+    content_type, content = multipart(
+        (None, 200, json.dumps({"id": "a"})),
+        ("response-item1", 200, json.dumps({"id": "b"})),
+    )
+
+    responses = DriveMetadataBatcher.parse_batch_response(content_type, content, ["a", "b"])
+
+    assert list(responses) == [1]
+    assert responses[1].json() == {"id": "b"}
+
+def test_parse_batch_response_keeps_bodies_which_are_not_json():
+    content_type, content = multipart(("response-item0", 502, "<html>Bad Gateway</html>"))
+
+    [response] = DriveMetadataBatcher.parse_batch_response(content_type, content, ["a"]).values()
+
+    assert response.status_code == 502
+    assert response.text == "<html>Bad Gateway</html>"
+    with pytest.raises(requests.JSONDecodeError):
+        response.json()
+
+def test_parse_batch_response_needs_a_boundary():
+    with pytest.raises(ValueError):
+        DriveMetadataBatcher.parse_batch_response("multipart/mixed", b"", ["a"])
+
+class FakeBatchEndpoint:
+    """
+    The Drive batch endpoint, answering each file ID with the next of its scripted (status, body) answers (and a 200
+    with its metadata once they run out), or leaving it out of the response if its answer is None
+    """
+
+    def __init__(self, api):
+        self.answers: dict[str, list[tuple[int, str] | None]] = {}
+        self.batches: list[list[str]] = []
+        self._lock = threading.Lock()
+        api.route("POST", BATCH_PATH, self._batch)
+
+    def _batch(self, request, params):
+        file_ids = re.findall(r"GET /drive/v3/files/([^?]+)\?", request.body.decode("utf-8"))
+        parts = []
+        with self._lock:
+            self.batches.append(file_ids)
+            for index, file_id in enumerate(file_ids):
+                answers = self.answers.get(file_id, [])
+                answer = answers.pop(0) if answers else (200, json.dumps({"id": file_id}))
+                if answer is not None:
+                    parts.append((f"response-item{index}", *answer))
+        content_type, content = multipart(*parts)
+        return 200, content, {"Content-Type": content_type}
+
+@pytest.fixture
+def endpoint(google_api) -> FakeBatchEndpoint:
+    return FakeBatchEndpoint(google_api)
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limiter(monkeypatch):
+    """Throttled items cut the process-wide limiter's concurrency; keep that out of other tests"""
+    monkeypatch.setattr(rate_limit, "_rate_limiter", RateLimiter())
+
+def backoff(monkeypatch, seconds: float) -> None:
+    monkeypatch.setattr(RateLimiter, "backoff_delay", staticmethod(lambda attempt, retry_after=None: seconds))
+
+def test_items_are_batched_together(endpoint):
+    batcher = DriveMetadataBatcher(requests.Session(), window_seconds=0.05)
+
+    futures = [batcher.load_async(file_id) for file_id in ("a", "b", "a")]
+
+    assert [future.result(5) for future in futures] == [{"id": "a"}, {"id": "b"}, {"id": "a"}]
+    assert endpoint.batches == [["a", "b"]]
+
+def test_item_errors_are_raised_for_that_item_only(endpoint):
+    endpoint.answers = {"missing": [(404, json.dumps({"error": {"code": 404}}))], "dropped": [None]}
+    batcher = DriveMetadataBatcher(requests.Session(), window_seconds=0.05)
+
+    futures = {file_id: batcher.load_async(file_id) for file_id in ("ok", "missing", "dropped")}
+
+    assert futures["ok"].result(5) == {"id": "ok"}
+    with pytest.raises(requests.HTTPError, match="404"):
+        futures["missing"].result(5)
+    with pytest.raises(requests.HTTPError, match="missing an entry"):
+        futures["dropped"].result(5)
+
+def test_throttled_items_are_retried(endpoint, monkeypatch):
+    backoff(monkeypatch, 0)
+    endpoint.answers = {"a": [(403, json.dumps(RATE_LIMITED)), (429, "{}")]}
+    batcher = DriveMetadataBatcher(requests.Session(), window_seconds=0.05)
+
+    futures = [batcher.load_async(file_id) for file_id in ("a", "b")]
+
+    assert [future.result(5) for future in futures] == [{"id": "a"}, {"id": "b"}]
+    assert endpoint.batches == [["a", "b"], ["a"], ["a"]]
+    assert rate_limit.get_rate_limiter().concurrency_limit("drive") < RateLimiter().concurrency_limit("drive")
+
+def test_throttled_items_give_up_after_the_last_retry(endpoint, monkeypatch):
+    backoff(monkeypatch, 0)
+    endpoint.answers = {"a": [(429, "{}")] * (RateLimiter.MAX_RETRIES + 1)}
+    batcher = DriveMetadataBatcher(requests.Session(), window_seconds=0)
+
+    with pytest.raises(requests.HTTPError, match="429"):
+        batcher.load("a")
+    assert len(endpoint.batches) == RateLimiter.MAX_RETRIES + 1
+
+def test_backoff_does_not_hold_a_batch_worker(endpoint, monkeypatch):
+    backoff(monkeypatch, 0.5)
+    endpoint.answers = {"slow": [(429, "{}")]}
+    # A single worker: if it slept through the backoff, nothing else could be sent meanwhile
+    batcher = DriveMetadataBatcher(requests.Session(), window_seconds=0, max_inflight_batches=1)
+
+    throttled = batcher.load_async("slow")
+    while not endpoint.batches:
+        time.sleep(0.01)
+    started = time.monotonic()
+
+    assert batcher.load("fast") == {"id": "fast"}
+    assert time.monotonic() - started < 0.4
+    assert not throttled.done()
+    assert throttled.result(5) == {"id": "slow"}
+    assert time.monotonic() - started >= 0.4
+    assert endpoint.batches == [["slow"], ["fast"], ["slow"]]
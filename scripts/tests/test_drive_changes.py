@@ -0,0 +1,115 @@
+import pytest
+
+from drive_changes import UNKNOWN_KEY, map_changes_to_songs
+from fake_google import FakeDriveChanges
+from gdrive_session import GDriveSession
+
+FOLDER = GDriveSession.MIME_TYPE_DRIVE_FOLDER
+PDF = GDriveSession.MIME_TYPE_PDF
+
+@pytest.fixture
+def drive_changes(fake_api) -> FakeDriveChanges:
+    return FakeDriveChanges(fake_api, page_size=2)
+
+@pytest.fixture
+def gdrive(fake_api) -> GDriveSession:
+    gdrive = GDriveSession()
+    gdrive._drive_session.mount("https://www.googleapis.com/drive/", fake_api)
+    return gdrive
+
+def test_start_page_token_points_at_now(gdrive, drive_changes):
+    drive_changes.log("a", name="a.pdf")
+    token = gdrive.get_changes_start_page_token()
+
+    assert gdrive.list_changes(token) == ([], token)
+
+def test_list_changes_follows_every_page(gdrive, drive_changes, fake_api):
+    token = gdrive.get_changes_start_page_token()
+    for i in range(5):
+        drive_changes.log(f"file-{i}", name=f"{i}.pdf", mimeType=PDF)
+
+    changes, new_token = gdrive.list_changes(token)
+
+    assert [change["fileId"] for change in changes] == [f"file-{i}" for i in range(5)]
+    assert new_token == "5"
+    # One startPageToken request, then 3 pages of at most 2 changes, each asking for the previous page's nextPageToken
+    page_tokens = [request.url.split("pageToken=")[1].split("&")[0] for request in fake_api.requests[1:]]
+    assert page_tokens == ["0", "2", "4"]
+
+def test_list_changes_resumes_from_the_new_token(gdrive, drive_changes):
+    drive_changes.log("old", name="old.pdf")
+    _, token = gdrive.list_changes(gdrive.get_changes_start_page_token())
+    drive_changes.log("new", name="new.pdf")
+
+    changes, _ = gdrive.list_changes(token)
+
+    assert [change["fileId"] for change in changes] == ["new"]
+
+def test_list_changes_reports_removed_files(gdrive, drive_changes):
+    token = gdrive.get_changes_start_page_token()
+    drive_changes.log("gone", removed=True)
+
+    changes, _ = gdrive.list_changes(token)
+
+    assert changes == [{"fileId": "gone", "removed": True}]
+
+def test_list_changes_raises_on_bad_token(gdrive, drive_changes):
+    with pytest.raises(Exception):
+        gdrive.list_changes("not-a-token")
+
+FILE_INDEX = {
+    "chart-c": {"slug": "melt", "key": "C", "tv": False},
+    "chart-tv-bb": {"slug": "melt", "key": "Bb", "tv": True},
+}
+FOLDER_INDEX = {"folder-melt": "melt", "folder-senbonzakura": "senbonzakura"}
+BASENAMES = {"ryo - メルト": "melt", "黒うさP - 千本桜": "senbonzakura", "DECO*27 - ヴァンパイア": "vampire"}
+
+def map_changes(*changes: dict) -> dict[str, set[str]]:
+    return map_changes_to_songs(list(changes), FILE_INDEX, FOLDER_INDEX, BASENAMES)
+
+def change(file_id: str, removed: bool = False, **file_meta) -> dict:
+    return {"fileId": file_id, "removed": removed, **({} if removed else {"file": {"id": file_id, **file_meta}})}
+
+def test_known_chart_maps_to_its_key():
+    assert map_changes(change("chart-c", name="ryo - メルト-C.pdf", mimeType=PDF)) == {"melt": {"C"}}
+    assert map_changes(change("chart-tv-bb", name="whatever.pdf", mimeType=PDF)) == {"melt": {"TV-Bb"}}
+
+def test_removed_or_trashed_chart_still_maps_to_its_key():
+    assert map_changes(change("chart-c", removed=True)) == {"melt": {"C"}}
+    assert map_changes(change("chart-tv-bb", name="x.pdf", mimeType=PDF, trashed=True)) == {"melt": {"TV-Bb"}}
+
+def test_chart_folder_itself_maps_to_unknown_key():
+    assert map_changes(change("folder-melt", name="ryo - メルト", mimeType=FOLDER)) == {"melt": {UNKNOWN_KEY}}
+    assert map_changes(change("folder-senbonzakura", removed=True)) == {"senbonzakura": {UNKNOWN_KEY}}
+
+def test_new_file_in_chart_folder_maps_by_parent():
+    new_chart = change("new-1", name="ryo - メルト-Eb.pdf", mimeType=PDF, parents=["folder-melt"])
+    stray_file = change("new-2", name="notes.txt", parents=["folder-senbonzakura"])
+
+    assert map_changes(new_chart, stray_file) == {"melt": {"Eb"}, "senbonzakura": {UNKNOWN_KEY}}
+
+def test_new_chart_elsewhere_maps_by_normalized_name():
+    trashed = change("new-3", name="ＤＥＣＯ＊２７  -  ヴァンパイア - TV-alto.pdf", mimeType=PDF, parents=["x"], trashed=True)
+
+    assert map_changes(trashed) == {"vampire": {"TV-Alto"}}
+
+def test_new_chart_folder_maps_by_name():
+    assert map_changes(change("new-4", name="DECO*27 - ヴァンパイア", mimeType=FOLDER, parents=["x"])) == {
+        "vampire": {UNKNOWN_KEY}
+    }
+    # A PDF named like a song folder isn't a chart
+    assert map_changes(change("new-5", name="DECO*27 - ヴァンパイア", mimeType=PDF, parents=["x"])) == {}
+
+def test_unknown_changes_are_ignored():
+    assert map_changes(
+        change("unknown-1", name="Someone - Something-C.pdf", mimeType=PDF, parents=["x"]),
+        change("unknown-2", removed=True),
+        change("unknown-3", name="random folder", mimeType=FOLDER),
+    ) == {}
+
+def test_changes_to_one_song_are_merged():
+    assert map_changes(
+        change("chart-c", removed=True),
+        change("chart-tv-bb", removed=True),
+        change("new-6", name="ryo - メルト-Vocals.pdf", mimeType=PDF, parents=["folder-melt"]),
+    ) == {"melt": {"C", "TV-Bb", "Vocals"}}
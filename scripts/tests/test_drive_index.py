@@ -0,0 +1,194 @@
+import hashlib
+import os
+import pathlib
+import sqlite3
+
+import pytest
+
+import sheet_sync
+from catalog_song import SheetRow
+from drive_index import DriveIndex
+from fake_google import FakeDriveChanges, FakeDriveFiles
+from gdrive_session import GDriveSession
+from song_data_access import SongDataAccess
+
+FOLDER = GDriveSession.MIME_TYPE_DRIVE_FOLDER
+PDF = GDriveSession.MIME_TYPE_PDF
+
+CHART = b"%PDF-1.4 melt in C"
+CHART_MD5 = hashlib.md5(CHART).hexdigest()
+# Drive IDs are validated for length when read from the sheet
+CHART_ID = "chart-c-0123456789abcdefghij"
+CHART_LINK = f"https://drive.google.com/file/d/{CHART_ID}/view"
+
+@pytest.fixture
+def drive_files(google_api) -> FakeDriveFiles:
+    drive_files = FakeDriveFiles(google_api)
+    drive_files.add("lead-sheets", "Lead Sheets", "drive-root", mimeType=FOLDER)
+    drive_files.add("folder-melt", "ryo - メルト", "lead-sheets", mimeType=FOLDER)
+    drive_files.add(
+        CHART_ID, "ryo - メルト-C.pdf", "folder-melt",
+        mimeType=PDF, md5Checksum=CHART_MD5, size=str(len(CHART)), modifiedTime="2024-01-02T00:00:00Z",
+    )
+    return drive_files
+
+@pytest.fixture
+def drive_changes(google_api) -> FakeDriveChanges:
+    return FakeDriveChanges(google_api)
+
+@pytest.fixture
+def index(tmp_path, drive_files, drive_changes) -> DriveIndex:
+    index = DriveIndex(tmp_path / "drive_index.sqlite")
+    index.build(GDriveSession(), pathlib.Path(SongDataAccess.CHART_BASE_DIR))
+    yield index
+    index.close()
+
+def test_build_mirrors_sizes_from_the_listings(index):
+    assert index.get(CHART_ID) == {
+        "id": CHART_ID,
+        "name": "ryo - メルト-C.pdf",
+        "mimeType": PDF,
+        "parents": ["folder-melt"],
+        "md5Checksum": CHART_MD5,
+        "modifiedTime": "2024-01-02T00:00:00Z",
+        "size": str(len(CHART)),
+    }
+
+def test_refresh_picks_up_sizes_from_changes(index, drive_changes):
+    drive_changes.log(
+        CHART_ID, name="ryo - メルト-C.pdf", mimeType=PDF, parents=["folder-melt"], md5Checksum="new", size="42"
+    )
+
+    assert index.refresh(GDriveSession()) == 1
+    assert (index.get(CHART_ID)["md5Checksum"], index.get(CHART_ID)["size"]) == ("new", "42")
+
+def test_index_of_an_older_schema_is_discarded(tmp_path):
+    db_path = tmp_path / "old.sqlite"
+    with sqlite3.connect(db_path) as connection:
+        connection.executescript(
+            """
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE files (id TEXT PRIMARY KEY, name TEXT NOT NULL, mimeType TEXT NOT NULL, md5Checksum TEXT,
+                                modifiedTime TEXT);
+            CREATE TABLE parents (file_id TEXT NOT NULL, parent_id TEXT NOT NULL, PRIMARY KEY (file_id, parent_id));
+            INSERT INTO meta VALUES ('schemaVersion', '1'), ('rootId', 'lead-sheets');
+            INSERT INTO files VALUES ('chart-c', 'ryo - メルト-C.pdf', 'application/pdf', 'abc', NULL);
+            """
+        )
+    connection.close()
+
+    index = DriveIndex(db_path)
+    try:
+        assert not index.is_built
+        assert index.get("chart-c") is None
+        # The new schema's columns exist and can be written
+        index._upsert({"id": "chart-c", "name": "x.pdf", "mimeType": PDF, "size": "3"})
+        assert index.get("chart-c")["size"] == "3"
+    finally:
+        index.close()
+
+def test_parse_pdfs_trusts_a_committed_chart_of_the_indexed_size(index, tmp_path, google_api, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = sheet_sync.SongSyncManager()
+    manager.session.set_drive_index(index)
+    record = SongDataAccess(manager.session).get_records_bulk([("メルト", "ryo")])[("メルト", "ryo")]
+    assert record.pdfs_full["C"]["size"] == str(len(CHART))
+
+    # As after a fresh checkout: the committed PDF has a new mtime and inode, and nothing has hashed it yet. Its bytes
+    # don't even match its committed checksum, so reading it would end in a download
+    pdf_path = os.path.join(manager.pdf_dir, "melt", "melt-c.pdf")
+    os.makedirs(os.path.dirname(pdf_path))
+    with open(pdf_path, "wb") as f:
+        f.write(b"x" * len(CHART))
+    existing_song = {"pdfs": {"C": "/pdfs/melt/melt-c.pdf"}, "pdfChecksums": {"C": CHART_MD5}}
+    google_api.requests.clear()
+
+    pdfs, _, checksums, downloaded = manager._parse_pdfs_new(
+        SheetRow(2, {"Song Name": "Melt", "C": CHART_ID}, record, {"C": CHART_LINK}),
+        existing_song,
+    )
+
+    assert (pdfs, checksums, downloaded) == ({"C": "/pdfs/melt/melt-c.pdf"}, {"C": CHART_MD5}, False)
+    assert google_api.requests == []
+
+def test_parse_pdfs_rehashes_a_chart_whose_indexed_size_differs(index, tmp_path, google_api, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = sheet_sync.SongSyncManager()
+    manager.session.set_drive_index(index)
+    record = SongDataAccess(manager.session).get_records_bulk([("メルト", "ryo")])[("メルト", "ryo")]
+
+    pdf_path = os.path.join(manager.pdf_dir, "melt", "melt-c.pdf")
+    os.makedirs(os.path.dirname(pdf_path))
+    with open(pdf_path, "wb") as f:
+        f.write(b"truncated")
+    existing_song = {"pdfs": {"C": "/pdfs/melt/melt-c.pdf"}, "pdfChecksums": {"C": CHART_MD5}}
+    google_api.route("GET", f"/drive/v3/files/{CHART_ID}", lambda request, params: CHART)
+
+    pdfs, _, checksums, downloaded = manager._parse_pdfs_new(
+        SheetRow(2, {"Song Name": "Melt", "C": CHART_ID}, record, {"C": CHART_LINK}),
+        existing_song,
+    )
+
+    assert (pdfs, checksums, downloaded) == ({"C": "/pdfs/melt/melt-c.pdf"}, {"C": CHART_MD5}, True)
+    with open(pdf_path, "rb") as f:
+        assert f.read() == CHART
+
+def test_index_answers_listing_queries(index):
+    assert index.covers("lead-sheets") and index.covers("folder-melt")
+    assert not index.covers(CHART_ID) and not index.covers("elsewhere")
+    assert [file["id"] for file in index.children("lead-sheets", FOLDER)] == ["folder-melt"]
+    assert [file["id"] for file in index.children(["folder-melt"], PDF)] == [CHART_ID]
+    assert [file["id"] for file in index.find("folder-melt", "ryo - メルト-C.pdf")] == [CHART_ID]
+    assert index.stats()["files"] == 2 and index.stats()["folders"] == 1
+
+def test_refresh_drops_removed_folders_with_their_contents(index, drive_changes):
+    drive_changes.log("folder-melt", removed=True)
+
+    assert index.refresh(GDriveSession()) == 1
+    assert index.get("folder-melt") is None
+    assert index.get(CHART_ID) is None
+
+def test_refresh_drops_trashed_files(index, drive_changes):
+    drive_changes.log(CHART_ID, name="ryo - メルト-C.pdf", mimeType=PDF, parents=["folder-melt"], trashed=True)
+
+    assert index.refresh(GDriveSession()) == 1
+    assert index.get(CHART_ID) is None
+    assert index.get("folder-melt") is not None
+
+def test_refresh_drops_files_moved_out_of_the_tree(index, drive_changes):
+    drive_changes.log(CHART_ID, name="ryo - メルト-C.pdf", mimeType=PDF, parents=["archive"])
+
+    assert index.refresh(GDriveSession()) == 1
+    assert index.get(CHART_ID) is None
+
+def test_refresh_crawls_folders_moved_into_the_tree(index, drive_files, drive_changes):
+    # A song folder prepared elsewhere, then moved into Lead Sheets: only the folder itself shows up as a change
+    drive_files.add("folder-ghost-rule", "DECO*27 - ゴーストルール", "lead-sheets", mimeType=FOLDER)
+    drive_files.add("ghost-rule-vocals", "DECO*27 - ゴーストルール-Vocals.pdf", "folder-ghost-rule", mimeType=PDF)
+    drive_changes.log("folder-ghost-rule", name="DECO*27 - ゴーストルール", mimeType=FOLDER, parents=["lead-sheets"])
+
+    assert index.refresh(GDriveSession()) == 1
+    assert index.covers("folder-ghost-rule")
+    assert [file["id"] for file in index.children("folder-ghost-rule")] == ["ghost-rule-vocals"]
+
+def test_refresh_ignores_changes_outside_of_the_tree(index, drive_changes):
+    drive_changes.log("minutes", name="Meeting minutes", mimeType="application/vnd.google-apps.document", parents=["x"])
+    drive_changes.log("gone", removed=True)
+
+    assert index.refresh(GDriveSession()) == 0
+    assert index.get("minutes") is None
+    assert index.stats()["files"] == 2
+
+def test_refresh_needs_a_built_index(tmp_path, drive_changes):
+    with pytest.raises(ValueError, match="has not been built"):
+        DriveIndex(tmp_path / "empty.sqlite").refresh(GDriveSession())
+
+def test_build_or_refresh_rebuilds_when_the_changes_token_is_rejected(index, drive_files):
+    with index._lock:
+        index._set_meta("changesPageToken", "expired")
+    drive_files.add("folder-ghost-rule", "DECO*27 - ゴーストルール", "lead-sheets", mimeType=FOLDER)
+
+    index.build_or_refresh(GDriveSession(), pathlib.Path(SongDataAccess.CHART_BASE_DIR))
+
+    assert index.covers("folder-ghost-rule")
+    assert index.stats()["files"] == 3
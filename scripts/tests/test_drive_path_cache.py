@@ -0,0 +1,171 @@
+import pathlib
+import threading
+import time
+
+import pytest
+
+import drive_path_cache
+from drive_path_cache import DrivePathCache
+from fake_google import FakeDriveChanges, FakeDriveFiles
+from gdrive_session import GDriveSession
+
+FOLDER = GDriveSession.MIME_TYPE_DRIVE_FOLDER
+
+LEAD_SHEETS = pathlib.PurePosixPath("Lead Sheets")
+MELT = LEAD_SHEETS / "ryo - Melt"
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    """The cache's time.time(), as a one item list tests can move forward"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(drive_path_cache.time, "time", lambda: now[0])
+    return now
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = DrivePathCache(ttl_seconds=60)
+    cache.put("root", MELT, "folder-melt")
+
+    clock[0] += 60
+    assert cache.get("root", MELT) == "folder-melt"
+    clock[0] += 1
+    assert cache.get("root", MELT) is None
+
+def test_expired_entries_are_resolved_again(clock):
+    cache = DrivePathCache(ttl_seconds=60)
+    cache.put("root", MELT, "old")
+    clock[0] += 61
+
+    assert cache.resolve("root", MELT, lambda: "new") == "new"
+    assert cache.get("root", MELT) == "new"
+
+def test_entries_persist_between_instances(tmp_path):
+    cache_file = tmp_path / "paths.json"
+    DrivePathCache(cache_file).put("root", MELT, "folder-melt")
+
+    assert DrivePathCache(cache_file).get("root", MELT) == "folder-melt"
+    assert DrivePathCache(cache_file).get("other-root", MELT) is None
+
+def test_unreadable_cache_file_is_ignored(tmp_path):
+    cache_file = tmp_path / "paths.json"
+    cache_file.write_text("{not json")
+
+    assert DrivePathCache(cache_file).get("root", MELT) is None
+
+def test_concurrent_lookups_of_a_path_share_one_load():
+    cache = DrivePathCache()
+    release = threading.Event()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        assert release.wait(5)
+        return "folder-melt"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.resolve("root", MELT, loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Let every thread reach resolve() before the single load finishes
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["folder-melt"] * 8
+    assert len(loads) == 1
+
+def test_failed_loads_reach_every_waiter_and_are_not_cached():
+    cache = DrivePathCache()
+    started, release = threading.Event(), threading.Event()
+
+    def loader():
+        started.set()
+        assert release.wait(5)
+        raise ValueError("not found")
+
+    errors = []
+
+    def resolve():
+        try:
+            cache.resolve("root", MELT, loader)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=resolve)
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=resolve)
+    follower.start()
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert [str(e) for e in errors] == ["not found", "not found"]
+    assert cache.get("root", MELT) is None
+
+def test_invalidating_a_path_drops_everything_below_it():
+    cache = DrivePathCache()
+    cache.put("root", LEAD_SHEETS, "lead-sheets")
+    cache.put("root", MELT, "folder-melt")
+    cache.put("root", pathlib.PurePosixPath("Lead Sheets 2"), "other")
+
+    cache.invalidate("root", LEAD_SHEETS)
+
+    assert cache.get("root", LEAD_SHEETS) is None
+    assert cache.get("root", MELT) is None
+    assert cache.get("root", pathlib.PurePosixPath("Lead Sheets 2")) == "other"
+
+def test_invalidating_ids_drops_their_paths_and_everything_below_them():
+    cache = DrivePathCache()
+    cache.put("root", LEAD_SHEETS, "lead-sheets")
+    cache.put("root", MELT, "folder-melt")
+    cache.put("root", MELT / "Old", "folder-old")
+    cache.put("root", LEAD_SHEETS / "DECO*27 - Ghost Rule", "folder-ghost-rule")
+
+    assert cache.invalidate_ids(["folder-melt", "unknown"]) == 2
+
+    assert cache.get("root", LEAD_SHEETS) == "lead-sheets"
+    assert cache.get("root", MELT) is None
+    assert cache.get("root", MELT / "Old") is None
+    assert cache.get("root", LEAD_SHEETS / "DECO*27 - Ghost Rule") == "folder-ghost-rule"
+    assert cache.invalidate_ids(["unknown"]) == 0
+
+@pytest.fixture
+def drive_files(google_api) -> FakeDriveFiles:
+    drive_files = FakeDriveFiles(google_api)
+    drive_files.add("lead-sheets", "Lead Sheets", "drive-root", mimeType=FOLDER)
+    drive_files.add("folder-melt", "ryo - Melt", "lead-sheets", mimeType=FOLDER)
+    return drive_files
+
+@pytest.fixture
+def drive_changes(google_api) -> FakeDriveChanges:
+    return FakeDriveChanges(google_api)
+
+def test_folder_changes_drop_cached_paths(drive_files, drive_changes, google_api):
+    session = GDriveSession(path_cache=DrivePathCache())
+    assert session.find_drive_id_by_dir(pathlib.Path(MELT)) == "folder-melt"
+    token = session.get_changes_start_page_token()
+
+    # The folder is renamed and a new one takes its old name
+    drive_files.files["folder-melt"]["name"] = "ryo - Melt (old)"
+    drive_changes.log("folder-melt", name="ryo - Melt (old)", mimeType=FOLDER, parents=["lead-sheets"])
+    drive_files.add("folder-melt-2", "ryo - Melt", "lead-sheets", mimeType=FOLDER)
+    drive_changes.log("folder-melt-2", name="ryo - Melt", mimeType=FOLDER, parents=["lead-sheets"])
+    session.list_changes(token)
+
+    assert session.find_drive_id_by_dir(pathlib.Path(MELT)) == "folder-melt-2"
+    # Lead Sheets itself didn't change, so it still comes from the cache
+    lookups = [request for request in google_api.requests if "Lead+Sheets" in request.url]
+    assert len(lookups) == 1
+
+def test_removed_folders_drop_cached_paths(drive_files, drive_changes):
+    session = GDriveSession(path_cache=DrivePathCache())
+    session.find_drive_id_by_dir(pathlib.Path(MELT))
+    token = session.get_changes_start_page_token()
+
+    del drive_files.files["folder-melt"]
+    drive_changes.log("folder-melt", removed=True)
+    session.list_changes(token)
+
+    with pytest.raises(ValueError, match="could not find 'ryo - Melt'"):
+        session.find_drive_id_by_dir(pathlib.Path(MELT))
@@ -0,0 +1,101 @@
+import json
+import time
+import datetime
+import threading
+import concurrent.futures
+
+import pytest
+import google.auth.credentials
+from google.auth.transport.requests import AuthorizedSession
+
+from env_config import SharedCredentials
+
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+class FakeServiceAccount(google.auth.credentials.Credentials):
+    """Credentials which exchange for a token like a service account does: one POST to the token endpoint"""
+
+    def refresh(self, request) -> None:
+        response = request(url=TOKEN_URI, method="POST", body=b"grant_type=jwt-bearer")
+        payload = json.loads(response.data)
+        self.token = payload["access_token"]
+        self.expiry = (
+            datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+            + datetime.timedelta(seconds=payload["expires_in"])
+        )
+
+def token_exchange(issued: list[str], delay: float = 0):
+    """Token endpoint handler handing out token-1, token-2, ... after delay seconds, appending them to issued"""
+    def exchange(request, params):
+        time.sleep(delay)
+        issued.append(f"token-{len(issued) + 1}")
+        return {"access_token": issued[-1], "expires_in": 3600, "token_type": "Bearer"}
+    return exchange
+
+@pytest.fixture
+def token_endpoint(google_api) -> list[str]:
+    """Serves the OAuth token endpoint; returns the tokens issued so far"""
+    issued = []
+    google_api.route("POST", "/token", token_exchange(issued))
+    return issued
+
+@pytest.fixture
+def credentials() -> SharedCredentials:
+    return SharedCredentials(FakeServiceAccount())
+
+def test_token_exchanges_are_recorded(credentials, token_endpoint, http_metrics):
+    credentials.ensure_valid()
+
+    assert credentials.token == "token-1"
+    endpoint = http_metrics.report()["endpoints"]["oauth2.token"]
+    assert endpoint["calls"] == 1
+    assert endpoint["statusCodes"] == {"200": 1}
+
+def test_authorized_session_refreshes_are_recorded(credentials, token_endpoint, google_api, http_metrics):
+    statuses = iter([401, 200])
+    google_api.route("GET", "/drive/v3/files", lambda request, params: (next(statuses), {}))
+    session = AuthorizedSession(credentials)
+
+    response = session.get("https://www.googleapis.com/drive/v3/files")
+
+    assert response.status_code == 200
+    # One exchange before the first request, and one after the 401
+    assert token_endpoint == ["token-1", "token-2"]
+    assert google_api.requests[-1].headers["Authorization"] == "Bearer token-2"
+    assert http_metrics.report()["endpoints"]["oauth2.token"]["calls"] == 2
+
+def test_token_is_cached_until_it_nearly_expires(credentials, token_endpoint):
+    assert credentials.auth_header() == {"Authorization": "Bearer token-1"}
+    assert credentials.auth_header() == {"Authorization": "Bearer token-1"}
+
+    credentials.expiry = (
+        datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + SharedCredentials.REFRESH_MARGIN / 2
+    )
+
+    assert credentials.auth_header() == {"Authorization": "Bearer token-2"}
+    assert credentials.refresh_count == 2
+
+def test_concurrent_401s_refresh_once(credentials, token_endpoint, google_api):
+    credentials.ensure_valid()
+    google_api.route("POST", "/token", token_exchange(token_endpoint, delay=0.2))
+    ready = threading.Barrier(8)
+
+    def rejected():
+        ready.wait()
+        credentials.refresh(None)
+
+    threads = [threading.Thread(target=rejected) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert token_endpoint == ["token-1", "token-2"]
+    assert credentials.token == "token-2"
+
+def test_concurrent_expiry_refreshes_once(credentials, token_endpoint):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+        headers = list(executor.map(lambda _: credentials.auth_header(), range(64)))
+
+    assert token_endpoint == ["token-1"]
+    assert all(header == {"Authorization": "Bearer token-1"} for header in headers)
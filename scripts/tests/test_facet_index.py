@@ -0,0 +1,75 @@
+import base64
+import json
+
+from catalog_index import FacetIndex
+
+def build(songs: dict[str, dict]) -> dict:
+    index = FacetIndex()
+    for filename, frontend_data in songs.items():
+        index.add(filename, frontend_data)
+    return json.loads(index.to_bytes())
+
+def song_ids(encoded: str | list[int]) -> list[int]:
+    """The song numbers of a set of songs of the index, decoded the way src/utils/facetIndex.ts does"""
+    if isinstance(encoded, list):
+        return encoded
+    bitset = base64.b64decode(encoded)
+    return [i for i in range(len(bitset) * 8) if bitset[i >> 3] & (1 << (i & 7))]
+
+def catalog(size: int) -> dict[str, dict]:
+    """size songs ("song-0000.json"...), every one by producer "ryo" and with a C chart, every third with a Bb chart"""
+    return {
+        f"song-{i:04}.json": {
+            "title": f"Song {i}",
+            "producer": "ryo",
+            "pdfs": {"C": f"c-{i}.pdf", **({"Bb": f"bb-{i}.pdf"} if i % 3 == 0 else {})},
+        }
+        for i in range(size)
+    }
+
+def test_bitsets_are_little_endian_with_bit_i_for_song_i():
+    payload = build(catalog(20))
+
+    # Songs 0, 3, 6, ..., 18: 0b01001001 0b10010010 0b00000100
+    assert base64.b64decode(payload["keys"]["Bb"]) == bytes([0b01001001, 0b10010010, 0b00000100])
+    assert base64.b64decode(payload["keys"]["C"]) == bytes([0xFF, 0xFF, 0x0F])
+    assert song_ids(payload["facets"]["producer"]["ryo"]["songs"]) == list(range(20))
+
+def test_small_sets_are_listed_by_song_number():
+    songs = catalog(200)
+    songs["song-0042.json"]["additionalProducers"] = ["kz"]
+    songs["song-0150.json"]["labels"] = ["Magical Mirai", "Project DIVA"]
+    songs["song-0199.json"]["labels"] = ["Project DIVA"]
+
+    payload = build(songs)
+
+    assert payload["facets"]["producer"]["kz"] == {"count": 1, "songs": [42]}
+    assert payload["facets"]["label"]["Project DIVA"] == {"count": 2, "songs": [150, 199]}
+    # Sets holding a good part of the catalog stay bitsets
+    assert isinstance(payload["facets"]["producer"]["ryo"]["songs"], str)
+    assert isinstance(payload["keys"]["Bb"], str)
+
+def test_every_set_is_written_in_its_shorter_form():
+    songs = catalog(300)
+    for i in range(0, 300, 10):
+        songs[f"song-{i:04}.json"]["singer"] = "Hatsune Miku" if i % 20 else "Kagamine Rin"
+
+    payload = build(songs)
+
+    for value in [*payload["facets"]["singer"].values(), *payload["facets"]["producer"].values()]:
+        ids = song_ids(value["songs"])
+        assert len(ids) == value["count"]
+        bits = sum(1 << i for i in ids)
+        bitset_length = len(json.dumps(FacetIndex._encode_bitset(bits, len(payload["songs"]))))
+        assert len(json.dumps(value["songs"], separators=(",", ":"))) <= bitset_length
+
+def test_songs_are_numbered_in_filename_order():
+    payload = build({
+        "b.json": {"title": "B", "status": "Completed", "pdfsTvSize": {"C": "b-tv.pdf"}},
+        "a.json": {"title": "A", "status": "Completed"},
+    })
+
+    assert payload["songs"] == ["a.json", "b.json"]
+    assert payload["titles"] == ["A", "B"]
+    assert song_ids(payload["facets"]["status"]["Completed"]["songs"]) == [0, 1]
+    assert song_ids(payload["tvSize"]) == song_ids(payload["tvSizeKeys"]["C"]) == [1]
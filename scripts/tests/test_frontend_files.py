@@ -0,0 +1,165 @@
+import dataclasses
+import json
+import os
+import stat
+
+import pytest
+
+import frontend_files
+import sheet_sync
+from catalog_song import CatalogSong
+from frontend_files import FrontendFiles
+
+@pytest.fixture
+def opened(monkeypatch) -> list[str]:
+    """Every path frontend_files opens"""
+    opened = []
+
+    def counting_open(path, *args, **kwargs):
+        opened.append(os.fspath(path))
+        return open(path, *args, **kwargs)
+
+    monkeypatch.setattr(frontend_files, "open", counting_open, raising=False)
+    return opened
+
+def test_files_are_read_once(tmp_path, opened):
+    path = tmp_path / "melt.json"
+    path.write_bytes(b"{}")
+    files = FrontendFiles()
+
+    assert files.read(path) == b"{}"
+    path.write_bytes(b"changed behind our back")
+    assert files.read(path) == b"{}"
+    assert files.read(tmp_path / "missing.json") is None
+    assert files.read(tmp_path / "missing.json") is None
+    assert opened == [str(path), str(tmp_path / "missing.json")]
+
+def test_preloaded_files_are_answered_from_memory(tmp_path, opened):
+    paths = [tmp_path / f"song-{i}.json" for i in range(5)]
+    for i, path in enumerate(paths):
+        path.write_bytes(str(i).encode())
+    files = FrontendFiles()
+
+    contents = files.preload(paths + [tmp_path / "missing.json"], workers=3)
+
+    assert list(contents.values()) == [b"0", b"1", b"2", b"3", b"4", None]
+    assert [files.read(path) for path in paths] == [b"0", b"1", b"2", b"3", b"4"]
+    assert len(opened) == 6
+
+def test_unchanged_files_are_not_written(tmp_path):
+    path = tmp_path / "melt.json"
+    path.write_bytes(b"{}")
+    os.utime(path, (1_000_000, 1_000_000))
+    files = FrontendFiles()
+
+    assert not files.write(path, b"{}")
+    assert path.stat().st_mtime == 1_000_000
+
+def test_changed_files_are_replaced(tmp_path, opened):
+    path = tmp_path / "data" / "melt.json"
+    files = FrontendFiles()
+
+    assert files.write(path, b"{}")
+    assert files.write(path, b'{"bpm":95}')
+    assert not files.write(path, b'{"bpm":95}')
+
+    assert path.read_bytes() == b'{"bpm":95}'
+    assert stat.S_IMODE(path.stat().st_mode) == FrontendFiles.FILE_MODE
+    assert os.listdir(path.parent) == ["melt.json"]
+    # Only the first write had to look at the disk
+    assert opened == [str(path)]
+
+def test_failed_writes_leave_the_file_alone(tmp_path, monkeypatch):
+    path = tmp_path / "melt.json"
+    path.write_bytes(b"{}")
+    files = FrontendFiles()
+
+    def failing_replace(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(frontend_files.os, "replace", failing_replace)
+    with pytest.raises(OSError, match="disk full"):
+        files.write(path, b'{"bpm":95}')
+
+    assert path.read_bytes() == b"{}"
+    assert os.listdir(tmp_path) == ["melt.json"]
+    assert files.read(path) == b"{}"
+
+def test_deleted_files_read_as_missing(tmp_path):
+    path = tmp_path / "melt.json"
+    path.write_bytes(b"{}")
+    files = FrontendFiles()
+
+    files.delete(path)
+
+    assert not path.exists()
+    assert files.read(path) is None
+    assert files.write(path, b"{}")
+
+MELT = CatalogSong.from_frontend_json({"title": "Melt", "producer": "ryo", "singer": "Hatsune Miku", "bpm": 95})
+LAG = CatalogSong.from_frontend_json({"title": "Lag", "producer": "Nanou", "singer": "Hatsune Miku"})
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch) -> sheet_sync.SongSyncManager:
+    monkeypatch.chdir(tmp_path)
+    return sheet_sync.SongSyncManager(use_drive_index=False)
+
+def generated_files() -> dict[str, int]:
+    """The mtime of every frontend file the sync generated, by path"""
+    mtimes = {}
+    for directory, _, filenames in os.walk("frontend/src"):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            mtimes[path] = os.stat(path).st_mtime_ns
+    return mtimes
+
+def test_existing_catalog_is_read_once(manager, opened):
+    os.makedirs(manager.frontend_data_dir)
+    for name, song in (("melt", MELT), ("lag", LAG)):
+        with open(os.path.join(manager.frontend_data_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+            json.dump(song.to_frontend_dict(), f)
+    with open(os.path.join(manager.frontend_data_dir, "broken.json"), "w", encoding="utf-8") as f:
+        f.write("{not json")
+
+    assert set(manager.existing_catalog()) == {"melt.json", "lag.json"}
+    assert manager._load_existing_song_data("Melt") == MELT.to_frontend_dict()
+    manager.existing_catalog()
+    assert len(opened) == 3
+
+def test_a_second_run_writes_nothing(manager):
+    manager.song_digests = {"melt.json": MELT.digest, "lag.json": LAG.digest}
+    manager.update_frontend_files({"Melt": MELT, "Lag": LAG})
+    first_run = generated_files()
+
+    rerun = sheet_sync.SongSyncManager(use_drive_index=False)
+    rerun.synced_at_now = "2030-01-01T00:00:00Z"
+    rerun.song_digests = manager.song_digests
+    rerun.update_frontend_files({"Melt": MELT, "Lag": LAG})
+
+    assert generated_files() == first_run
+    with open(os.path.join(rerun.frontend_data_dir, "melt.json"), encoding="utf-8") as f:
+        assert json.load(f)["syncedAt"] == manager.synced_at_now
+
+def test_only_changed_songs_are_rewritten(manager):
+    manager.update_frontend_files({"Melt": MELT, "Lag": LAG})
+    lag_path = os.path.join(manager.frontend_data_dir, "lag.json")
+    os.utime(lag_path, ns=(1_000_000_000, 1_000_000_000))
+
+    rerun = sheet_sync.SongSyncManager(use_drive_index=False)
+    rerun.update_frontend_files({"Melt": dataclasses.replace(MELT, bpm=96), "Lag": LAG})
+
+    with open(os.path.join(rerun.frontend_data_dir, "melt.json"), encoding="utf-8") as f:
+        assert json.load(f)["bpm"] == 96
+    assert os.stat(lag_path).st_mtime_ns == 1_000_000_000
+
+def test_removed_songs_are_deleted_on_full_runs_only(manager):
+    manager.update_frontend_files({"Melt": MELT, "Lag": LAG})
+    lag_path = os.path.join(manager.frontend_data_dir, "lag.json")
+
+    song_slug_run = sheet_sync.SongSyncManager(use_drive_index=False)
+    song_slug_run.update_frontend_files({"Melt": MELT}, remove_orphans=False)
+    assert os.path.exists(lag_path)
+
+    full_run = sheet_sync.SongSyncManager(use_drive_index=False)
+    full_run.update_frontend_files({"Melt": MELT})
+    assert not os.path.exists(lag_path)
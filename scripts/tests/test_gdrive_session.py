@@ -0,0 +1,181 @@
+import hashlib
+import pathlib
+
+import pytest
+import requests
+
+from drive_index import DriveIndex
+from fake_google import FakeDriveFiles
+from gdrive_session import GDriveSession
+
+FOLDER = GDriveSession.MIME_TYPE_DRIVE_FOLDER
+PDF = GDriveSession.MIME_TYPE_PDF
+
+FILE_ID = "melt-C-0123456789abcdefghij"
+CONTENT = b"%PDF-1.7 ryo - Melt-C " * 64
+CONTENT_MD5 = hashlib.md5(CONTENT).hexdigest()
+
+class FakeMedia:
+    """alt=media downloads of a single file, honoring Range headers the way Drive does"""
+
+    def __init__(self, api, content: bytes):
+        self.content = content
+        self.ranges: list[str | None] = []
+        api.route("GET", f"/drive/v3/files/{FILE_ID}", self._get)
+
+    def _get(self, request, params):
+        assert params["alt"] == "media"
+        range_header = request.headers.get("Range")
+        self.ranges.append(range_header)
+        headers = {"Content-Type": GDriveSession.MIME_TYPE_PDF}
+        if range_header is None:
+            return 200, self.content, headers
+        start = int(range_header.removeprefix("bytes=").rstrip("-"))
+        if start >= len(self.content):
+            return 416, {"error": {"code": 416}}
+        return 206, self.content[start:], headers
+
+@pytest.fixture
+def media(google_api) -> FakeMedia:
+    return FakeMedia(google_api, CONTENT)
+
+@pytest.fixture
+def output(tmp_path) -> pathlib.Path:
+    return tmp_path / "charts" / "ryo - Melt-C.pdf"
+
+def leave_partial_download(output: pathlib.Path, content: bytes, md5: str | None) -> None:
+    output.parent.mkdir(parents=True, exist_ok=True)
+    pathlib.Path(f"{output}.part").write_bytes(content)
+    if md5 is not None:
+        pathlib.Path(f"{output}.part.md5").write_text(md5)
+
+def assert_downloaded(output: pathlib.Path, md5: str | None) -> None:
+    assert md5 == CONTENT_MD5
+    assert output.read_bytes() == CONTENT
+    assert not pathlib.Path(f"{output}.part").exists()
+    assert not pathlib.Path(f"{output}.part.md5").exists()
+
+def test_download_file(media, output):
+    assert_downloaded(output, GDriveSession().download_file(FILE_ID, str(output), CONTENT_MD5))
+    assert media.ranges == [None]
+
+def test_partial_download_of_the_same_version_is_resumed(media, output):
+    leave_partial_download(output, CONTENT[:100], CONTENT_MD5)
+
+    assert_downloaded(output, GDriveSession().download_file(FILE_ID, str(output), CONTENT_MD5))
+    assert media.ranges == ["bytes=100-"]
+
+def test_partial_download_of_another_version_is_discarded(media, output):
+    # Started before the file was replaced on Drive: resuming it would splice two versions together
+    leave_partial_download(output, b"%PDF-1.7 an older version of Melt", "0" * 32)
+
+    assert_downloaded(output, GDriveSession().download_file(FILE_ID, str(output), CONTENT_MD5))
+    assert media.ranges == [None]
+
+def test_partial_download_is_not_resumed_without_an_expected_md5(media, output):
+    leave_partial_download(output, b"%PDF-1.7 who knows", CONTENT_MD5)
+
+    assert_downloaded(output, GDriveSession().download_file(FILE_ID, str(output)))
+    assert media.ranges == [None]
+
+def test_unsatisfiable_range_starts_over(media, output):
+    # The partial file is longer than the remote one (e.g. it was truncated by hand)
+    leave_partial_download(output, CONTENT + b"trailing garbage", CONTENT_MD5)
+
+    assert_downloaded(output, GDriveSession().download_file(FILE_ID, str(output), CONTENT_MD5))
+    assert media.ranges == [f"bytes={len(CONTENT) + 16}-", None]
+
+def test_md5_mismatch_discards_the_partial_download(media, output):
+    media.content = b"%PDF-1.7 not what the metadata said"
+
+    assert GDriveSession().download_file(FILE_ID, str(output), CONTENT_MD5) is None
+    assert not output.exists()
+    assert not pathlib.Path(f"{output}.part").exists()
+    assert not pathlib.Path(f"{output}.part.md5").exists()
+
+def test_html_pages_are_rejected(media, output):
+    media.content = b"<!DOCTYPE html><html>Quota exceeded</html>"
+
+    assert GDriveSession().download_file(FILE_ID, str(output), CONTENT_MD5) is None
+    assert not output.exists()
+    assert not pathlib.Path(f"{output}.part").exists()
+
+@pytest.fixture
+def tree(google_api) -> FakeDriveFiles:
+    """Lead Sheets with three song folders of a few charts each (one nested a level deeper), listed 2 files a page"""
+    tree = FakeDriveFiles(google_api, page_size=2)
+    tree.add("lead-sheets", "Lead Sheets", "drive-root", mimeType=FOLDER)
+    for folder_id, name, keys in [
+        ("melt", "ryo - Melt", ["C", "Bb", "Eb"]),
+        ("ghost-rule", "DECO*27 - Ghost Rule", ["Vocals"]),
+        ("rolling-girl", "wowaka - Rolling Girl", []),
+    ]:
+        tree.add(folder_id, name, "lead-sheets", mimeType=FOLDER)
+        for key in keys:
+            tree.add(f"{folder_id}-{key}", f"{name}-{key}.pdf", folder_id, mimeType=PDF)
+    tree.add("rolling-girl-old", "Old", "rolling-girl", mimeType=FOLDER)
+    tree.add("rolling-girl-old-C", "wowaka - Rolling Girl-C.pdf", "rolling-girl-old", mimeType=PDF)
+    return tree
+
+def test_walk_yields_the_whole_tree_with_paths(tree):
+    walked = list(GDriveSession().walk(pathlib.Path("Lead Sheets"), max_workers=4))
+
+    paths = [path.as_posix() for path, _ in walked]
+    assert sorted(paths) == sorted([
+        "Lead Sheets/ryo - Melt",
+        "Lead Sheets/ryo - Melt/ryo - Melt-C.pdf",
+        "Lead Sheets/ryo - Melt/ryo - Melt-Bb.pdf",
+        "Lead Sheets/ryo - Melt/ryo - Melt-Eb.pdf",
+        "Lead Sheets/DECO*27 - Ghost Rule",
+        "Lead Sheets/DECO*27 - Ghost Rule/DECO*27 - Ghost Rule-Vocals.pdf",
+        "Lead Sheets/wowaka - Rolling Girl",
+        "Lead Sheets/wowaka - Rolling Girl/Old",
+        "Lead Sheets/wowaka - Rolling Girl/Old/wowaka - Rolling Girl-C.pdf",
+    ])
+    # Folders come before anything inside of them
+    for path in paths:
+        parent = path.rsplit("/", 1)[0]
+        assert parent == "Lead Sheets" or paths.index(parent) < paths.index(path)
+    assert {metadata["id"]: metadata["parents"] for _, metadata in walked}["melt-Bb"] == ["melt"]
+
+def test_walk_yields_files_before_their_folder_is_fully_listed(tree, google_api):
+    walk = GDriveSession().walk(pathlib.Path("Lead Sheets/ryo - Melt"), max_workers=1)
+
+    first_path, _ = next(walk)
+
+    # Only the first page of the folder (and the lookups of its path) had to arrive
+    assert first_path.parent == pathlib.PurePosixPath("Lead Sheets/ryo - Melt")
+    listings = [request for request in google_api.requests if "%27melt%27+in+parents" in request.url]
+    assert len(listings) <= 2
+    walk.close()
+
+def test_walk_raises_listing_errors(tree, google_api):
+    list_files = google_api._handlers[("GET", FakeDriveFiles.FILES_PATH)]
+
+    def failing_list(request, params):
+        if "'ghost-rule' in parents" in params.get("q", ""):
+            return 404, {"error": {"code": 404, "message": "File not found"}}
+        return list_files(request, params)
+    google_api.route("GET", FakeDriveFiles.FILES_PATH, failing_list)
+
+    with pytest.raises(requests.HTTPError, match="404"):
+        list(GDriveSession().walk(pathlib.Path("Lead Sheets")))
+
+def test_walk_lists_folders_covered_by_the_drive_index_locally(tree, google_api, tmp_path):
+    drive_index = DriveIndex(tmp_path / "drive_index.sqlite")
+    # The index only mirrors Melt's folder
+    for file_id in ("melt", "melt-C", "melt-Bb", "melt-Eb"):
+        drive_index._upsert(tree.files[file_id])
+    session = GDriveSession(drive_index=drive_index)
+
+    walked = {path.as_posix() for path, _ in session.walk(pathlib.Path("Lead Sheets"))}
+
+    assert len(walked) == 9
+    # Every folder but Melt's was listed live
+    folder_ids = ("lead-sheets", "melt", "ghost-rule", "rolling-girl", "rolling-girl-old")
+    listed = {
+        folder_id for request in google_api.requests for folder_id in folder_ids
+        if f"%27{folder_id}%27+in+parents" in request.url
+    }
+    assert listed == {"lead-sheets", "ghost-rule", "rolling-girl", "rolling-girl-old"}
+    drive_index.close()
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+import requests
+
+from http_metrics import LATENCY_BUCKETS_MS, HttpMetrics, classify_endpoint
+from rate_limit import rate_limit_session
+
+@pytest.mark.parametrize("method, url, endpoint", [
+    ("GET", "https://sheets.googleapis.com/v4/spreadsheets/abc", "sheets.spreadsheets.get"),
+    ("GET", "https://sheets.googleapis.com/v4/spreadsheets/abc/values/Sheet1!A1:Z", "sheets.values"),
+    ("POST", "https://sheets.googleapis.com/v4/spreadsheets/abc:batchUpdate", "sheets.spreadsheets.batchUpdate"),
+    ("POST", "https://oauth2.googleapis.com/token", "oauth2.token"),
+    ("POST", "https://accounts.example.com/o/oauth2/token", "oauth2.token"),
+    ("POST", "https://www.googleapis.com/batch/drive/v3", "drive.batch"),
+    ("GET", "https://www.googleapis.com/drive/v3/changes?pageToken=1", "drive.changes.list"),
+    ("GET", "https://www.googleapis.com/drive/v3/changes/startPageToken", "drive.changes.startPageToken"),
+    ("GET", "https://www.googleapis.com/drive/v3/files?q=x", "drive.files.list"),
+    ("GET", "https://www.googleapis.com/drive/v3/files/", "drive.files.list"),
+    ("GET", "https://www.googleapis.com/drive/v3/files/abc?fields=id", "drive.files.get"),
+    ("GET", "https://www.googleapis.com/drive/v3/files/abc?alt=media", "drive.files.download"),
+    ("GET", "https://drive.google.com/uc?export=download&id=abc", "get drive.google.com"),
+])
+def test_classify_endpoint(method, url, endpoint):
+    assert classify_endpoint(method, url) == endpoint
+
+def test_record_accumulates_per_endpoint():
+    metrics = HttpMetrics()
+    metrics.record("drive.files.list", 0.04, 200, bytes_sent=10, bytes_received=1000)
+    metrics.record("drive.files.list", 0.3, 429, bytes_received=50)
+    metrics.record_retry("drive.files.list")
+    metrics.record("drive.files.list", 20, None, bytes_sent=10)
+    metrics.record("drive.files.get", 0.1, 200)
+
+    endpoint = metrics.report()["endpoints"]["drive.files.list"]
+
+    assert endpoint["calls"] == 3
+    assert endpoint["retries"] == 1
+    assert endpoint["errors"] == 1
+    assert endpoint["statusCodes"] == {"200": 1, "429": 1}
+    assert endpoint["bytesSent"] == 20
+    assert endpoint["bytesReceived"] == 1050
+    assert endpoint["latency"]["totalSeconds"] == 20.34
+    assert endpoint["latency"]["meanSeconds"] == 6.78
+    assert endpoint["latency"]["maxSeconds"] == 20
+    assert endpoint["latency"]["histogramMs"] == {
+        "<=50": 1, "<=100": 0, "<=250": 0, "<=500": 1, "<=1000": 0, "<=2500": 0, "<=5000": 0, "<=10000": 0, ">10000": 1
+    }
+
+def test_latency_bucket_bounds_are_inclusive():
+    metrics = HttpMetrics()
+    for bound in LATENCY_BUCKETS_MS:
+        metrics.record("x", bound / 1000, 200)
+
+    histogram = metrics.report()["endpoints"]["x"]["latency"]["histogramMs"]
+
+    assert list(histogram.values()) == [1] * len(LATENCY_BUCKETS_MS) + [0]
+
+def test_report_shape():
+    metrics = HttpMetrics()
+    metrics.record("sheets.values", 0.2, 200, bytes_sent=5, bytes_received=500)
+    metrics.record("drive.batch", 0.5, 500, bytes_sent=100, bytes_received=10)
+    metrics.record_retry("drive.batch")
+
+    report = metrics.report()
+
+    assert set(report) == {"version", "startedAt", "wallSeconds", "totals", "endpoints"}
+    assert report["version"] == 1
+    assert list(report["endpoints"]) == ["drive.batch", "sheets.values"]
+    assert set(report["endpoints"]["drive.batch"]) == {
+        "calls", "retries", "errors", "statusCodes", "bytesSent", "bytesReceived", "latency"
+    }
+    assert report["totals"] == {
+        "calls": 2, "retries": 1, "errors": 0, "bytesSent": 105, "bytesReceived": 510, "latencySeconds": 0.7
+    }
+
+def test_empty_report():
+    report = HttpMetrics().report()
+
+    assert report["endpoints"] == {}
+    assert report["totals"]["calls"] == 0
+
+def test_write_report(tmp_path):
+    metrics = HttpMetrics()
+    metrics.record("drive.files.get", 0.1, 200)
+    path = tmp_path / "reports" / "http_report.json"
+
+    report = metrics.write_report(path)
+
+    assert json.loads(path.read_text()) == report
+    assert list(path.parent.iterdir()) == [path]
+
+def test_rate_limited_session_records_every_call(google_api, http_metrics):
+    google_api.route("GET", "/drive/v3/files/abc", lambda request, params: {"id": "abc"})
+    session = rate_limit_session(requests.Session())
+
+    session.get("https://www.googleapis.com/drive/v3/files/abc")
+    session.get("https://www.googleapis.com/drive/v3/files/missing")
+
+    endpoint = http_metrics.report()["endpoints"]["drive.files.get"]
+    assert endpoint["calls"] == 2
+    assert endpoint["statusCodes"] == {"200": 1, "404": 1}
+    assert endpoint["bytesReceived"] > 0
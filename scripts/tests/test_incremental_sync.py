@@ -0,0 +1,120 @@
+import pytest
+
+import sheet_sync
+from catalog_song import SheetRow
+
+SONGS = "Songs"
+TV_SIZE = sheet_sync.SongSyncManager.TV_SIZE_WORKSHEET
+SHEET_TIME = "2024-03-01T00:00:00Z"
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch) -> sheet_sync.SongSyncManager:
+    monkeypatch.chdir(tmp_path)
+    manager = sheet_sync.SongSyncManager(use_drive_index=False)
+    manager.worksheet_title = SONGS
+    manager.sheet_modified_time = SHEET_TIME
+    manager.drive_changes = []
+    return manager
+
+def rows(*values: dict, hyperlinks: dict | None = None) -> list[SheetRow]:
+    return [SheetRow(index + 2, row, None, hyperlinks) for index, row in enumerate(values)]
+
+def set_rows(manager: sheet_sync.SongSyncManager, songs: list[SheetRow], tv_size: list[SheetRow] = ()) -> None:
+    manager.worksheet_rows = {SONGS: list(songs), TV_SIZE: list(tv_size)}
+    manager.row_hashes = manager._compute_row_hashes()
+
+MELT = {"Song Name": "Melt", "Producer": "ryo", "Status": "Completed"}
+LAG = {"Song Name": "Lag", "Producer": "Nanou", "Status": "Completed"}
+
+def test_row_hashes_are_per_song_and_worksheet(manager):
+    set_rows(manager, rows(MELT, LAG, {"Song Name": ""}), rows({"Song Name": "Melt", "C": "tv-c"}))
+
+    assert set(manager.row_hashes["songs"]) == {"melt", "lag"}
+    assert set(manager.row_hashes["tvSize"]) == {"melt"}
+    assert manager.row_hashes["songs"]["melt"] != manager.row_hashes["tvSize"]["melt"]
+
+def test_row_hashes_follow_cells_and_links(manager):
+    set_rows(manager, rows(MELT))
+    original = manager.row_hashes["songs"]["melt"]
+
+    set_rows(manager, rows(MELT))
+    assert manager.row_hashes["songs"]["melt"] == original
+    set_rows(manager, rows({**MELT, "Status": "In Progress"}))
+    assert manager.row_hashes["songs"]["melt"] != original
+    set_rows(manager, rows(MELT, hyperlinks={"C": "https://drive.google.com/file/d/other/view"}))
+    assert manager.row_hashes["songs"]["melt"] != original
+
+def test_songs_spanning_several_rows_hash_every_row(manager):
+    set_rows(manager, rows(MELT, {**MELT, "Arranger": "someone"}))
+    both = manager.row_hashes["songs"]["melt"]
+
+    set_rows(manager, rows(MELT, {**MELT, "Arranger": "someone else"}))
+    assert manager.row_hashes["songs"]["melt"] != both
+
+def test_changed_rows_are_added_edited_or_removed_songs(manager):
+    set_rows(manager, rows(MELT, LAG), rows(MELT))
+    last_state = {"rowHashes": manager.row_hashes}
+
+    set_rows(manager, rows({**MELT, "Status": "In Progress"}, {"Song Name": "Ghost Rule"}))
+
+    # Melt was edited (and lost its TV size row), Lag was removed and Ghost Rule was added
+    assert manager._changed_rows_since(last_state) == {"melt", "lag", "ghost-rule"}
+
+@pytest.fixture
+def last_state(manager) -> dict:
+    set_rows(manager, rows(MELT, LAG))
+    return {
+        "changesPageToken": "5",
+        "sheetModifiedTime": SHEET_TIME,
+        "rowHashes": manager.row_hashes,
+        "driveFileIndex": {"chart-melt-c": {"slug": "melt", "key": "C", "tv": False}},
+        "driveFolderIndex": {"folder-lag": "lag"},
+        "songBasenames": {"ryo - Melt": "melt", "Nanou - Lag": "lag"},
+    }
+
+def test_nothing_affected_when_nothing_changed(manager, last_state):
+    assert manager._affected_songs_since(last_state) == set()
+
+def test_drive_changes_affect_their_songs(manager, last_state):
+    manager.drive_changes = [
+        {"fileId": "chart-melt-c", "removed": True},
+        {"fileId": "unrelated", "removed": False, "file": {"id": "unrelated", "name": "x.txt", "parents": ["y"]}},
+    ]
+
+    assert manager._affected_songs_since(last_state) == {"melt"}
+
+def test_sheet_edits_affect_the_edited_songs(manager, last_state):
+    set_rows(manager, rows(MELT, {**LAG, "Status": "In Progress"}))
+    manager.sheet_modified_time = "2024-03-02T00:00:00Z"
+
+    assert manager._affected_songs_since(last_state) == {"lag"}
+
+def test_rows_are_only_compared_when_the_sheet_changed(manager, last_state):
+    set_rows(manager, rows(MELT, {**LAG, "Status": "In Progress"}))
+
+    assert manager._affected_songs_since(last_state) == set()
+
+def test_drive_changes_and_sheet_edits_add_up(manager, last_state):
+    set_rows(manager, rows({**MELT, "Status": "In Progress"}, LAG))
+    manager.sheet_modified_time = "2024-03-02T00:00:00Z"
+    new_chart = {"id": "new", "name": "Nanou - Lag-F.pdf", "parents": ["folder-lag"]}
+    manager.drive_changes = [{"fileId": "new", "removed": False, "file": new_chart}]
+
+    assert manager._affected_songs_since(last_state) == {"melt", "lag"}
+
+@pytest.mark.parametrize("state_change, drive_changes", [
+    # No changes token saved yet
+    ({"changesPageToken": None}, []),
+    # The sheet changed and there are no row hashes to tell which rows
+    ({"rowHashes": None, "sheetModifiedTime": "2024-02-01T00:00:00Z"}, []),
+    # The Drive changes couldn't be listed
+    ({}, None),
+])
+def test_full_sync_when_changes_cannot_be_worked_out(manager, last_state, state_change, drive_changes):
+    last_state = {key: value for key, value in {**last_state, **state_change}.items() if value is not None}
+    manager.drive_changes = drive_changes
+
+    assert manager._affected_songs_since(last_state) is None
+
+def test_incremental_by_default(manager):
+    assert manager.incremental
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from pipeline import Pipeline, StageFailure
+
+def test_items_flow_through_every_stage():
+    pipeline = Pipeline("test").stage("double", lambda x: x * 2, workers=4).stage("inc", lambda x: x + 1, workers=3)
+
+    assert sorted(pipeline.start(range(100)).join()) == [x * 2 + 1 for x in range(100)]
+    assert pipeline.failures == []
+
+def test_single_worker_stages_keep_the_order():
+    pipeline = Pipeline("test").stage("a", lambda x: x).stage("b", lambda x: x)
+
+    assert pipeline.start(range(50)).join() == list(range(50))
+
+def test_stages_overlap():
+    first_done = threading.Event()
+
+    def first(x):
+        if x == 1:
+            # The second item only gets here once the first one went through the last stage
+            assert first_done.wait(5)
+        return x
+
+    def last(x):
+        if x == 0:
+            first_done.set()
+        return x
+
+    pipeline = Pipeline("test").stage("first", first).stage("last", last)
+
+    assert pipeline.start([0, 1]).join() == [0, 1]
+
+def test_none_drops_the_item():
+    pipeline = Pipeline("test").stage("odd", lambda x: x if x % 2 else None, workers=2)
+
+    assert sorted(pipeline.start(range(10)).join()) == [1, 3, 5, 7, 9]
+    assert pipeline.failures == []
+
+def test_stage_errors_drop_the_item_and_are_recorded():
+    def check(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    pipeline = Pipeline("test").stage("check", check, workers=2).stage("pass", lambda x: x)
+
+    assert sorted(pipeline.start(range(6)).join()) == [0, 1, 2, 4, 5]
+    [failure] = pipeline.failures
+    assert isinstance(failure, StageFailure)
+    assert (failure.stage, failure.item, str(failure.error)) == ("check", 3, "bad item")
+
+def test_errors_in_later_stages_record_that_stage_input():
+    def fail(x):
+        raise RuntimeError(x)
+
+    pipeline = Pipeline("test").stage("first", lambda x: (x, "first")).stage("second", fail)
+
+    assert pipeline.start([7]).join() == []
+    assert [(f.stage, f.item) for f in pipeline.failures] == [("second", (7, "first"))]
+
+def test_errors_producing_items_are_raised_by_join():
+    def items():
+        yield 1
+        yield 2
+        raise OSError("sheet unavailable")
+
+    processed = []
+    pipeline = Pipeline("test").stage("collect", processed.append)
+
+    with pytest.raises(OSError, match="sheet unavailable"):
+        pipeline.start(items()).join()
+    # Whatever was produced before the error still went through
+    assert processed == [1, 2]
+
+def test_stages_cannot_be_added_once_started():
+    pipeline = Pipeline("test").stage("a", lambda x: x).start([])
+    with pytest.raises(RuntimeError):
+        pipeline.stage("b", lambda x: x)
+    pipeline.join()
+
+def test_needs_a_stage():
+    with pytest.raises(RuntimeError):
+        Pipeline("test").start([1])
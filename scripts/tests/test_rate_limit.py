@@ -0,0 +1,113 @@
+import pytest
+import requests
+
+import rate_limit
+from rate_limit import AdaptiveConcurrency, RateLimiter, RateLimitedAdapter
+
+FILE_PATH = "/drive/v3/files/file-1"
+FILE_URL = f"https://www.googleapis.com{FILE_PATH}"
+
+@pytest.fixture
+def limiter() -> RateLimiter:
+    return RateLimiter()
+
+@pytest.fixture
+def session(limiter, google_api, http_metrics, monkeypatch) -> requests.Session:
+    monkeypatch.setattr(RateLimiter, "backoff_delay", staticmethod(lambda attempt, retry_after=None: 0))
+    return rate_limit.rate_limit_session(requests.Session(), limiter=limiter)
+
+def inflight(limiter: RateLimiter) -> int:
+    return limiter._concurrency["drive"]._inflight
+
+def failing_with(error: Exception):
+    def handler(request, params):
+        raise error
+    return handler
+
+def test_successful_requests_give_their_slot_back(session, limiter, google_api):
+    google_api.route("GET", FILE_PATH, lambda request, params: {"id": "file-1"})
+
+    assert session.get(FILE_URL).json() == {"id": "file-1"}
+    assert inflight(limiter) == 0
+
+@pytest.mark.parametrize("error", [
+    requests.exceptions.ChunkedEncodingError("connection broken mid-body"),
+    requests.exceptions.ContentDecodingError("bad gzip"),
+    requests.exceptions.InvalidHeader("bad header"),
+    requests.exceptions.RetryError("too many redirects"),
+])
+def test_errors_which_are_not_retried_give_their_slot_back(session, limiter, google_api, error):
+    google_api.route("GET", FILE_PATH, failing_with(error))
+
+    with pytest.raises(type(error)):
+        session.get(FILE_URL)
+    assert len(google_api.requests) == 1
+    assert inflight(limiter) == 0
+
+def test_slots_are_not_leaked_past_the_limit(session, limiter, google_api):
+    google_api.route("GET", FILE_PATH, failing_with(requests.exceptions.ChunkedEncodingError("broken")))
+
+    # More failures than the limit allows in flight; a leaked slot each time would block the last ones forever
+    for _ in range(AdaptiveConcurrency().limit + 2):
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            session.get(FILE_URL)
+    assert inflight(limiter) == 0
+
+def test_connection_errors_are_retried(session, limiter, google_api, http_metrics):
+    attempts = []
+
+    def flaky(request, params):
+        attempts.append(request)
+        if len(attempts) < 3:
+            raise requests.ConnectionError("connection reset")
+        return {"id": "file-1"}
+
+    google_api.route("GET", FILE_PATH, flaky)
+
+    assert session.get(FILE_URL).json() == {"id": "file-1"}
+    assert len(attempts) == 3
+    assert inflight(limiter) == 0
+    assert http_metrics.report()["endpoints"]["drive.files.get"]["retries"] == 2
+
+def test_connection_errors_give_up_after_the_last_retry(session, limiter, google_api):
+    google_api.route("GET", FILE_PATH, failing_with(requests.Timeout("timed out")))
+
+    with pytest.raises(requests.Timeout):
+        session.get(FILE_URL)
+    assert len(google_api.requests) == RateLimiter.MAX_RETRIES + 1
+    assert inflight(limiter) == 0
+
+def test_throttled_requests_are_retried_and_cut_the_limit(session, limiter, google_api):
+    responses = [
+        (403, {"error": {"errors": [{"reason": "userRateLimitExceeded"}]}}),
+        (429, {"error": {"code": 429}}),
+        {"id": "file-1"},
+    ]
+    google_api.route("GET", FILE_PATH, lambda request, params: responses.pop(0))
+    limit = limiter.concurrency_limit("drive")
+
+    assert session.get(FILE_URL).json() == {"id": "file-1"}
+    assert limiter.concurrency_limit("drive") < limit
+    assert inflight(limiter) == 0
+
+def test_client_errors_are_not_retried(session, limiter, google_api):
+    google_api.route("GET", FILE_PATH, lambda request, params: (404, {"error": {"code": 404}}))
+
+    assert session.get(FILE_URL).status_code == 404
+    assert len(google_api.requests) == 1
+    assert inflight(limiter) == 0
+
+def test_requests_outside_google_apis_are_not_limited(session, limiter, google_api):
+    google_api.route("GET", "/elsewhere", lambda request, params: {})
+
+    session.get("https://example.com/elsewhere")
+    assert inflight(limiter) == 0
+
+def test_classify():
+    assert RateLimiter.classify("https://sheets.googleapis.com/v4/spreadsheets/x") == "sheets"
+    assert RateLimiter.classify(FILE_URL) == "drive"
+    assert RateLimiter.classify("https://www.googleapis.com/batch/drive/v3") == "drive"
+    assert RateLimiter.classify("https://oauth2.googleapis.com/token") is None
+
+def test_adapter_uses_the_shared_limiter_by_default():
+    assert RateLimitedAdapter()._limiter is rate_limit.get_rate_limiter()
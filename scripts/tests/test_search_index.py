@@ -0,0 +1,51 @@
+import json
+import pathlib
+
+import pytest
+
+from catalog_index import SearchIndex
+
+# Shared with the frontend's check of src/utils/searchIndex.ts (npm run check-search), so both sides fold text the same
+NORMALIZATION_CASES = json.loads(
+    (pathlib.Path(__file__).parent / "fixtures" / "search_normalization.json").read_text(encoding="utf-8")
+)
+
+@pytest.mark.parametrize("case", NORMALIZATION_CASES, ids=[case["name"] for case in NORMALIZATION_CASES])
+def test_normalization_matches_the_shared_fixture(case):
+    normalized = SearchIndex.normalize(case["text"])
+
+    assert normalized == case["normalized"]
+    assert sorted(SearchIndex.trigrams(normalized)) == case["trigrams"]
+
+def build(**songs: dict) -> dict:
+    index = SearchIndex()
+    for filename, frontend_data in songs.items():
+        index.add(filename, frontend_data)
+    return json.loads(index.to_bytes())
+
+def candidates(payload: dict, query: str) -> set[str]:
+    """Titles found under every trigram of query, the way the frontend probes the index"""
+    ids = None
+    for gram in SearchIndex.trigrams(SearchIndex.normalize(query)):
+        posting = set(payload["trigrams"].get(gram, []))
+        ids = posting if ids is None else ids & posting
+    return {payload["titles"][song_id] for song_id in ids or ()}
+
+def test_songs_are_found_under_the_trigrams_of_their_names():
+    payload = build(**{
+        "melt.json": {"title": "Melt", "producer": "ryo", "alternativeNames": ["メルト"]},
+        "yoshinoya.json": {"title": "𠮷野家の歌", "producer": "someone", "labels": ["नमस्ते"]},
+    })
+
+    assert payload["songs"] == ["melt.json", "yoshinoya.json"]
+    assert candidates(payload, "MELT") == {"Melt"}
+    assert candidates(payload, "ﾒﾙﾄ") == {"Melt"}
+    assert candidates(payload, "𠮷野家") == {"𠮷野家の歌"}
+    assert candidates(payload, "नमस्ते") == {"𠮷野家の歌"}
+    assert candidates(payload, "nope") == set()
+
+def test_values_are_padded_so_trigrams_span_word_edges():
+    payload = build(**{"melt.json": {"title": "Melt"}})
+
+    assert {" me", "mel", "elt", "lt "} == set(payload["trigrams"])
+    assert all(posting == [0] for posting in payload["trigrams"].values())
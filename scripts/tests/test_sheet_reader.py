@@ -0,0 +1,110 @@
+import pytest
+import requests
+
+from sheet_reader import SheetReader
+
+SPREADSHEET_ID = "spreadsheet-0123456789"
+SHEET_PATH = f"/v4/spreadsheets/{SPREADSHEET_ID}"
+HEADERS = ["Song Name", "Producer", "BPM", "C"]
+
+def cell(value: str | None = None, *uris: str) -> dict:
+    """A grid cell with a formatted value (None for a blank cell) and a smart chip per URI"""
+    result = {} if value is None else {"formattedValue": value}
+    if uris:
+        result["chipRuns"] = [{"chip": {"richLinkProperties": {"uri": uri}}} for uri in uris]
+    return result
+
+def row(*cells: dict) -> dict:
+    return {"values": list(cells)}
+
+HEADER_ROW = row(*(cell(header) for header in HEADERS))
+
+def test_rows_are_keyed_by_header_with_numbers_numericised():
+    [melt] = SheetReader._to_rows([HEADER_ROW, row(cell("Melt"), cell("ryo"), cell("95"), cell("C"))])
+
+    assert melt.row_index == 2
+    assert melt.values == {"Song Name": "Melt", "Producer": "ryo", "BPM": 95, "C": "C"}
+    assert melt.hyperlinks == {}
+
+def test_ragged_rows_are_padded_and_cut_to_the_headers():
+    short, long = SheetReader._to_rows([
+        HEADER_ROW,
+        row(cell("Melt"), cell("ryo")),
+        row(cell("Lag"), cell("Nanou"), cell("128"), cell(), cell("beyond the headers"), cell("more")),
+    ])
+
+    assert short.values == {"Song Name": "Melt", "Producer": "ryo", "BPM": "", "C": ""}
+    assert long.values == {"Song Name": "Lag", "Producer": "Nanou", "BPM": 128, "C": ""}
+
+def test_trailing_blank_rows_are_dropped_but_blank_rows_in_between_are_kept():
+    rows = SheetReader._to_rows([
+        HEADER_ROW,
+        row(cell("Melt")),
+        row(),
+        row(cell("Lag")),
+        row(cell(), cell()),
+        {},
+    ])
+
+    assert [(song.row_index, song.get("Song Name")) for song in rows] == [(2, "Melt"), (3, ""), (4, "Lag")]
+
+def test_chip_links_are_read_per_header():
+    [melt] = SheetReader._to_rows([
+        HEADER_ROW,
+        row(
+            cell("Melt", "https://www.youtube.com/watch?v=o1jAMSQyVPc"),
+            cell("ryo"),
+            cell(),
+            # A cell with several chips links to its last one
+            cell("C", "https://drive.google.com/file/d/old/view", "https://drive.google.com/file/d/melt-c/view"),
+            cell("no header", "https://example.com"),
+        ),
+    ])
+
+    assert melt.hyperlinks == {
+        "Song Name": "https://www.youtube.com/watch?v=o1jAMSQyVPc",
+        "C": "https://drive.google.com/file/d/melt-c/view",
+    }
+
+def test_empty_worksheets_have_no_rows():
+    assert SheetReader._to_rows([]) == []
+    assert SheetReader._to_rows([HEADER_ROW]) == []
+
+def grid(title: str, *rows: dict) -> dict:
+    return {"properties": {"title": title}, "data": [{"rowData": list(rows)}]}
+
+def test_worksheets_are_read_in_one_call(google_api):
+    google_api.route("GET", SHEET_PATH, lambda request, params: {"sheets": [
+        grid("Songs", HEADER_ROW, row(cell("Melt"))),
+        grid("TV Size Sheets", HEADER_ROW, row(cell("Lag"))),
+    ]})
+
+    worksheets = SheetReader(requests.Session(), SPREADSHEET_ID).read(["Songs"], optional=["TV Size Sheets"])
+
+    assert {title: [song.get("Song Name") for song in rows] for title, rows in worksheets.items()} == {
+        "Songs": ["Melt"], "TV Size Sheets": ["Lag"],
+    }
+    [request] = google_api.requests
+    assert "ranges=%27Songs%27%21A%3AZ&ranges=%27TV+Size+Sheets%27%21A%3AZ" in request.url
+    assert "includeGridData=true" in request.url
+
+def test_missing_optional_worksheets_are_left_out(google_api):
+    def get(request, params):
+        if "TV+Size" in request.url:
+            return 400, {"error": {"code": 400, "message": "Unable to parse range: 'TV Size Sheets'!A:Z"}}
+        return {"sheets": [grid("Songs", HEADER_ROW, row(cell("Melt")))]}
+    google_api.route("GET", SHEET_PATH, get)
+
+    worksheets = SheetReader(requests.Session(), SPREADSHEET_ID).read(["Songs"], optional=["TV Size Sheets"])
+
+    assert list(worksheets) == ["Songs"]
+    assert len(google_api.requests) == 2
+
+def test_missing_required_worksheets_raise(google_api):
+    google_api.route("GET", SHEET_PATH, lambda request, params: (400, {"error": {"code": 400}}))
+
+    with pytest.raises(requests.HTTPError):
+        SheetReader(requests.Session(), SPREADSHEET_ID).read(["Songs"])
+
+def test_quotes_in_worksheet_titles_are_escaped():
+    assert SheetReader._quote_title("Rin's Songs") == "Rin''s Songs"
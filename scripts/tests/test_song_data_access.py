@@ -0,0 +1,137 @@
+import pytest
+
+from fake_google import FakeDriveFiles
+from gdrive_session import GDriveSession
+from song_data_access import SongDataAccess, normalize_name
+
+FOLDER = GDriveSession.MIME_TYPE_DRIVE_FOLDER
+PDF = GDriveSession.MIME_TYPE_PDF
+
+def add_song(drive_files: FakeDriveFiles, folder_id: str, basename: str, charts: list[str]) -> None:
+    """Adds a song folder named basename with a PDF for each chart filename suffix ("-C", " - TV-Vocals", ...)"""
+    drive_files.add(folder_id, basename, "lead-sheets", mimeType=FOLDER)
+    for suffix in charts:
+        drive_files.add(
+            f"{folder_id}{suffix}", f"{basename}{suffix}.pdf", folder_id,
+            mimeType=PDF, md5Checksum=f"md5 of {folder_id}{suffix}", modifiedTime="2026-01-01T00:00:00.000Z",
+        )
+
+@pytest.fixture
+def drive_files(google_api) -> FakeDriveFiles:
+    drive_files = FakeDriveFiles(google_api)
+    drive_files.add("lead-sheets", "Lead Sheets", "drive-root", mimeType=FOLDER)
+    add_song(drive_files, "melt", "ryo - Melt", ["-C", "-Bb", " - TV-C"])
+    add_song(drive_files, "ghost-rule", "DECO*27 - Ghost Rule", ["-Vocals"])
+    add_song(drive_files, "rolling-girl", "wowaka - Rolling Girl", ["-C", "-Eb"])
+    return drive_files
+
+def listings(google_api) -> list[str]:
+    return [request.url for request in google_api.requests if request.path_url.startswith("/drive/v3/files?")]
+
+def test_bulk_records_match_single_lookups(drive_files):
+    data_access = SongDataAccess(GDriveSession())
+    songs = [("Melt", "ryo"), ("Ghost Rule", "DECO*27"), ("Rolling Girl", "wowaka")]
+
+    records = data_access.get_records_bulk(songs)
+
+    assert list(records) == songs
+    for (song_name, song_producer), record in records.items():
+        single = data_access.get_record_by_attrs(song_name, song_producer)
+        assert record.name == single.name == song_name
+        # The bulk listing also carries each file's parents
+        assert {key: meta["id"] for key, meta in record.pdfs_full.items()} == {
+            key: meta["id"] for key, meta in single.pdfs_full.items()
+        }
+        assert {key: meta["id"] for key, meta in record.pdfs_tv.items()} == {
+            key: meta["id"] for key, meta in single.pdfs_tv.items()
+        }
+    assert set(records[("Melt", "ryo")].pdfs_full) == {"C", "Bb"}
+    assert records[("Melt", "ryo")].pdfs_tv["C"]["id"] == "melt - TV-C"
+    assert records[("Melt", "ryo")].folder_id == "melt"
+
+def test_bulk_records_take_a_few_listings_for_the_whole_catalog(drive_files, google_api):
+    data_access = SongDataAccess(GDriveSession())
+
+    data_access.get_records_bulk([("Melt", "ryo"), ("Ghost Rule", "DECO*27"), ("Rolling Girl", "wowaka")])
+
+    # "Lead Sheets", its song folders, then the PDFs of every song folder at once
+    requests = listings(google_api)
+    assert len(requests) == 3
+    assert all(f"%27{folder}%27+in+parents" in requests[-1] for folder in ("melt", "ghost-rule", "rolling-girl"))
+    assert "mimeType%3D%27application%2Fpdf%27" in requests[-1]
+
+def test_bulk_listings_are_split_into_chunks_of_folders(drive_files, google_api, monkeypatch):
+    monkeypatch.setattr(GDriveSession, "MAX_PARENTS_PER_QUERY", 2)
+    data_access = SongDataAccess(GDriveSession())
+
+    records = data_access.get_records_bulk([("Melt", "ryo"), ("Ghost Rule", "DECO*27"), ("Rolling Girl", "wowaka")])
+
+    assert len(records) == 3
+    assert len(listings(google_api)) == 4
+
+def test_bulk_records_leave_out_songs_without_a_folder(drive_files):
+    data_access = SongDataAccess(GDriveSession())
+
+    records = data_access.get_records_bulk([("Melt", "ryo"), ("Nothing", "nobody"), ("Melt", "ryo")])
+
+    assert list(records) == [("Melt", "ryo")]
+    with pytest.raises(ValueError):
+        data_access.get_record_by_attrs("Nothing", "nobody")
+
+def test_names_are_normalized_for_matching():
+    assert normalize_name("  ＨＡＴＳＵＮＥ　Ｍｉｋｕ \t Straße ") == "hatsune miku strasse"
+    assert normalize_name("ryo - メルト") == normalize_name("ＲＹＯ  -  メルト")
+
+@pytest.mark.parametrize("filename, parsed", [
+    ("ryo - メルト-C.pdf", ("ryo - メルト", "C", False)),
+    ("DECO*27 - ゴーストルール - TV-Vocals.pdf", ("deco*27 - ゴーストルール", "Vocals", True)),
+    ("ｒｙｏ\u3000-\u3000Ｍｅｌｔ－Ｃ.pdf", ("ryo - melt", "C", False)),
+    ("ryo - Melt - tv-bb.pdf", ("ryo - melt", "Bb", True)),
+    ("ryo - Melt-TV-C.pdf", ("ryo - melt", "C", True)),
+    ("ryo - Melt -C.pdf", ("ryo - melt", "C", False)),
+    ("ryo - Melt-C .pdf", ("ryo - melt", "C", False)),
+    ("Kanaria - KING  -Bass.PDF", ("kanaria - king", "Bass", False)),
+    # Hyphens inside the song name aren't taken for the key separator
+    ("PinocchioP - God-ish-Alto.pdf", ("pinocchiop - god-ish", "Alto", False)),
+    ("PinocchioP - God-ish - TV-F.pdf", ("pinocchiop - god-ish", "F", True)),
+    ("Orangestar - Mikansei Eight Beats - TV - Eb.pdf", ("orangestar - mikansei eight beats", "Eb", True)),
+    ("ryo - Melt.pdf", None),
+    ("ryo - Melt-D.pdf", None),
+    ("ryo - Melt-C.png", None),
+])
+def test_chart_filenames_are_parsed_after_normalization(filename, parsed):
+    assert SongDataAccess.parse_chart_filename(filename) == parsed
+
+def test_normalized_index_keeps_the_first_file_of_a_name():
+    files = [
+        {"id": "a", "name": "ryo - Melt"},
+        {"id": "b", "name": "RYO - MELT"},
+        {"id": "c", "name": "kz - Tell Your World"},
+    ]
+
+    assert SongDataAccess.index_by_normalized_name(files) == {"ryo - melt": "a", "kz - tell your world": "c"}
+
+def test_records_match_charts_on_normalized_names(drive_files):
+    add_song(drive_files, "world-is-mine", "ryo - World is Mine", [])
+    for file_id, name in [
+        ("wim-C", "ryo - World is Mine-C.pdf"),
+        ("wim-c-copy", "ryo - world is mine-C.pdf"),
+        ("wim-Bb", "ryo  -  World is Mine - Bb.pdf"),
+        ("wim-tv-Vocals", "ｒｙｏ - World is Mine - TV-vocals.pdf"),
+        ("notes", "ryo - World is Mine (notes).pdf"),
+    ]:
+        drive_files.add(file_id, name, "world-is-mine", mimeType=PDF)
+
+    record = SongDataAccess(GDriveSession()).get_record_by_attrs("World is Mine", "ryo")
+
+    # An exact filename wins over one which only matches once normalized
+    assert {key: meta["id"] for key, meta in record.pdfs_full.items()} == {"C": "wim-C", "Bb": "wim-Bb"}
+    assert {key: meta["id"] for key, meta in record.pdfs_tv.items()} == {"Vocals": "wim-tv-Vocals"}
+
+def test_song_folders_are_found_on_normalized_names(drive_files):
+    # The sheet spells the song differently from the folder
+    record = SongDataAccess(GDriveSession()).get_record_by_attrs("ＧＨＯＳＴ  RULE", "deco*27")
+    assert {key: meta["id"] for key, meta in record.pdfs_full.items()} == {"Vocals": "ghost-rule-Vocals"}
+
+    bulk = SongDataAccess(GDriveSession()).get_records_bulk([("ＧＨＯＳＴ  RULE", "deco*27")])
+    assert bulk[("ＧＨＯＳＴ  RULE", "deco*27")].folder_id == "ghost-rule"
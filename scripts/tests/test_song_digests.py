@@ -0,0 +1,81 @@
+import dataclasses
+import hashlib
+import json
+
+import pytest
+
+import sheet_sync
+from catalog_song import CatalogSong
+
+MELT = CatalogSong.from_frontend_json({"title": "Melt", "producer": "ryo", "singer": "Hatsune Miku", "bpm": 95})
+LAG = CatalogSong.from_frontend_json({"title": "Lag", "producer": "Nanou", "singer": "Hatsune Miku"})
+GHOST_RULE = CatalogSong.from_frontend_json({"title": "Ghost Rule", "producer": "DECO*27", "singer": "Hatsune Miku"})
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch) -> sheet_sync.SongSyncManager:
+    monkeypatch.chdir(tmp_path)
+    return sheet_sync.SongSyncManager(use_drive_index=False)
+
+def test_song_digests_hash_the_canonical_bytes():
+    assert MELT.digest == hashlib.sha256(MELT.canonical).hexdigest()
+    assert MELT.digest != LAG.digest
+
+def test_root_digest_is_independent_of_order():
+    digests = {"melt.json": MELT.digest, "lag.json": LAG.digest}
+
+    assert CatalogSong.root_digest(digests) == CatalogSong.root_digest(dict(reversed(digests.items())))
+    assert CatalogSong.root_digest({}) == hashlib.sha256().hexdigest()
+
+def test_root_digest_follows_every_song():
+    digests = {"melt.json": MELT.digest, "lag.json": LAG.digest}
+    root = CatalogSong.root_digest(digests)
+
+    assert CatalogSong.root_digest({**digests, "lag.json": dataclasses.replace(LAG, bpm=120).digest}) != root
+    assert CatalogSong.root_digest({**digests, "ghost-rule.json": GHOST_RULE.digest}) != root
+    assert CatalogSong.root_digest({"melt.json": MELT.digest}) != root
+    # The same content under another filename is another catalog
+    assert CatalogSong.root_digest({"melt-2.json": MELT.digest, "lag.json": LAG.digest}) != root
+
+def test_full_runs_digest_only_the_songs_they_processed(manager):
+    previous = {"melt.json": "old", "ghost-rule.json": GHOST_RULE.digest}
+
+    digests = manager.calculate_song_digests({"Melt": MELT, "Lag": LAG}, previous)
+
+    assert digests == {"melt.json": MELT.digest, "lag.json": LAG.digest}
+    assert manager.calculate_content_hash(digests) == CatalogSong.root_digest(digests)
+
+def test_song_slug_runs_carry_over_the_other_songs(manager):
+    previous = {"melt.json": "old", "ghost-rule.json": GHOST_RULE.digest}
+
+    digests = manager.calculate_song_digests({"Melt": MELT}, previous, song_slug="melt")
+
+    assert digests == {"melt.json": MELT.digest, "ghost-rule.json": GHOST_RULE.digest}
+    assert previous["melt.json"] == "old"
+
+def test_changed_songs_come_from_the_digests():
+    previous = {"melt.json": "old", "lag.json": LAG.digest, "ghost-rule.json": GHOST_RULE.digest}
+    current = {"melt.json": MELT.digest, "lag.json": LAG.digest, "rolling-girl.json": "new"}
+
+    assert sheet_sync.SongSyncManager._changed_songs(previous, current) == {
+        "added": ["rolling-girl.json"], "updated": ["melt.json"], "removed": ["ghost-rule.json"],
+    }
+    assert sheet_sync.SongSyncManager._changed_songs(current, current) == {"added": [], "updated": [], "removed": []}
+
+def test_previous_digests_come_from_the_sync_state(manager):
+    state = {"contentHash": "state-hash", "songDigests": {"melt.json": MELT.digest}}
+
+    assert manager.get_previous_song_digests(state) == ("state-hash", {"melt.json": MELT.digest})
+
+def test_generated_manifest_stands_in_for_a_missing_sync_state(manager):
+    manager.song_digests = {"melt.json": MELT.digest, "lag.json": LAG.digest}
+    manager.update_song_manifest(["melt.json", "lag.json"])
+
+    with open(manager.generated_manifest_path, encoding="utf-8") as f:
+        assert json.load(f)["songs"] == ["lag.json", "melt.json"]
+    assert manager.get_previous_song_digests({}) == (
+        CatalogSong.root_digest(manager.song_digests), manager.song_digests
+    )
+
+def test_no_previous_digests_before_the_first_sync(manager):
+    assert manager.get_previous_song_digests({}) == ("", {})
+    assert manager.get_previous_song_digests({"contentHash": "old-style-hash"}) == ("old-style-hash", {})
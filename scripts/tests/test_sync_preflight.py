@@ -0,0 +1,120 @@
+import pytest
+
+import sheet_sync
+from fake_google import FakeDriveChanges, FakeDriveFiles
+from gdrive_session import GDriveSession
+
+FOLDER = GDriveSession.MIME_TYPE_DRIVE_FOLDER
+PDF = GDriveSession.MIME_TYPE_PDF
+
+SHEET_ID = "sheet-id"
+SHEET_TIME = "2024-03-01T00:00:00Z"
+FOLDERS_TIME = "2024-02-01T00:00:00Z"
+
+@pytest.fixture
+def drive_files(google_api) -> FakeDriveFiles:
+    drive_files = FakeDriveFiles(google_api)
+    drive_files.add("lead-sheets", "Lead Sheets", "drive-root", mimeType=FOLDER)
+    drive_files.add("folder-melt", "ryo - メルト", "lead-sheets", mimeType=FOLDER, modifiedTime="2024-01-01T00:00Z")
+    drive_files.add("chart-melt-c", "ryo - メルト-C.pdf", "folder-melt", mimeType=PDF, modifiedTime=FOLDERS_TIME)
+    # Linked from the sheet, but kept outside of Lead Sheets
+    drive_files.add("elsewhere", "Scratch", "drive-root", mimeType=FOLDER)
+    drive_files.add("chart-linked", "melt in Bb.pdf", "elsewhere", mimeType=PDF, modifiedTime="2024-01-15T00:00:00Z")
+    return drive_files
+
+@pytest.fixture
+def drive_changes(google_api) -> FakeDriveChanges:
+    return FakeDriveChanges(google_api)
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch, google_api, drive_files, drive_changes) -> sheet_sync.SongSyncManager:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GOOGLE_SHEET_ID", SHEET_ID)
+    google_api.route("GET", f"/drive/v3/files/{SHEET_ID}", lambda request, params: {"modifiedTime": SHEET_TIME})
+    return sheet_sync.SongSyncManager(use_drive_index=False)
+
+@pytest.fixture
+def last_state(drive_changes) -> dict:
+    """The sync state as saved by a run which saw the drive as drive_files sets it up"""
+    return {
+        'changesPageToken': str(len(drive_changes.changes)),
+        'sheetModifiedTime': SHEET_TIME,
+        'driveModifiedTime': FOLDERS_TIME,
+        'driveFileIndex': {
+            'chart-melt-c': {'slug': 'melt', 'key': 'C', 'tv': False},
+            'chart-linked': {'slug': 'melt', 'key': 'Bb', 'tv': False},
+        },
+        'driveFolderIndex': {'folder-melt': 'melt'},
+        'songBasenames': {'ryo - メルト': 'melt'},
+    }
+
+def preflight(manager: sheet_sync.SongSyncManager, last_state: dict) -> bool:
+    manager.spreadsheet_id = SHEET_ID
+    manager.sheet_modified_time = manager.get_remote_sheet_modified_time()
+    manager.drive_modified_time = manager.get_newest_drive_modified_time(last_state)
+    manager.drive_changes = manager.list_drive_changes_since(last_state)
+    return manager._unchanged_since(last_state)
+
+def test_newest_modified_time_looks_inside_the_known_chart_folders(manager, last_state):
+    assert manager.get_newest_drive_modified_time(last_state) == FOLDERS_TIME
+    # Without the folder index only the song folders themselves are looked at
+    assert manager.get_newest_drive_modified_time({}) == "2024-01-01T00:00Z"
+
+def test_unchanged_when_nothing_moved(manager, last_state):
+    assert preflight(manager, last_state)
+
+def test_sheet_edit_is_a_change(manager, last_state):
+    assert not preflight(manager, {**last_state, 'sheetModifiedTime': "2024-02-28T00:00:00Z"})
+
+def test_newer_chart_is_a_change(manager, last_state, drive_files):
+    drive_files.files["chart-melt-c"]["modifiedTime"] = "2024-03-02T00:00:00Z"
+
+    assert not preflight(manager, last_state)
+
+def test_change_to_a_chart_linked_from_outside_the_chart_folders(manager, last_state, drive_changes):
+    # Its folder isn't looked at, so only the changes show it
+    drive_changes.log("chart-linked", name="melt in Bb.pdf", mimeType=PDF, parents=["elsewhere"], md5Checksum="new")
+
+    assert not preflight(manager, last_state)
+
+def test_chart_moved_into_a_chart_folder(manager, last_state, drive_changes, drive_files):
+    # A moved (or copied) file keeps its old modifiedTime, so the chart folder's newest modifiedTime doesn't move
+    moved = drive_files.add(
+        "chart-melt-f", "ryo - メルト-F.pdf", "folder-melt", mimeType=PDF, modifiedTime="2023-06-01T00:00:00Z"
+    )
+    drive_changes.log("chart-melt-f", **{key: value for key, value in moved.items() if key != "id"})
+
+    assert manager.get_newest_drive_modified_time(last_state) == FOLDERS_TIME
+    assert not preflight(manager, last_state)
+
+def test_changes_to_unrelated_files_are_ignored(manager, last_state, drive_changes):
+    drive_changes.log("notes", name="notes.txt", mimeType="text/plain", parents=["elsewhere"])
+
+    assert preflight(manager, last_state)
+    # The listing also gave this run its changes token
+    assert manager.changes_page_token == str(len(drive_changes.changes))
+
+@pytest.mark.parametrize("page_token", [None, "not-a-token"])
+def test_changes_which_cannot_be_listed_are_a_change(manager, last_state, page_token):
+    assert not preflight(manager, {**last_state, 'changesPageToken': page_token})
+    assert manager.drive_changes is None
+
+def test_sync_stops_before_reading_the_sheet_when_unchanged(manager, last_state, monkeypatch):
+    monkeypatch.setattr(manager, "get_sync_state", lambda: last_state)
+    monkeypatch.setattr(manager, "setup_google_sheets", pytest.fail)
+
+    assert manager.sync() is False
+
+def test_sync_goes_ahead_when_a_linked_chart_changed(manager, last_state, drive_changes, monkeypatch):
+    class SheetRead(Exception):
+        pass
+
+    def setup_google_sheets():
+        raise SheetRead()
+
+    drive_changes.log("chart-linked", removed=True)
+    monkeypatch.setattr(manager, "get_sync_state", lambda: last_state)
+    monkeypatch.setattr(manager, "setup_google_sheets", setup_google_sheets)
+
+    with pytest.raises(SheetRead):
+        manager.sync()
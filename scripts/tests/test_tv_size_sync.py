@@ -0,0 +1,130 @@
+import hashlib
+import os
+import threading
+
+import pytest
+
+import sheet_sync
+from catalog_song import CatalogSong, SheetRow
+
+SONGS = "Songs"
+TV_SIZE = sheet_sync.SongSyncManager.TV_SIZE_WORKSHEET
+
+def drive_id(name: str) -> str:
+    """A Drive ID long enough to pass _validate_drive_id()"""
+    return f"{name}-0123456789abcdefghij"
+
+def chart(file_id: str) -> bytes:
+    return f"%PDF-1.7 {file_id}".encode()
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch) -> sheet_sync.SongSyncManager:
+    monkeypatch.chdir(tmp_path)
+    manager = sheet_sync.SongSyncManager(use_drive_index=False)
+    manager.worksheet_title = SONGS
+    manager.fetched = []
+    monkeypatch.setattr(
+        manager, "_get_drive_file_metadata",
+        lambda file_id: {"md5Checksum": hashlib.md5(chart(file_id)).hexdigest()},
+    )
+
+    def fetch_pdf(file_id, pdf_path, remote_md5):
+        manager.fetched.append(file_id)
+        os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
+        with open(pdf_path, "wb") as f:
+            f.write(chart(file_id))
+        return remote_md5
+    monkeypatch.setattr(manager, "_fetch_pdf", fetch_pdf)
+    return manager
+
+def tv_rows(*values: dict) -> list[SheetRow]:
+    return [SheetRow(index + 2, row) for index, row in enumerate(values)]
+
+def test_tv_size_rows_are_grouped_by_song(manager):
+    manager.worksheet_rows = {TV_SIZE: tv_rows(
+        {"Song Name": "Melt", "C": drive_id("melt-c")},
+        {"Song Name": ""},
+        {"Song Name": "Lag", "C": drive_id("lag-c")},
+        {"Song Name": "Melt", "Bb": drive_id("melt-bb")},
+        {"Song Name": "Reused"},
+    )}
+    manager.reused_songs["Reused"] = CatalogSong.from_frontend_json({"title": "Reused"})
+
+    groups = manager.select_tv_size_rows()
+
+    assert {slug: [row.row_index for row in rows] for slug, rows in groups.items()} == {"melt": [2, 5], "lag": [4]}
+    assert list(manager.select_tv_size_rows("lag")) == ["lag"]
+
+def test_missing_tv_size_worksheet_has_no_rows(manager):
+    manager.worksheet_rows = {SONGS: []}
+
+    assert manager.select_tv_size_rows() == {}
+
+def test_tv_size_charts_are_fetched_into_their_own_folder(manager):
+    rows = tv_rows(
+        {"Song Name": "Melt", "TV Size Length": "1:30", "C": f"https://drive.google.com/file/d/{drive_id('c')}/view"}
+    )
+    rows[0].hyperlinks["Vocals"] = f"https://drive.google.com/open?id={drive_id('vocals')}"
+
+    processed = manager._process_tv_size_rows(rows)
+
+    assert processed == {"Melt": {
+        "pdfs": {"Vocals": "/pdfs/melt-tv/melt-tv-vocals.pdf", "C": "/pdfs/melt-tv/melt-tv-c.pdf"},
+        "tvSizeLength": "1:30",
+    }}
+    assert sorted(manager.fetched) == sorted([drive_id("c"), drive_id("vocals")])
+    assert manager.drive_file_index[drive_id("c")] == {"slug": "melt", "key": "C", "tv": True}
+
+def test_up_to_date_tv_size_charts_are_not_fetched_again(manager):
+    rows = tv_rows({"Song Name": "Melt", "C": drive_id("c")})
+    manager._process_tv_size_rows(rows)
+    manager.fetched.clear()
+
+    assert manager._process_tv_size_rows(rows)["Melt"]["pdfs"] == {"C": "/pdfs/melt-tv/melt-tv-c.pdf"}
+    assert manager.fetched == []
+
+def test_failed_tv_size_fetches_keep_the_existing_chart(manager, monkeypatch):
+    rows = tv_rows({"Song Name": "Melt", "C": drive_id("c"), "F": drive_id("f")})
+    manager._process_tv_size_rows(tv_rows({"Song Name": "Melt", "C": drive_id("c")}))
+    monkeypatch.setattr(manager, "_get_drive_file_metadata", lambda file_id: {"md5Checksum": "changed"})
+    monkeypatch.setattr(manager, "_fetch_pdf", lambda file_id, pdf_path, remote_md5: None)
+
+    assert manager._process_tv_size_rows(rows)["Melt"]["pdfs"] == {"C": "/pdfs/melt-tv/melt-tv-c.pdf"}
+
+def no_main_sheet_lookups(manager, monkeypatch) -> None:
+    """Resolves main worksheet rows without Drive, to rows without full size charts"""
+    monkeypatch.setattr(manager, "_bulk_song_records", lambda records: {})
+    monkeypatch.setattr(manager, "_sync_record_fetch_metadata", lambda index, row, records: row)
+    monkeypatch.setattr(manager, "_parse_pdfs_new", lambda song, existing: ({}, {}, {}, False))
+
+def test_tv_size_rows_of_different_songs_are_processed_at_once(manager, monkeypatch):
+    no_main_sheet_lookups(manager, monkeypatch)
+    fetch_pdf = manager._fetch_pdf
+    # Each fetch waits for the other song's: fetching one song after the other would break the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fetch_together(file_id, pdf_path, remote_md5):
+        barrier.wait()
+        return fetch_pdf(file_id, pdf_path, remote_md5)
+    monkeypatch.setattr(manager, "_fetch_pdf", fetch_together)
+    manager.worksheet_rows = {
+        SONGS: [],
+        TV_SIZE: tv_rows({"Song Name": "Melt", "C": drive_id("melt")}, {"Song Name": "Lag", "C": drive_id("lag")}),
+    }
+
+    manager.process_songs(stage_files=False)
+
+    assert sorted(manager.fetched) == sorted([drive_id("melt"), drive_id("lag")])
+    assert not barrier.broken
+
+def test_songs_wait_for_their_tv_size_rows(manager, monkeypatch):
+    no_main_sheet_lookups(manager, monkeypatch)
+    manager.worksheet_rows = {
+        SONGS: tv_rows({"Song Name": "Melt", "Producer": "ryo", "Status": "Completed"}),
+        TV_SIZE: tv_rows({"Song Name": "Melt", "TV Size Length": "1:30", "C": drive_id("melt")}),
+    }
+
+    songs = manager.process_songs(stage_files=False)
+
+    assert songs["Melt"].pdfs_tv_size == {"C": "/pdfs/melt-tv/melt-tv-c.pdf"}
+    assert songs["Melt"].tv_size_length == "1:30"